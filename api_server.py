@@ -1,10 +1,14 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Header, Request, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
 import uvicorn
 import os
 import json
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
 from datetime import datetime
 from dotenv import load_dotenv
 
@@ -12,13 +16,20 @@ from dotenv import load_dotenv
 sys.path.append(os.path.dirname(__file__))
 
 from sdk.core import LogosAgent
-from sdk.onchain_utils import build_log_decision_ix
+from sdk.audit_store import AuditStore
+from sdk.payer_pool import PayerPool, PooledSubmitter
+from sdk.coordinator import RemoteDecisionBus, RemoteIdempotencyStore, RemoteSubmitter, SubmissionCoordinator
+from sdk.priority_fees import FeePlanner, FeePolicy, RpcFeeProvider
+from sdk.cu_profile import load_profile
+from sdk.prevalidate import LocalValidator, PrevalidationError
+from sdk.idempotency import IdempotencyKeyReused, IdempotencyStore, body_hash, content_key
+from sdk.onchain_utils import find_agent_pda
+from sdk.verify import DecisionVerifier
+from sdk.event_bus import DecisionBus
+from sdk import fast_json
+from sdk.fast_json import RequestValidationError, parse_batch_request, parse_decision_request
 from solana.rpc.api import Client
-from solders.keypair import Keypair
 from solders.pubkey import Pubkey
-from solders.transaction import Transaction
-from solders.message import Message
-from solana.rpc.types import TxOpts
 
 # Load environment
 load_dotenv()
@@ -34,19 +45,99 @@ app = FastAPI(
 RPC_URL = os.getenv("SOLANA_RPC_URL", "https://api.devnet.solana.com")
 PROGRAM_ID_STR = "Ldm2tof9CHcyaHWh3nBkwiWNGYN8rG5tex7NMbHQxG3"
 KEYPAIR_PATH = os.getenv("SOLANA_KEYPAIR_PATH", "./id.json")
+AUDIT_DB_PATH = os.getenv("LOGOS_AUDIT_DB", "./logos_audit.db")
 
 # Initialize Solana client
 client = Client(RPC_URL)
 program_id = Pubkey.from_string(PROGRAM_ID_STR)
 
-# Load keypair
+# Load keypairs. SOLANA_KEYPAIR_PATHS (comma-separated) spreads submissions
+# over several payer/authority keys; each key gets its own agent account.
+KEYPAIR_PATHS = [p.strip() for p in os.getenv("SOLANA_KEYPAIR_PATHS", KEYPAIR_PATH).split(",") if p.strip()]
+MAX_IN_FLIGHT_PER_KEY = int(os.getenv("LOGOS_MAX_IN_FLIGHT_PER_KEY", "4"))
+# How long a /log request waits for a free in-flight slot on its key before
+# failing with 503 (slots are held until the transaction settles on-chain)
+SUBMIT_TIMEOUT = float(os.getenv("LOGOS_SUBMIT_TIMEOUT", "30"))
+
+# Priority fees: off unless LOGOS_PRIORITY_FEES=1. LOGOS_FEE_POLICIES is a JSON object
+# mapping objective_id (or "default") to FeePolicy fields, e.g.
+#   {"Liquidation-Guard-v1": {"percentile": 90, "await_confirmation": true}}
+# LOGOS_CU_PROFILE points at a compute-unit report (python -m sdk.cu_profile) used
+# to size each transaction's compute-unit limit.
+fee_planner = None
+if os.getenv("LOGOS_PRIORITY_FEES", "0") == "1":
+    fee_policies = {
+        objective: FeePolicy(**fields)
+        for objective, fields in json.loads(os.getenv("LOGOS_FEE_POLICIES", "{}")).items()
+    }
+    cu_profile = load_profile()
+    if cu_profile is not None:
+        print(f"Compute-unit limits from {cu_profile.variant} profile ({len(cu_profile.samples)} instructions)")
+    fee_planner = FeePlanner(RpcFeeProvider(client), fee_policies, profile=cu_profile)
+
+# LOGOS_SKIP_PREFLIGHT=1 skips RPC simulation for decisions that pass local validation.
+# Local validation then also reads the decision PDA, so a record created before a
+# restart or by another process is rejected instead of failing on-chain unseen.
+SKIP_PREFLIGHT = os.getenv("LOGOS_SKIP_PREFLIGHT", "0") == "1"
+validator = LocalValidator(program_id, client, check_chain=SKIP_PREFLIGHT)
+
+# Live decision feed (SSE / WebSocket). Each subscriber has a bounded buffer;
+# a consumer that falls LOGOS_STREAM_BUFFER messages behind is disconnected.
+# The submitter publishes every lifecycle event: "committed" when sent, then
+# "confirmed" / "failed" / "expired" from the same ConfirmationTracker that
+# frees the key's slot. In multi-worker mode the coordinator's submitter
+# publishes them and every worker relays them to its local bus.
+decision_bus = DecisionBus(max_buffer=int(os.getenv("LOGOS_STREAM_BUFFER", "1000")))
+STREAM_KEEPALIVE_SECONDS = 15.0
+
 try:
-    with open(KEYPAIR_PATH, 'r') as f:
-        secret = json.load(f)
-    payer = Keypair.from_bytes(bytes(secret))
+    payer_pool = PayerPool.from_files(KEYPAIR_PATHS, max_in_flight=MAX_IN_FLIGHT_PER_KEY)
+    payer = payer_pool.members[0].keypair
+    submitter = PooledSubmitter(
+        client, program_id, payer_pool,
+        fee_planner=fee_planner,
+        validator=validator,
+        skip_preflight=SKIP_PREFLIGHT,
+        event_sink=decision_bus
+    )
 except Exception as e:
-    print(f"Warning: Could not load keypair from {KEYPAIR_PATH}: {e}")
+    print(f"Warning: Could not load keypair(s) from {KEYPAIR_PATHS}: {e}")
+    payer_pool = None
     payer = None
+    submitter = None
+
+verifier = DecisionVerifier(client, program_id)
+
+# Retried /log requests return the original result instead of resending
+idempotency_store = IdempotencyStore(
+    max_entries=int(os.getenv("LOGOS_IDEMPOTENCY_MAX_ENTRIES", "100000")),
+    ttl=float(os.getenv("LOGOS_IDEMPOTENCY_TTL", "3600"))
+)
+
+# Multi-worker mode (LOGOS_WORKERS > 1): this process is an API worker and hands
+# every submission to the single coordinator started by __main__, so only one
+# process signs, fetches blockhashes and sends. Idempotency keys and the event
+# feed live in the coordinator too, so they hold across workers.
+COORDINATOR_ADDRESS = os.getenv("LOGOS_COORDINATOR_ADDRESS")
+if COORDINATOR_ADDRESS and payer_pool:
+    coordinator_authkey = bytes.fromhex(os.environ["LOGOS_COORDINATOR_AUTHKEY"])
+    submitter = RemoteSubmitter(COORDINATOR_ADDRESS, coordinator_authkey)
+    idempotency_store = RemoteIdempotencyStore(COORDINATOR_ADDRESS, coordinator_authkey)
+    RemoteDecisionBus(COORDINATOR_ADDRESS, coordinator_authkey).relay(decision_bus)
+
+# LOGOS_FAST_JSON=1 serves /log through sdk.fast_json: one orjson parse, a
+# hand-written schema check and no pydantic models on the request path.
+FAST_JSON = os.getenv("LOGOS_FAST_JSON", "0") == "1"
+
+# /log/batch: items per request, and how many of them run at once
+MAX_BATCH_ITEMS = int(os.getenv("LOGOS_MAX_BATCH_ITEMS", "100"))
+batch_executor = ThreadPoolExecutor(
+    max_workers=len(payer_pool) * MAX_IN_FLIGHT_PER_KEY if payer_pool else 4,
+    thread_name_prefix="logos-batch"
+)
+
+# Local audit index of every decision this server hashes
+audit_store = AuditStore(AUDIT_DB_PATH)
 
 # --- Data Models ---
 class ObservationData(BaseModel):
@@ -59,6 +150,15 @@ class DecisionRequest(BaseModel):
     observations: List[ObservationData]
     action_plan: Dict[str, Any]
     dry_run: bool = False
+    # Optional client pre-hash: the record timestamp used and the hash it produced
+    timestamp: Optional[float] = None
+    decision_hash: Optional[str] = None
+
+class LogBatchItem(DecisionRequest):
+    idempotency_key: Optional[str] = None
+
+class LogBatchRequest(BaseModel):
+    items: List[LogBatchItem]
 
 class DecisionResponse(BaseModel):
     decision_hash: str
@@ -66,6 +166,7 @@ class DecisionResponse(BaseModel):
     status: str
     timestamp: str
     explorer_url: Optional[str] = None
+    replayed: bool = False
 
 # --- Endpoints ---
 
@@ -79,93 +180,316 @@ async def root():
         "network": "devnet"
     }
 
-@app.post("/log", response_model=DecisionResponse)
-async def log_decision(req: DecisionRequest):
+def _log_decision(objective_id: str, obs_dicts: List[Dict[str, Any]], action_plan: Dict[str, Any],
+                  dry_run: bool, idempotency_key: Optional[str],
+                  timestamp: Optional[float] = None, decision_hash: Optional[str] = None) -> Dict[str, Any]:
     """
-    Log a decision to the Solana blockchain.
+    Shared /log implementation for the pydantic, fast-JSON and bulk paths.
+    Returns the DecisionResponse fields as a plain dict.
+    Retries (same Idempotency-Key header, or otherwise identical content)
+    return the original response without touching the RPC.
+    A pre-hashed request (timestamp + decision_hash) is rejected unless the
+    server derives the same hash.
     """
     if not payer:
         raise HTTPException(status_code=500, detail="Keypair not configured")
     
+    # Use objective_id as agent_id for now (or could be from request)
+    agent_id = f"API-Agent-{objective_id}"
+    if idempotency_key:
+        dedup_key = f"key:{agent_id}:{idempotency_key}"
+    elif decision_hash:
+        dedup_key = f"hash:{agent_id}:{decision_hash}"
+    else:
+        dedup_key = content_key(agent_id, objective_id, obs_dicts, action_plan, dry_run)
+
+    fingerprint = body_hash({
+        "objective_id": objective_id,
+        "observations": obs_dicts,
+        "action_plan": action_plan,
+        "dry_run": dry_run,
+        "timestamp": timestamp,
+        "decision_hash": decision_hash,
+    })
+
+    try:
+        owner, original = idempotency_store.begin(dedup_key, fingerprint=fingerprint)
+    except IdempotencyKeyReused as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except TimeoutError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if not owner:
+        return dict(original, replayed=True)
+
     try:
         # 1. Calculate Decision Hash using SDK
-        # Use objective_id as agent_id for now (or could be from request)
-        agent_id = f"API-Agent-{req.objective_id}"
-        agent = LogosAgent(agent_id=agent_id, objective_id=req.objective_id)
-        obs_dicts = [o.dict() for o in req.observations]
-        decision_hash = agent.decide(obs_dicts, req.action_plan)
+        agent = LogosAgent(agent_id=agent_id, objective_id=objective_id)
+        expected_hash = decision_hash
+        decision_hash = agent.decide(obs_dicts, action_plan, timestamp=timestamp)
+        if expected_hash and expected_hash != decision_hash:
+            raise PrevalidationError("HashMismatch", f"Client hash {expected_hash[:16]} does not match {decision_hash[:16]}")
+        audit_store.ingest(agent.history[-1])
         
         signature = None
-        if not req.dry_run:
-            # 2. Check if agent is registered, if not, register first
-            from sdk.onchain_utils import build_register_agent_ix
-            from solders.pubkey import Pubkey as SoldersPubkey
-            
-            agent_pda, _ = SoldersPubkey.find_program_address(
-                [b"agent", bytes(payer.pubkey())],
-                program_id
-            )
-            
-            # Try to fetch agent account
-            try:
-                account_info = client.get_account_info(agent_pda)
-                agent_exists = account_info.value is not None
-            except:
-                agent_exists = False
-            
-            # Register if needed
-            if not agent_exists:
-                print(f"Agent not registered. Registering {agent_id}...")
-                ix_register = build_register_agent_ix(program_id, payer.pubkey(), agent_id)
-                latest_blockhash = client.get_latest_blockhash().value.blockhash
-                msg_register = Message([ix_register], payer.pubkey())
-                tx_register = Transaction([payer], msg_register, latest_blockhash)
-                client.send_transaction(tx_register, opts=TxOpts(skip_preflight=False))
-                # Wait a bit for confirmation
-                import time
-                time.sleep(2)
-            
-            # 3. Build and send decision log transaction
-            ix = build_log_decision_ix(
-                program_id=program_id,
-                authority=payer.pubkey(),
+        if not dry_run:
+            # 2. Register (first use of each pool key) and send through the objective's key
+            signature = submitter.log_decision(
+                agent_id=agent_id,
+                objective_id=objective_id,
                 decision_hash=decision_hash,
-                objective_id=req.objective_id
+                timeout=SUBMIT_TIMEOUT
             )
-            
-            latest_blockhash = client.get_latest_blockhash().value.blockhash
-            msg = Message([ix], payer.pubkey())
-            tx = Transaction([payer], msg, latest_blockhash)
-            
-            resp = client.send_transaction(tx, opts=TxOpts(skip_preflight=False))
-            signature = str(resp.value)
+            audit_store.set_signature(decision_hash, signature)
             
         explorer_url = f"https://explorer.solana.com/tx/{signature}?cluster=devnet" if signature else None
         
-        return DecisionResponse(
-            decision_hash=decision_hash,
-            signature=signature,
-            status="committed" if signature else "simulated",
-            timestamp=datetime.utcnow().isoformat(),
-            explorer_url=explorer_url
-        )
+        response = {
+            "decision_hash": decision_hash,
+            "signature": signature,
+            "status": "committed" if signature else "simulated",
+            "timestamp": datetime.utcnow().isoformat(),
+            "explorer_url": explorer_url,
+            "replayed": False
+        }
+        idempotency_store.complete(dedup_key, response)
+        return response
 
+    except PrevalidationError as e:
+        idempotency_store.fail(dedup_key)
+        raise HTTPException(status_code=400, detail=f"{e.code}: {e}")
+    except TimeoutError as e:
+        idempotency_store.fail(dedup_key)
+        raise HTTPException(status_code=503, detail=f"Submission queue full: {e}")
     except Exception as e:
+        idempotency_store.fail(dedup_key)
         raise HTTPException(status_code=500, detail=f"Transaction failed: {str(e)}")
 
+def _decision_fields(req: DecisionRequest) -> Dict[str, Any]:
+    return {
+        "objective_id": req.objective_id,
+        "obs_dicts": [o.model_dump() for o in req.observations],
+        "action_plan": req.action_plan,
+        "dry_run": req.dry_run,
+        "timestamp": req.timestamp,
+        "decision_hash": req.decision_hash,
+    }
+
+def log_decision(req: DecisionRequest, idempotency_key: Optional[str] = Header(None)):
+    """
+    Log a decision to the Solana blockchain.
+    Declared sync so FastAPI runs it in its threadpool and the payer pool
+    can keep several submissions in flight at once.
+    """
+    return DecisionResponse(**_log_decision(**_decision_fields(req), idempotency_key=idempotency_key))
+
+async def log_decision_fast(request: Request, idempotency_key: Optional[str] = Header(None)):
+    """
+    Log a decision to the Solana blockchain (LOGOS_FAST_JSON=1).
+    Same contract as the pydantic route, but the body is parsed once and the
+    response is encoded without building models.
+    """
+    try:
+        fields = parse_decision_request(await request.body())
+    except RequestValidationError as e:
+        return Response(fast_json.dumps({"detail": e.errors}), status_code=422, media_type="application/json")
+    fields["idempotency_key"] = idempotency_key
+    result = await run_in_threadpool(lambda: _log_decision(**fields))
+    return Response(fast_json.dumps(result), media_type="application/json")
+
+app.post("/log", response_model=DecisionResponse)(log_decision_fast if FAST_JSON else log_decision)
+
+def _log_batch_item(fields: Dict[str, Any]) -> Dict[str, Any]:
+    try:
+        return {"status_code": 200, "result": _log_decision(**fields), "detail": None}
+    except HTTPException as e:
+        return {"status_code": e.status_code, "result": None, "detail": e.detail}
+
+def _log_batch(items: List[Dict[str, Any]]) -> Dict[str, Any]:
+    # Items run concurrently so one bulk request can fill the payer pool
+    return {"results": list(batch_executor.map(_log_batch_item, items))}
+
+def log_batch(req: LogBatchRequest):
+    """
+    Log up to MAX_BATCH_ITEMS decisions in one request. Each item carries its own
+    idempotency_key and gets its own status_code; one failure does not fail the batch.
+    """
+    if len(req.items) > MAX_BATCH_ITEMS:
+        raise HTTPException(status_code=422, detail=f"At most {MAX_BATCH_ITEMS} items per batch")
+    return _log_batch([dict(_decision_fields(item), idempotency_key=item.idempotency_key) for item in req.items])
+
+async def log_batch_fast(request: Request):
+    """Bulk counterpart of log_decision_fast (LOGOS_FAST_JSON=1)."""
+    try:
+        items = parse_batch_request(await request.body(), MAX_BATCH_ITEMS)
+    except RequestValidationError as e:
+        return Response(fast_json.dumps({"detail": e.errors}), status_code=422, media_type="application/json")
+    result = await run_in_threadpool(_log_batch, items)
+    return Response(fast_json.dumps(result), media_type="application/json")
+
+app.post("/log/batch")(log_batch_fast if FAST_JSON else log_batch)
+
+class VerifyItem(BaseModel):
+    agent: str                          # agent PDA (base58)
+    objective_id: str
+    decision_hash: Optional[str] = None # omit to only check existence
+
+class VerifyBatchRequest(BaseModel):
+    items: List[VerifyItem]
+
+def _verification_dict(result) -> Dict[str, Any]:
+    record = result.record
+    return {
+        "agent": result.agent,
+        "objective_id": result.objective_id,
+        "decision_pda": result.decision_pda,
+        "verified": result.verified,
+        "onchain_data": {
+            "decision_hash": record.decision_hash,
+            "objective_id": record.objective_id,
+            "agent": record.agent,
+            "timestamp": record.timestamp
+        } if record else None
+    }
+
 @app.get("/verify/{decision_hash}")
-async def verify_decision(decision_hash: str):
+def verify_decision(decision_hash: str):
     """
     Verify if a decision hash exists on-chain.
+    The objective is looked up in the local audit store; the record is then
+    checked under every pool key's agent account in one getMultipleAccounts call.
     """
-    # TODO: Query PDA to check if decision exists
-    # For now, return placeholder
+    local = audit_store.get(decision_hash)
+    if local is None:
+        return {
+            "decision_hash": decision_hash,
+            "verified": False,
+            "message": "Decision not found in the local audit store; use /verify/batch with agent and objective_id."
+        }
+    if not payer_pool:
+        raise HTTPException(status_code=500, detail="Keypair not configured")
+
+    items = [
+        (find_agent_pda(program_id, member.pubkey), local["objective_id"], decision_hash)
+        for member in payer_pool.members
+    ]
+    results = verifier.verify(items)
+    match = next((r for r in results if r.verified), None)
+    if match is None:
+        return {"decision_hash": decision_hash, "verified": False, "onchain_data": None}
+    return {"decision_hash": decision_hash, **_verification_dict(match)}
+
+@app.post("/verify/batch")
+def verify_batch(req: VerifyBatchRequest):
+    """
+    Verify many (agent, objective_id[, decision_hash]) items, 100 accounts per RPC call.
+    """
+    try:
+        items = [(Pubkey.from_string(i.agent), i.objective_id, i.decision_hash) for i in req.items]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid agent pubkey: {e}")
+    results = verifier.verify(items)
     return {
-        "decision_hash": decision_hash, 
-        "verified": False, 
-        "message": "PDA query not yet implemented. Check explorer manually."
+        "count": len(results),
+        "verified": sum(1 for r in results if r.verified),
+        "results": [_verification_dict(r) for r in results]
     }
 
+@app.get("/agents/{agent}/decisions")
+def agent_decisions(agent: str):
+    """
+    All decision records an agent PDA has on-chain (filtered getProgramAccounts).
+    """
+    try:
+        agent_pda = Pubkey.from_string(agent)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid agent pubkey: {e}")
+    records = verifier.list_agent_decisions(agent_pda)
+    return {"agent": agent, "count": len(records), "decisions": [asdict(r) for r in records]}
+
+@app.get("/audit/decisions")
+def audit_decisions(
+    agent_id: Optional[str] = None,
+    objective_id: Optional[str] = None,
+    action_type: Optional[str] = None,
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+    limit: int = 1000,
+    offset: int = 0
+):
+    """
+    Query the local audit store. Time range is start <= timestamp < end (unix seconds).
+    Declared sync so the SQLite read runs in the threadpool, off the event loop.
+    """
+    limit = max(1, min(limit, 10000))
+    decisions = audit_store.query(
+        agent_id=agent_id,
+        objective_id=objective_id,
+        action_type=action_type,
+        start=start,
+        end=end,
+        limit=limit,
+        offset=offset
+    )
+    return {"count": len(decisions), "decisions": decisions}
+
+@app.post("/audit/ingest")
+def audit_ingest(records: List[Dict[str, Any]]):
+    """
+    Bulk load DecisionRecords (the format of LogosAgent.export_logs()) into the audit store.
+    Declared sync: hashing and writing a large body must not stall the event loop.
+    """
+    try:
+        inserted = audit_store.ingest_many(records)
+    except (KeyError, TypeError, ValueError) as e:   # ValueError: unknown hash_scheme
+        raise HTTPException(status_code=400, detail=f"Invalid decision record: {e}")
+    return {"received": len(records), "inserted": inserted}
+
+@app.get("/stream/decisions")
+async def stream_decisions(agent_id: Optional[str] = None, objective_id: Optional[str] = None):
+    """
+    Server-sent events feed of committed / confirmed decisions, optionally filtered.
+    """
+    sub = decision_bus.subscribe(agent_id=agent_id, objective_id=objective_id)
+
+    async def events():
+        try:
+            while True:
+                try:
+                    message = await sub.get(timeout=STREAM_KEEPALIVE_SECONDS)
+                except ConnectionAbortedError as e:
+                    yield f"event: error\ndata: {json.dumps({'error': str(e)})}\n\n"
+                    return
+                if message is None:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: {message['type']}\ndata: {json.dumps(message)}\n\n"
+        finally:
+            decision_bus.unsubscribe(sub)
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache"})
+
+@app.websocket("/ws/decisions")
+async def ws_decisions(websocket: WebSocket, agent_id: Optional[str] = None, objective_id: Optional[str] = None):
+    """
+    WebSocket feed of committed / confirmed decisions, optionally filtered.
+    """
+    await websocket.accept()
+    sub = decision_bus.subscribe(agent_id=agent_id, objective_id=objective_id)
+    try:
+        while True:
+            try:
+                message = await sub.get(timeout=STREAM_KEEPALIVE_SECONDS)
+            except ConnectionAbortedError as e:
+                await websocket.close(code=1013, reason=str(e))
+                return
+            if message is not None:
+                await websocket.send_json(message)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        decision_bus.unsubscribe(sub)
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
@@ -175,7 +499,8 @@ async def health_check():
             "status": "healthy",
             "rpc_url": RPC_URL,
             "program_id": PROGRAM_ID_STR,
-            "wallet_balance": balance / 1e9  # Convert lamports to SOL
+            "wallet_balance": balance / 1e9,  # Convert lamports to SOL
+            "payer_keys": len(payer_pool) if payer_pool else 0
         }
     except Exception as e:
         return {"status": "degraded", "error": str(e)}
@@ -185,4 +510,23 @@ if __name__ == "__main__":
     print(f"   Program ID: {PROGRAM_ID_STR}")
     print(f"   Network: Devnet")
     print(f"   RPC: {RPC_URL}")
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    workers = int(os.getenv("LOGOS_WORKERS", "1"))
+    if workers > 1 and submitter:
+        import multiprocessing
+        import tempfile
+
+        # Workers are started by uvicorn and re-import this module; they find the
+        # coordinator through these variables.
+        address = os.path.join(tempfile.gettempdir(), f"logos-coordinator-{os.getpid()}.sock")
+        authkey = os.urandom(32)
+        os.environ["LOGOS_COORDINATOR_ADDRESS"] = address
+        os.environ["LOGOS_COORDINATOR_AUTHKEY"] = authkey.hex()
+        coordinator = SubmissionCoordinator(submitter, address, authkey, idempotency=idempotency_store)
+        submitter.event_sink = coordinator   # fan lifecycle events out to every worker
+        multiprocessing.get_context("fork").Process(
+            target=coordinator.serve_forever, name="logos-coordinator", daemon=True
+        ).start()
+        print(f"   Workers: {workers} (coordinator at {address})")
+        uvicorn.run("api_server:app", host="0.0.0.0", port=8000, workers=workers)
+    else:
+        uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,51 @@
+"""
+decide() latency on 1M-element NumPy observations: buffer hashing (sdk.arrays)
+vs the old convert-to-list approach.
+
+    python benchmarks/bench_array_hash.py [n_elements] [repeats]
+"""
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sdk.core import LogosAgent
+
+
+def bench(label, fn, repeats):
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<26} {statistics.median(samples) * 1000:>9.1f} ms   peak +{peak / 2 ** 20:>7.1f} MiB")
+
+
+def main():
+    try:
+        import numpy as np
+    except ImportError:
+        print("numpy not installed")
+        return
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    prices = np.random.default_rng(0).random(n)
+    depth = np.random.default_rng(1).integers(0, 10_000, size=(n // 1000, 1000), dtype=np.int64)
+    agent = LogosAgent("Bench-Agent", "Bench-v1", verbose=False)
+    action = {"cmd": "rebalance"}
+
+    print(f"{n:,} float64 prices + {depth.size:,} int64 depth levels")
+    bench("arrays (buffer digest)", lambda: agent.decide({"prices": prices, "depth": depth}, action), repeats)
+    bench("lists (tolist + json)", lambda: agent.decide({"prices": prices.tolist(), "depth": depth.tolist()}, action),
+          repeats)
+
+
+if __name__ == "__main__":
+    main()
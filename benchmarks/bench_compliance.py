@@ -0,0 +1,39 @@
+"""
+Compliance certificate verification throughput: serial, process pool, and
+a second pass served from the verifier's cache.
+
+    python benchmarks/bench_compliance.py [count]
+"""
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sdk.compliance import CertificateVerifier, ComplianceProvider
+
+
+def timed(verifier: CertificateVerifier, certs) -> float:
+    start = time.perf_counter()
+    assert all(verifier.verify_batch(certs))
+    return time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    provider = ComplianceProvider("Bench_Oracle")
+    certs = [provider.sign(f"Recipient{i}", i % 5000, passed=True).to_dict() for i in range(count)]
+    print(f"{count} certificates, {os.cpu_count()} cores")
+
+    with CertificateVerifier(workers=1) as serial:
+        elapsed = timed(serial, certs)
+        print(f"serial      {elapsed:7.2f}s  {count / elapsed:10,.0f}/s")
+    with CertificateVerifier(parallel_threshold=1) as parallel:
+        elapsed = timed(parallel, certs)
+        print(f"parallel    {elapsed:7.2f}s  {count / elapsed:10,.0f}/s  ({parallel.workers} processes)")
+        elapsed = timed(parallel, certs)
+        print(f"cached      {elapsed:7.2f}s  {count / elapsed:10,.0f}/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Decoder throughput: records decoded per second.
+
+    python benchmarks/bench_decoders.py [n_records]
+"""
+import os
+import struct
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sdk.decoders import (
+    COMPACT_DECISION_RECORD_DISCRIMINATOR,
+    DECISION_RECORD_DISCRIMINATOR,
+    decode_decision_record,
+    decode_decision_records,
+)
+
+
+def make_records(n: int, agents: int = 10):
+    records = []
+    for i in range(n):
+        agent = bytes([i % agents]) * 32
+        objective = f"Auto-Repay-Policy-v4-{i % 1000}".encode()
+        digest = i.to_bytes(32, "little")
+        if i % 2:
+            body = COMPACT_DECISION_RECORD_DISCRIMINATOR + agent + digest
+        else:
+            body = DECISION_RECORD_DISCRIMINATOR + agent + struct.pack("<I", 64) + digest.hex().encode()
+        records.append(body + struct.pack("<I", len(objective)) + objective + struct.pack("<q", 1707000000 + i))
+    return records
+
+
+def bench(label, fn, n):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<32} {n / elapsed:>14,.0f} records/s  ({elapsed * 1000:.1f} ms)")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    records = make_records(n)
+    print(f"Decoding {n:,} DecisionRecord accounts (half string, half compact layout)")
+    bench("decode_decision_record (loop)", lambda: [decode_decision_record(r) for r in records], n)
+    bench("decode_decision_records", lambda: decode_decision_records(records), n)
+    bench("decode_decision_records columns", lambda: decode_decision_records(records, columns=True), n)
+
+
+if __name__ == "__main__":
+    main()
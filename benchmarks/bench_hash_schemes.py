@@ -0,0 +1,64 @@
+"""
+Hash-scheme throughput (MB/s) across payload sizes, plus hash_observation
+latency for a large observation under each scheme.
+
+    python benchmarks/bench_hash_schemes.py
+"""
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sdk.core import LogosAgent
+from sdk.hash_schemes import available_schemes, hash_hex
+
+SIZES = [64, 1024, 64 * 1024, 1024 * 1024, 16 * 1024 * 1024]
+
+
+def throughput(scheme: str, size: int) -> float:
+    data = os.urandom(size)
+    rounds = max(3, (64 * 1024 * 1024) // size)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        hash_hex(data, scheme)
+    return size * rounds / (time.perf_counter() - start) / 1e6
+
+
+def main():
+    schemes = [name for name, ok in available_schemes().items() if ok]
+    missing = [name for name, ok in available_schemes().items() if not ok]
+    print(f"{'payload':>10} " + " ".join(f"{name:>14}" for name in schemes) + "   (MB/s)")
+    for size in SIZES:
+        label = f"{size // 1024}KiB" if size >= 1024 else f"{size}B"
+        print(f"{label:>10} " + " ".join(f"{throughput(name, size):>14,.0f}" for name in schemes))
+    if missing:
+        print(f"not installed: {', '.join(missing)}")
+
+    observation = [{"protocol": f"p{i}", "book": list(range(2000)), "mid": i * 0.5} for i in range(500)]
+    size = len(json.dumps(observation, sort_keys=True))
+    print(f"\nhash_observation, {size / 1e6:.1f} MB observation")
+    for name in schemes:
+        agent = LogosAgent("Bench-Agent", "Bench-v1", verbose=False, hash_scheme=name)
+        start = time.perf_counter()
+        for _ in range(5):
+            agent.hash_observation(observation)
+        print(f"{name:>14} {(time.perf_counter() - start) / 5 * 1000:>9.1f} ms")
+
+    try:
+        import numpy as np
+    except ImportError:
+        return
+    prices = np.random.default_rng(0).random(4_000_000)
+    print(f"\nhash_observation, {prices.nbytes / 1e6:.0f} MB float64 array (buffer digest)")
+    for name in schemes:
+        agent = LogosAgent("Bench-Agent", "Bench-v1", verbose=False, hash_scheme=name)
+        start = time.perf_counter()
+        for _ in range(5):
+            agent.hash_observation({"prices": prices})
+        print(f"{name:>14} {(time.perf_counter() - start) / 5 * 1000:>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Cold import time of the SDK entry points, each in a fresh interpreter.
+
+    python benchmarks/bench_import.py [runs]
+
+Modules whose dependencies are not installed are reported as unavailable.
+"""
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TARGETS = [
+    "sdk",
+    "sdk.core",
+    "sdk.merkle",
+    "sdk.onchain_utils",
+    "sdk.payer_pool",
+    "api_server",
+]
+
+_PROBE = (
+    "import time; t = time.perf_counter(); import {module}; "
+    "print(time.perf_counter() - t)"
+)
+
+
+def import_seconds(module: str) -> float:
+    """Seconds spent importing module in a fresh interpreter (raises if it fails)."""
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(module=module)],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    print(f"{'module':<24} {'median':>10} {'min':>10}   ({runs} runs)")
+    for module in TARGETS:
+        try:
+            samples = [import_seconds(module) for _ in range(runs)]
+        except subprocess.CalledProcessError:
+            print(f"{module:<24} {'unavailable':>10}")
+            continue
+        print(f"{module:<24} {statistics.median(samples) * 1000:>8.1f}ms {min(samples) * 1000:>8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Per-request CPU of the /log body handling: parse, validate, hash, encode response.
+
+    python benchmarks/bench_json_path.py [n_requests]
+
+"model" is the pydantic route (json.loads -> DecisionRequest -> .model_dump() ->
+asdict-based record hash -> model response); "fast" is sdk.fast_json.
+Both must produce the same observation hash. The model path needs pydantic.
+"""
+import hashlib
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, List
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sdk import fast_json
+from sdk.core import DecisionRecord, DecisionSnapshot, LogosAgent
+
+BODY = json.dumps({
+    "objective_id": "Liquidation-Guard-v1",
+    "observations": [
+        {
+            "source": f"protocol-{i}",
+            "content": {"health_factor": 1.05 + i / 100, "borrow_apy": 0.04, "depth": list(range(50))},
+            "timestamp": 1707000000 + i,
+        }
+        for i in range(8)
+    ],
+    "action_plan": {"cmd": "repay", "amount": 1000, "route": ["kamino", "marginfi"]},
+    "dry_run": True,
+}).encode()
+
+
+def record_for(agent: LogosAgent, observations, action_plan) -> DecisionRecord:
+    snapshot = DecisionSnapshot(agent.hash_observation(observations), action_plan)
+    return DecisionRecord(agent.agent_id, 1707000000.0, agent.objective_id, snapshot)
+
+
+def fast_path() -> bytes:
+    fields = fast_json.parse_decision_request(BODY)
+    agent = LogosAgent("API-Agent", fields["objective_id"])
+    record = record_for(agent, fields["obs_dicts"], fields["action_plan"])
+    return fast_json.dumps({"decision_hash": record.compute_hash(), "observation_hash": record.snapshot.observation_hash})
+
+
+def model_path_factory():
+    from pydantic import BaseModel
+
+    class ObservationData(BaseModel):
+        source: str
+        content: Dict[str, Any]
+        timestamp: float
+
+    class DecisionRequest(BaseModel):
+        objective_id: str
+        observations: List[ObservationData]
+        action_plan: Dict[str, Any]
+        dry_run: bool = False
+
+    class Response(BaseModel):
+        decision_hash: str
+        observation_hash: str
+
+    def model_path() -> bytes:
+        req = DecisionRequest(**json.loads(BODY))
+        agent = LogosAgent("API-Agent", req.objective_id)
+        record = record_for(agent, [o.model_dump() for o in req.observations], req.action_plan)
+        decision_hash = hashlib.sha256(record.to_json().encode('utf-8')).hexdigest()
+        return Response(decision_hash=decision_hash,
+                        observation_hash=record.snapshot.observation_hash).model_dump_json().encode()
+
+    return model_path
+
+
+def bench(label, fn, n):
+    start = time.process_time()
+    for _ in range(n):
+        out = fn()
+    elapsed = time.process_time() - start
+    print(f"{label:<8} {elapsed / n * 1e6:>10.1f} us CPU/request")
+    return out
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    print(f"orjson: {'yes' if fast_json.orjson is not None else 'no (stdlib fallback)'}")
+    fast = json.loads(bench("fast", fast_path, n))
+    try:
+        model_path = model_path_factory()
+    except ImportError:
+        print("model    unavailable (pydantic not installed)")
+        return
+    model = json.loads(bench("model", model_path, n))
+    assert model == fast, (model, fast)
+    print("hashes identical")
+
+
+if __name__ == "__main__":
+    main()
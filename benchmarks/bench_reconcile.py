@@ -0,0 +1,40 @@
+"""
+Reconciliation throughput and memory: N local decisions against an
+on-chain set missing 1% of them, both unsorted, through the external sort.
+
+    python benchmarks/bench_reconcile.py [count] [run_size]
+"""
+import hashlib
+import os
+import random
+import resource
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sdk.reconcile import reconcile
+
+
+def _hash(i: int) -> str:
+    return hashlib.sha256(i.to_bytes(8, "little")).hexdigest()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    run_size = int(sys.argv[2]) if len(sys.argv) > 2 else 250_000
+    seed = random.Random(7)
+    local = ((_hash(i), f"Obj-{i % 1000}", "sha256") for i in range(count))
+    remote = (_hash(i) for i in range(count) if seed.random() >= 0.01)
+
+    start = time.perf_counter()
+    report = reconcile(local, remote, run_size=run_size)
+    elapsed = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{count:,} local records, run_size {run_size:,}")
+    print(f"missing {report.missing:,}  matched {report.matched:,}  unexpected {report.unexpected}")
+    print(f"{elapsed:.1f}s  ({count / elapsed:,.0f} records/s)  peak RSS {peak_mb:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
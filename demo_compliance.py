@@ -75,6 +75,7 @@ def main():
 
     # 2. Initialize Compliance Provider
     regtech = ComplianceProvider("Beon_Compliance_Oracle")
+    print(f"🔑 Compliance provider key: {regtech.public_key}")
 
     # 3. Simulate Scenarios
     scenarios = [
@@ -108,7 +109,7 @@ def main():
                     "action": action,
                     "target": scen["recipient"],
                     "amount": scen["amount"],
-                    "compliance_proof": check_result.get("proof_hash", "N/A")
+                    "compliance_proof": check_result["certificate"]
                 }
             )
             print(f"✅ Decision Logged on Solana: https://explorer.solana.com/tx/{tx_sig}?cluster=devnet")
@@ -16,10 +16,12 @@ pub mod logos_core {
         emit!(AgentRegistered {
             agent: agent_account.key(),
             agent_id: agent_id,
-            authority: ctx.accounts.authority.key(),
+            authority: agent_account.authority,
             timestamp: agent_account.created_at,
         });
         
+        // The event already carries this; `lean` builds skip the formatted log line.
+        #[cfg(not(feature = "lean"))]
         msg!("Agent registered: {}", agent_account.agent_id);
         Ok(())
     }
@@ -42,16 +44,166 @@ pub mod logos_core {
         decision_record.timestamp = Clock::get()?.unix_timestamp; // On-chain time is the source of truth
         
         // Emit event for off-chain indexing (Hybrid Storage: Event Log)
+        // The arguments move into the event; the record keeps the only copies.
         emit!(DecisionLogged {
             agent: decision_record.agent,
-            objective_id: objective_id.clone(),
-            decision_hash: decision_hash.clone(),
+            objective_id,
+            decision_hash,
             timestamp: decision_record.timestamp,
         });
         
-        msg!("Decision Logged. Obj: {}, Hash: {}", objective_id, decision_record.decision_hash);
+        #[cfg(not(feature = "lean"))]
+        msg!("Decision Logged. Obj: {}, Hash: {}", decision_record.objective_id, decision_record.decision_hash);
         Ok(())
     }
+
+    /// Compact variant of `log_decision`.
+    /// Takes the raw 32-byte SHA-256 digest instead of its 64-char hex encoding,
+    /// halving the hash bytes in both the instruction data and the record account.
+    pub fn log_decision_compact(
+        ctx: Context<LogDecisionCompact>,
+        decision_hash: [u8; 32],
+        objective_id: String
+    ) -> Result<()> {
+        require!(objective_id.len() <= MAX_OBJECTIVE_ID_LEN, LogosError::ObjectiveIdTooLong);
+
+        let decision_record = &mut ctx.accounts.decision_record;
+        decision_record.agent = ctx.accounts.agent_account.key();
+        decision_record.decision_hash = decision_hash;
+        decision_record.objective_id = objective_id;
+        decision_record.timestamp = Clock::get()?.unix_timestamp;
+
+        emit!(CompactDecisionLogged {
+            agent: decision_record.agent,
+            objective_id: decision_record.objective_id.clone(),
+            decision_hash,
+            timestamp: decision_record.timestamp,
+        });
+
+        Ok(())
+    }
+
+    /// Creates the per-agent ring buffer used by `append_decision`.
+    /// One fixed-size account replaces a rent-paying PDA per objective.
+    pub fn init_decision_log(ctx: Context<InitDecisionLog>) -> Result<()> {
+        let mut decision_log = ctx.accounts.decision_log.load_init()?;
+        decision_log.agent = ctx.accounts.agent_account.key();
+        decision_log.total = 0;
+        Ok(())
+    }
+
+    /// Appends a compact record to the agent's ring buffer, overwriting the
+    /// oldest entry once `DECISION_LOG_CAPACITY` is reached. The full history
+    /// lives in `DecisionAppended` events; the buffer holds the recent window.
+    /// Objective IDs may repeat, unlike the PDA-per-objective path.
+    pub fn append_decision(
+        ctx: Context<AppendDecision>,
+        decision_hash: [u8; 32],
+        objective_id: String
+    ) -> Result<()> {
+        require!(objective_id.len() <= MAX_OBJECTIVE_ID_LEN, LogosError::ObjectiveIdTooLong);
+
+        let timestamp = Clock::get()?.unix_timestamp;
+        let mut decision_log = ctx.accounts.decision_log.load_mut()?;
+        let sequence = decision_log.total;
+        let slot = (sequence % DECISION_LOG_CAPACITY as u64) as usize;
+        decision_log.entries[slot] = LogEntry {
+            decision_hash,
+            objective_tag: objective_tag(&objective_id),
+            timestamp,
+        };
+        decision_log.total = sequence + 1;
+
+        emit!(DecisionAppended {
+            agent: decision_log.agent,
+            sequence,
+            objective_id,
+            decision_hash,
+            timestamp,
+        });
+        Ok(())
+    }
+
+    /// Closes the ring buffer and returns its rent to the authority.
+    pub fn close_decision_log(_ctx: Context<CloseDecisionLog>) -> Result<()> {
+        Ok(())
+    }
+
+    /// Logs up to `MAX_BATCH_ENTRIES` decisions in one instruction.
+    /// Only the Merkle root and count are stored (one `DecisionBatch` account per
+    /// batch); the entries themselves go out in a single `DecisionsLogged` event.
+    /// The caller passes the root so the PDA can be derived from it; the program
+    /// recomputes it from `entries` and rejects a mismatch.
+    pub fn log_decisions(
+        ctx: Context<LogDecisions>,
+        batch_root: [u8; 32],
+        entries: Vec<BatchEntry>
+    ) -> Result<()> {
+        require!(!entries.is_empty(), LogosError::EmptyBatch);
+        require!(entries.len() <= MAX_BATCH_ENTRIES, LogosError::BatchTooLarge);
+        for entry in entries.iter() {
+            require!(entry.objective_id.len() <= MAX_OBJECTIVE_ID_LEN, LogosError::ObjectiveIdTooLong);
+        }
+        require!(decision_batch_root(&entries) == batch_root, LogosError::BatchRootMismatch);
+
+        let batch = &mut ctx.accounts.decision_batch;
+        batch.agent = ctx.accounts.agent_account.key();
+        batch.batch_root = batch_root;
+        batch.count = entries.len() as u32;
+        batch.timestamp = Clock::get()?.unix_timestamp;
+
+        emit!(DecisionsLogged {
+            agent: batch.agent,
+            batch_root,
+            entries,
+            timestamp: batch.timestamp,
+        });
+        Ok(())
+    }
+}
+
+pub const MAX_OBJECTIVE_ID_LEN: usize = 50;
+pub const DECISION_LOG_CAPACITY: usize = 128;
+/// Upper bound on `log_decisions` entries; in practice the 1232-byte
+/// transaction limit caps a batch first (~20 entries with 20-byte objectives).
+pub const MAX_BATCH_ENTRIES: usize = 64;
+
+/// First 8 bytes of SHA-256(objective_id): enough to filter a ring buffer by objective.
+pub fn objective_tag(objective_id: &str) -> [u8; 8] {
+    let digest = anchor_lang::solana_program::hash::hash(objective_id.as_bytes()).to_bytes();
+    let mut tag = [0u8; 8];
+    tag.copy_from_slice(&digest[..8]);
+    tag
+}
+
+/// Leaf of a `log_decisions` batch: SHA-256(0x00 || u32 len || objective_id || decision_hash).
+pub fn batch_leaf(entry: &BatchEntry) -> [u8; 32] {
+    let len = (entry.objective_id.len() as u32).to_le_bytes();
+    anchor_lang::solana_program::hash::hashv(&[
+        &[0u8],
+        &len,
+        entry.objective_id.as_bytes(),
+        &entry.decision_hash,
+    ])
+    .to_bytes()
+}
+
+/// Binary Merkle root over the batch leaves, inner nodes SHA-256(0x01 || left || right).
+/// An unpaired last node is promoted unchanged, as in the SDK's observation trees.
+pub fn decision_batch_root(entries: &[BatchEntry]) -> [u8; 32] {
+    let mut level: Vec<[u8; 32]> = entries.iter().map(batch_leaf).collect();
+    while level.len() > 1 {
+        let mut next = Vec::with_capacity((level.len() + 1) / 2);
+        for pair in level.chunks(2) {
+            next.push(match pair {
+                [left, right] => anchor_lang::solana_program::hash::hashv(&[&[1u8], left, right]).to_bytes(),
+                [single] => *single,
+                _ => unreachable!(),
+            });
+        }
+        level = next;
+    }
+    level.first().copied().unwrap_or([0u8; 32])
 }
 
 #[derive(Accounts)]
@@ -88,6 +240,89 @@ pub struct LogDecision<'info> {
     pub system_program: Program<'info, System>,
 }
 
+#[derive(Accounts)]
+#[instruction(decision_hash: [u8; 32], objective_id: String)]
+pub struct LogDecisionCompact<'info> {
+    // Same seeds as `LogDecision`: one record per (agent, objective_id) whichever variant wrote it.
+    #[account(
+        init,
+        seeds = [b"decision", agent_account.key().as_ref(), objective_id.as_bytes()],
+        bump,
+        payer = authority,
+        space = 8 + 32 + 32 + 4 + MAX_OBJECTIVE_ID_LEN + 8
+    )]
+    pub decision_record: Account<'info, CompactDecisionRecord>,
+    #[account(mut, has_one = authority)]
+    pub agent_account: Account<'info, AgentAccount>,
+    #[account(mut)]
+    pub authority: Signer<'info>,
+    pub system_program: Program<'info, System>,
+}
+
+#[derive(Accounts)]
+pub struct InitDecisionLog<'info> {
+    #[account(
+        init,
+        seeds = [b"decision_log", agent_account.key().as_ref()],
+        bump,
+        payer = authority,
+        space = 8 + std::mem::size_of::<DecisionLog>()
+    )]
+    pub decision_log: AccountLoader<'info, DecisionLog>,
+    #[account(has_one = authority)]
+    pub agent_account: Account<'info, AgentAccount>,
+    #[account(mut)]
+    pub authority: Signer<'info>,
+    pub system_program: Program<'info, System>,
+}
+
+#[derive(Accounts)]
+pub struct AppendDecision<'info> {
+    #[account(
+        mut,
+        seeds = [b"decision_log", agent_account.key().as_ref()],
+        bump
+    )]
+    pub decision_log: AccountLoader<'info, DecisionLog>,
+    #[account(has_one = authority)]
+    pub agent_account: Account<'info, AgentAccount>,
+    pub authority: Signer<'info>,
+}
+
+#[derive(Accounts)]
+pub struct CloseDecisionLog<'info> {
+    #[account(
+        mut,
+        close = authority,
+        seeds = [b"decision_log", agent_account.key().as_ref()],
+        bump
+    )]
+    pub decision_log: AccountLoader<'info, DecisionLog>,
+    #[account(has_one = authority)]
+    pub agent_account: Account<'info, AgentAccount>,
+    #[account(mut)]
+    pub authority: Signer<'info>,
+}
+
+#[derive(Accounts)]
+#[instruction(batch_root: [u8; 32])]
+pub struct LogDecisions<'info> {
+    // One account per distinct batch: replaying the same batch fails on init.
+    #[account(
+        init,
+        seeds = [b"decision_batch", agent_account.key().as_ref(), batch_root.as_ref()],
+        bump,
+        payer = authority,
+        space = 8 + 32 + 32 + 4 + 8
+    )]
+    pub decision_batch: Account<'info, DecisionBatch>,
+    #[account(has_one = authority)]
+    pub agent_account: Account<'info, AgentAccount>,
+    #[account(mut)]
+    pub authority: Signer<'info>,
+    pub system_program: Program<'info, System>,
+}
+
 #[account]
 pub struct AgentAccount {
     pub authority: Pubkey,
@@ -103,10 +338,55 @@ pub struct DecisionRecord {
     pub timestamp: i64,
 }
 
+#[account]
+pub struct CompactDecisionRecord {
+    pub agent: Pubkey,
+    pub decision_hash: [u8; 32],
+    pub objective_id: String,
+    pub timestamp: i64,
+}
+
+#[account(zero_copy)]
+pub struct DecisionLog {
+    pub agent: Pubkey,
+    /// Decisions ever appended; the next slot is `total % DECISION_LOG_CAPACITY`.
+    pub total: u64,
+    pub entries: [LogEntry; DECISION_LOG_CAPACITY],
+}
+
+#[zero_copy]
+pub struct LogEntry {
+    pub decision_hash: [u8; 32],
+    pub objective_tag: [u8; 8],
+    pub timestamp: i64,
+}
+
+#[account]
+pub struct DecisionBatch {
+    pub agent: Pubkey,
+    pub batch_root: [u8; 32],
+    pub count: u32,
+    pub timestamp: i64,
+}
+
+#[derive(AnchorSerialize, AnchorDeserialize, Clone, Debug, PartialEq, Eq)]
+pub struct BatchEntry {
+    pub objective_id: String,
+    pub decision_hash: [u8; 32],
+}
+
 #[error_code]
 pub enum LogosError {
     #[msg("Decision hash must be exactly 64 characters.")]
     InvalidHashLength,
+    #[msg("Objective ID must be at most 50 bytes.")]
+    ObjectiveIdTooLong,
+    #[msg("A decision batch must contain at least one entry.")]
+    EmptyBatch,
+    #[msg("A decision batch may contain at most 64 entries.")]
+    BatchTooLarge,
+    #[msg("Batch root does not match the submitted entries.")]
+    BatchRootMismatch,
 }
 
 // ========== Events (for off-chain indexing) ==========
@@ -126,3 +406,28 @@ pub struct DecisionLogged {
     pub decision_hash: String,
     pub timestamp: i64,
 }
+
+#[event]
+pub struct CompactDecisionLogged {
+    pub agent: Pubkey,
+    pub objective_id: String,
+    pub decision_hash: [u8; 32],
+    pub timestamp: i64,
+}
+
+#[event]
+pub struct DecisionAppended {
+    pub agent: Pubkey,
+    pub sequence: u64,
+    pub objective_id: String,
+    pub decision_hash: [u8; 32],
+    pub timestamp: i64,
+}
+
+#[event]
+pub struct DecisionsLogged {
+    pub agent: Pubkey,
+    pub batch_root: [u8; 32],
+    pub entries: Vec<BatchEntry>,
+    pub timestamp: i64,
+}
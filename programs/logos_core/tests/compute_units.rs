@@ -0,0 +1,184 @@
+//! Compute-unit profile of every logos_core instruction (program-test harness).
+//!
+//! Each instruction is simulated against a fresh bank at several input sizes
+//! (objective / agent ID bytes, or entries for `log_decisions`), so the numbers
+//! include account init, rent CPI and event emission. Loads the built program
+//! from `target/deploy`:
+//!     anchor build && SBF_OUT_DIR=target/deploy cargo test -p logos_core --test compute_units -- --nocapture
+//! Profile the lean build with `anchor build -- --features lean` and
+//! `cargo test ... --features lean`. Set LOGOS_CU_REPORT=<path> to write the
+//! profile as JSON for the Python SDK (sdk/cu_profile.py).
+
+use anchor_lang::{InstructionData, ToAccountMetas};
+use logos_core::{decision_batch_root, BatchEntry};
+use solana_program_test::{ProgramTest, ProgramTestContext};
+use solana_sdk::{
+    instruction::Instruction,
+    pubkey::Pubkey,
+    signature::Signer,
+    system_program,
+    transaction::Transaction,
+};
+use std::collections::BTreeMap;
+
+const AGENT_ID_SIZES: &[usize] = &[1, 16, 46];
+// log_decision's record fits 42 objective bytes next to the 64-char hex hash.
+const STRING_OBJECTIVE_SIZES: &[usize] = &[1, 16, 32, 42];
+const OBJECTIVE_SIZES: &[usize] = &[1, 16, 32, 50];
+const BATCH_SIZES: &[usize] = &[1, 2, 4, 8, 16];
+
+type Profile = BTreeMap<&'static str, BTreeMap<usize, u64>>;
+
+fn pda(seeds: &[&[u8]]) -> Pubkey {
+    Pubkey::find_program_address(seeds, &logos_core::ID).0
+}
+
+async fn units(ctx: &mut ProgramTestContext, ix: Instruction) -> u64 {
+    let blockhash = ctx.get_new_latest_blockhash().await.unwrap();
+    let tx = Transaction::new_signed_with_payer(&[ix], Some(&ctx.payer.pubkey()), &[&ctx.payer], blockhash);
+    let sim = ctx.banks_client.simulate_transaction(tx).await.unwrap();
+    let details = sim.simulation_details.expect("simulation details");
+    if let Some(Err(e)) = sim.result {
+        panic!("simulation failed: {e:?}\n{}", details.logs.join("\n"));
+    }
+    details.units_consumed
+}
+
+async fn send(ctx: &mut ProgramTestContext, ix: Instruction) {
+    let blockhash = ctx.get_new_latest_blockhash().await.unwrap();
+    let tx = Transaction::new_signed_with_payer(&[ix], Some(&ctx.payer.pubkey()), &[&ctx.payer], blockhash);
+    ctx.banks_client.process_transaction(tx).await.unwrap();
+}
+
+fn register_ix(authority: Pubkey, agent: Pubkey, agent_id: String) -> Instruction {
+    Instruction {
+        program_id: logos_core::ID,
+        accounts: logos_core::accounts::RegisterAgent { agent_account: agent, authority, system_program: system_program::ID }
+            .to_account_metas(None),
+        data: logos_core::instruction::RegisterAgent { agent_id }.data(),
+    }
+}
+
+fn report_json(profile: &Profile) -> String {
+    let variant = if cfg!(feature = "lean") { "lean" } else { "default" };
+    let kinds: Vec<String> = profile
+        .iter()
+        .map(|(kind, sizes)| {
+            let points: Vec<String> = sizes.iter().map(|(size, cu)| format!("\"{size}\": {cu}")).collect();
+            format!("    \"{kind}\": {{{}}}", points.join(", "))
+        })
+        .collect();
+    format!("{{\n  \"variant\": \"{variant}\",\n  \"instructions\": {{\n{}\n  }}\n}}\n", kinds.join(",\n"))
+}
+
+#[tokio::test]
+async fn profile_compute_units() {
+    let mut ctx = ProgramTest::new("logos_core", logos_core::ID, None)
+        .start_with_context()
+        .await;
+    let authority = ctx.payer.pubkey();
+    let agent = pda(&[b"agent", authority.as_ref()]);
+    let decision_log = pda(&[b"decision_log", agent.as_ref()]);
+    let mut profile = Profile::new();
+
+    // Simulations never commit, so every sample starts from the same state.
+    for &n in AGENT_ID_SIZES {
+        let cu = units(&mut ctx, register_ix(authority, agent, "a".repeat(n))).await;
+        profile.entry("register_agent").or_default().insert(n, cu);
+    }
+    send(&mut ctx, register_ix(authority, agent, "CU-Profile-Agent".to_string())).await;
+
+    for &n in STRING_OBJECTIVE_SIZES {
+        let objective_id = "o".repeat(n);
+        let ix = Instruction {
+            program_id: logos_core::ID,
+            accounts: logos_core::accounts::LogDecision {
+                decision_record: pda(&[b"decision", agent.as_ref(), objective_id.as_bytes()]),
+                agent_account: agent,
+                authority,
+                system_program: system_program::ID,
+            }
+            .to_account_metas(None),
+            data: logos_core::instruction::LogDecision { decision_hash: "ab".repeat(32), objective_id }.data(),
+        };
+        let cu = units(&mut ctx, ix).await;
+        profile.entry("log_decision").or_default().insert(n, cu);
+    }
+
+    for &n in OBJECTIVE_SIZES {
+        let objective_id = "o".repeat(n);
+        let ix = Instruction {
+            program_id: logos_core::ID,
+            accounts: logos_core::accounts::LogDecisionCompact {
+                decision_record: pda(&[b"decision", agent.as_ref(), objective_id.as_bytes()]),
+                agent_account: agent,
+                authority,
+                system_program: system_program::ID,
+            }
+            .to_account_metas(None),
+            data: logos_core::instruction::LogDecisionCompact { decision_hash: [0xab; 32], objective_id }.data(),
+        };
+        let cu = units(&mut ctx, ix).await;
+        profile.entry("log_decision_compact").or_default().insert(n, cu);
+    }
+
+    for &n in BATCH_SIZES {
+        let entries: Vec<BatchEntry> = (0..n)
+            .map(|i| BatchEntry { objective_id: format!("Obj-{i:04}"), decision_hash: [i as u8; 32] })
+            .collect();
+        let batch_root = decision_batch_root(&entries);
+        let ix = Instruction {
+            program_id: logos_core::ID,
+            accounts: logos_core::accounts::LogDecisions {
+                decision_batch: pda(&[b"decision_batch", agent.as_ref(), batch_root.as_ref()]),
+                agent_account: agent,
+                authority,
+                system_program: system_program::ID,
+            }
+            .to_account_metas(None),
+            data: logos_core::instruction::LogDecisions { batch_root, entries }.data(),
+        };
+        let cu = units(&mut ctx, ix).await;
+        profile.entry("log_decisions").or_default().insert(n, cu);
+    }
+
+    let init = Instruction {
+        program_id: logos_core::ID,
+        accounts: logos_core::accounts::InitDecisionLog { decision_log, agent_account: agent, authority, system_program: system_program::ID }
+            .to_account_metas(None),
+        data: logos_core::instruction::InitDecisionLog {}.data(),
+    };
+    let cu = units(&mut ctx, init.clone()).await;
+    profile.entry("init_decision_log").or_default().insert(0, cu);
+    send(&mut ctx, init).await;
+
+    for &n in OBJECTIVE_SIZES {
+        let ix = Instruction {
+            program_id: logos_core::ID,
+            accounts: logos_core::accounts::AppendDecision { decision_log, agent_account: agent, authority }
+                .to_account_metas(None),
+            data: logos_core::instruction::AppendDecision { decision_hash: [0xab; 32], objective_id: "o".repeat(n) }.data(),
+        };
+        let cu = units(&mut ctx, ix).await;
+        profile.entry("append_decision").or_default().insert(n, cu);
+    }
+
+    let close = Instruction {
+        program_id: logos_core::ID,
+        accounts: logos_core::accounts::CloseDecisionLog { decision_log, agent_account: agent, authority }
+            .to_account_metas(None),
+        data: logos_core::instruction::CloseDecisionLog {}.data(),
+    };
+    let cu = units(&mut ctx, close).await;
+    profile.entry("close_decision_log").or_default().insert(0, cu);
+
+    for (kind, sizes) in &profile {
+        for (size, cu) in sizes {
+            println!("{kind:<22} size={size:<3} {cu:>7} CU");
+        }
+    }
+    if let Ok(path) = std::env::var("LOGOS_CU_REPORT") {
+        std::fs::write(&path, report_json(&profile)).unwrap();
+        println!("wrote {path}");
+    }
+}
@@ -0,0 +1,110 @@
+//! Batched `log_decisions` tests (program-test harness).
+//!
+//! Loads the built program from `target/deploy`, so build it first:
+//!     anchor build && SBF_OUT_DIR=target/deploy cargo test -p logos_core
+
+use anchor_lang::{AccountDeserialize, InstructionData, ToAccountMetas};
+use logos_core::{decision_batch_root, BatchEntry, DecisionBatch};
+use solana_program_test::{ProgramTest, ProgramTestContext};
+use solana_sdk::{
+    instruction::Instruction,
+    pubkey::Pubkey,
+    signature::Signer,
+    system_program,
+    transaction::Transaction,
+};
+
+fn agent_pda(authority: &Pubkey) -> Pubkey {
+    Pubkey::find_program_address(&[b"agent", authority.as_ref()], &logos_core::ID).0
+}
+
+fn decision_batch_pda(agent: &Pubkey, batch_root: &[u8; 32]) -> Pubkey {
+    Pubkey::find_program_address(&[b"decision_batch", agent.as_ref(), batch_root], &logos_core::ID).0
+}
+
+async fn send(ctx: &mut ProgramTestContext, ixs: &[Instruction]) -> bool {
+    let blockhash = ctx.get_new_latest_blockhash().await.unwrap();
+    let tx = Transaction::new_signed_with_payer(ixs, Some(&ctx.payer.pubkey()), &[&ctx.payer], blockhash);
+    ctx.banks_client.process_transaction(tx).await.is_ok()
+}
+
+async fn setup() -> (ProgramTestContext, Pubkey) {
+    let mut ctx = ProgramTest::new("logos_core", logos_core::ID, None)
+        .start_with_context()
+        .await;
+    let authority = ctx.payer.pubkey();
+    let agent = agent_pda(&authority);
+    let register = Instruction {
+        program_id: logos_core::ID,
+        accounts: logos_core::accounts::RegisterAgent {
+            agent_account: agent,
+            authority,
+            system_program: system_program::ID,
+        }
+        .to_account_metas(None),
+        data: logos_core::instruction::RegisterAgent { agent_id: "Batch-Test-Agent".to_string() }.data(),
+    };
+    assert!(send(&mut ctx, &[register]).await);
+    (ctx, agent)
+}
+
+fn entries(n: u64) -> Vec<BatchEntry> {
+    (0..n)
+        .map(|i| {
+            let mut decision_hash = [0u8; 32];
+            decision_hash[..8].copy_from_slice(&i.to_le_bytes());
+            BatchEntry { objective_id: format!("Obj-{i}"), decision_hash }
+        })
+        .collect()
+}
+
+fn log_decisions_ix(authority: Pubkey, agent: Pubkey, batch_root: [u8; 32], entries: Vec<BatchEntry>) -> Instruction {
+    Instruction {
+        program_id: logos_core::ID,
+        accounts: logos_core::accounts::LogDecisions {
+            decision_batch: decision_batch_pda(&agent, &batch_root),
+            agent_account: agent,
+            authority,
+            system_program: system_program::ID,
+        }
+        .to_account_metas(None),
+        data: logos_core::instruction::LogDecisions { batch_root, entries }.data(),
+    }
+}
+
+#[tokio::test]
+async fn logs_batch_root_and_count_once() {
+    let (mut ctx, agent) = setup().await;
+    let authority = ctx.payer.pubkey();
+    let batch = entries(16);
+    let root = decision_batch_root(&batch);
+
+    assert!(send(&mut ctx, &[log_decisions_ix(authority, agent, root, batch.clone())]).await);
+    let account = ctx.banks_client.get_account(decision_batch_pda(&agent, &root)).await.unwrap().unwrap();
+    let stored = DecisionBatch::try_deserialize(&mut account.data.as_slice()).unwrap();
+    assert_eq!(stored.agent, agent);
+    assert_eq!(stored.batch_root, root);
+    assert_eq!(stored.count, 16);
+
+    // Replaying the same batch hits the existing PDA.
+    assert!(!send(&mut ctx, &[log_decisions_ix(authority, agent, root, batch)]).await);
+}
+
+#[tokio::test]
+async fn rejects_bad_batches() {
+    let (mut ctx, agent) = setup().await;
+    let authority = ctx.payer.pubkey();
+
+    let batch = entries(4);
+    let mut tampered = batch.clone();
+    tampered[2].decision_hash[31] ^= 1;
+    let root = decision_batch_root(&batch);
+    assert!(!send(&mut ctx, &[log_decisions_ix(authority, agent, root, tampered)]).await);
+
+    assert!(!send(&mut ctx, &[log_decisions_ix(authority, agent, [0u8; 32], vec![])]).await);
+
+    let mut long = entries(1);
+    long[0].objective_id = "x".repeat(51);
+    let root = decision_batch_root(&long);
+    assert!(!send(&mut ctx, &[log_decisions_ix(authority, agent, root, long)]).await);
+}
@@ -0,0 +1,138 @@
+//! Ring-buffer decision log tests (program-test harness).
+//!
+//! Loads the built program from `target/deploy`, so build it first:
+//!     anchor build && SBF_OUT_DIR=target/deploy cargo test -p logos_core
+
+use anchor_lang::{InstructionData, ToAccountMetas};
+use logos_core::{DecisionLog, DECISION_LOG_CAPACITY};
+use solana_program_test::{ProgramTest, ProgramTestContext};
+use solana_sdk::{
+    instruction::Instruction,
+    pubkey::Pubkey,
+    signature::Signer,
+    system_program,
+    transaction::Transaction,
+};
+
+fn agent_pda(authority: &Pubkey) -> Pubkey {
+    Pubkey::find_program_address(&[b"agent", authority.as_ref()], &logos_core::ID).0
+}
+
+fn decision_log_pda(agent: &Pubkey) -> Pubkey {
+    Pubkey::find_program_address(&[b"decision_log", agent.as_ref()], &logos_core::ID).0
+}
+
+async fn send(ctx: &mut ProgramTestContext, ixs: &[Instruction]) {
+    let blockhash = ctx.get_new_latest_blockhash().await.unwrap();
+    let tx = Transaction::new_signed_with_payer(ixs, Some(&ctx.payer.pubkey()), &[&ctx.payer], blockhash);
+    ctx.banks_client.process_transaction(tx).await.unwrap();
+}
+
+async fn setup() -> (ProgramTestContext, Pubkey, Pubkey) {
+    let mut ctx = ProgramTest::new("logos_core", logos_core::ID, None)
+        .start_with_context()
+        .await;
+    let authority = ctx.payer.pubkey();
+    let agent = agent_pda(&authority);
+    let decision_log = decision_log_pda(&agent);
+
+    let register = Instruction {
+        program_id: logos_core::ID,
+        accounts: logos_core::accounts::RegisterAgent {
+            agent_account: agent,
+            authority,
+            system_program: system_program::ID,
+        }
+        .to_account_metas(None),
+        data: logos_core::instruction::RegisterAgent { agent_id: "Ring-Test-Agent".to_string() }.data(),
+    };
+    let init = Instruction {
+        program_id: logos_core::ID,
+        accounts: logos_core::accounts::InitDecisionLog {
+            decision_log,
+            agent_account: agent,
+            authority,
+            system_program: system_program::ID,
+        }
+        .to_account_metas(None),
+        data: logos_core::instruction::InitDecisionLog {}.data(),
+    };
+    send(&mut ctx, &[register, init]).await;
+    (ctx, agent, decision_log)
+}
+
+fn append_ix(authority: Pubkey, agent: Pubkey, decision_log: Pubkey, n: u64, objective_id: &str) -> Instruction {
+    let mut decision_hash = [0u8; 32];
+    decision_hash[..8].copy_from_slice(&n.to_le_bytes());
+    Instruction {
+        program_id: logos_core::ID,
+        accounts: logos_core::accounts::AppendDecision {
+            decision_log,
+            agent_account: agent,
+            authority,
+        }
+        .to_account_metas(None),
+        data: logos_core::instruction::AppendDecision {
+            decision_hash,
+            objective_id: objective_id.to_string(),
+        }
+        .data(),
+    }
+}
+
+async fn load_log(ctx: &mut ProgramTestContext, decision_log: Pubkey) -> DecisionLog {
+    let account = ctx.banks_client.get_account(decision_log).await.unwrap().unwrap();
+    bytemuck::pod_read_unaligned::<DecisionLog>(&account.data[8..8 + std::mem::size_of::<DecisionLog>()])
+}
+
+#[tokio::test]
+async fn append_reuses_objective_and_wraps() {
+    let (mut ctx, agent, decision_log) = setup().await;
+    let authority = ctx.payer.pubkey();
+
+    // Same objective twice: impossible on the PDA-per-objective path.
+    let total = DECISION_LOG_CAPACITY as u64 + 5;
+    for chunk in (0..total).collect::<Vec<_>>().chunks(10) {
+        let ixs: Vec<_> = chunk
+            .iter()
+            .map(|n| append_ix(authority, agent, decision_log, *n, "Auto-Repay-Policy-v4"))
+            .collect();
+        send(&mut ctx, &ixs).await;
+    }
+
+    let log = load_log(&mut ctx, decision_log).await;
+    assert_eq!(log.agent, agent);
+    assert_eq!(log.total, total);
+    // Slot 0 has been overwritten by sequence CAPACITY, slot 5 still holds sequence 5.
+    assert_eq!(&log.entries[0].decision_hash[..8], &(DECISION_LOG_CAPACITY as u64).to_le_bytes());
+    assert_eq!(&log.entries[5].decision_hash[..8], &5u64.to_le_bytes());
+    assert_eq!(log.entries[5].objective_tag, logos_core::objective_tag("Auto-Repay-Policy-v4"));
+}
+
+#[tokio::test]
+async fn rejects_oversized_objective() {
+    let (mut ctx, agent, decision_log) = setup().await;
+    let authority = ctx.payer.pubkey();
+    let ix = append_ix(authority, agent, decision_log, 0, &"x".repeat(51));
+    let blockhash = ctx.get_new_latest_blockhash().await.unwrap();
+    let tx = Transaction::new_signed_with_payer(&[ix], Some(&authority), &[&ctx.payer], blockhash);
+    assert!(ctx.banks_client.process_transaction(tx).await.is_err());
+}
+
+#[tokio::test]
+async fn close_returns_rent() {
+    let (mut ctx, agent, decision_log) = setup().await;
+    let authority = ctx.payer.pubkey();
+    let close = Instruction {
+        program_id: logos_core::ID,
+        accounts: logos_core::accounts::CloseDecisionLog {
+            decision_log,
+            agent_account: agent,
+            authority,
+        }
+        .to_account_metas(None),
+        data: logos_core::instruction::CloseDecisionLog {}.data(),
+    };
+    send(&mut ctx, &[close]).await;
+    assert!(ctx.banks_client.get_account(decision_log).await.unwrap().is_none());
+}
@@ -0,0 +1,59 @@
+"""
+Logos SDK.
+
+`import sdk` only loads the pure-hashing core (stdlib only). Everything that
+talks to Solana is imported on first attribute access, so processes that just
+compute decision hashes never pay for solana/solders/httpx.
+"""
+import importlib
+
+from .core import ConcurrentLogosAgent, DecisionRecord, DecisionSnapshot, LogosAgent
+
+# name -> submodule, resolved on first access (PEP 562)
+_LAZY = {
+    "AsyncLogosClient": "client",
+    "AuditStore": "audit_store",
+    "BatchedMemoAdapter": "memo_adapter",
+    "CertificateVerifier": "compliance",
+    "ComplianceProvider": "compliance",
+    "DecisionBus": "event_bus",
+    "DecisionVerifier": "verify",
+    "FeePlanner": "priority_fees",
+    "FeePolicy": "priority_fees",
+    "IdempotencyStore": "idempotency",
+    "LocalValidator": "prevalidate",
+    "LogosClient": "client",
+    "MemoAdapter": "memo_adapter",
+    "MerkleHasher": "merkle",
+    "NoncePool": "durable_nonce",
+    "ObservationStore": "observation_store",
+    "OfflineSigner": "durable_nonce",
+    "PayerPool": "payer_pool",
+    "PooledSubmitter": "payer_pool",
+    "PrevalidationError": "prevalidate",
+    "RemoteSubmitter": "coordinator",
+    "SubmissionCoordinator": "coordinator",
+    "build_log_decision_ix": "onchain_utils",
+    "build_log_decisions_ix": "onchain_utils",
+    "build_register_agent_ix": "onchain_utils",
+    "content_key": "idempotency",
+    "find_agent_pda": "onchain_utils",
+    "find_decision_pda": "onchain_utils",
+    "merkle_root": "merkle",
+    "verify_proof": "merkle",
+}
+
+__all__ = ["ConcurrentLogosAgent", "DecisionRecord", "DecisionSnapshot", "LogosAgent", *_LAZY]
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
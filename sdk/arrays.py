@@ -0,0 +1,106 @@
+"""
+Canonical encoding of array-like observation values (NumPy, pandas).
+
+LogosAgent passes encode_array_value as json.dumps' default hook, so plain
+JSON observations hash exactly as before. An array is replaced by a small
+descriptor that commits to its dtype, shape and a digest of its raw
+buffer (SHA-256, or the agent's hash scheme; see sdk.hash_schemes), read through the buffer protocol rather than converted to Python
+objects. The digest is layout-independent: bytes are taken in C order,
+little-endian, so a Fortran-ordered or big-endian array hashes like its
+plain C-ordered twin. Only those two cases (and non-contiguous views) need
+a normalising copy.
+
+recording_encoder() also hands back each raw buffer by its digest, so an
+ObservationStore can keep the array data alongside the descriptor.
+
+numpy/pandas are never imported here; values are recognised only if their
+module is already loaded, which it must be for such a value to exist.
+"""
+import sys
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from .hash_schemes import DEFAULT_SCHEME, hash_hex
+
+ARRAY_ENCODING = "logos-array-v1"
+FRAME_ENCODING = "logos-frame-v1"
+
+
+Buffers = Dict[str, memoryview]
+
+
+def _array_descriptor(arr, np, scheme: str = DEFAULT_SCHEME,
+                      buffers: Optional[Buffers] = None) -> Union[Dict[str, Any], List[Any]]:
+    if arr.dtype.hasobject:
+        # No raw buffer to commit to (Python objects); hash their JSON values instead
+        return arr.tolist()
+    dtype = arr.dtype
+    if dtype.byteorder == '>' or (dtype.byteorder == '=' and sys.byteorder == 'big'):
+        dtype = dtype.newbyteorder('<')
+        arr = arr.astype(dtype)
+    if not arr.flags.c_contiguous:
+        arr = np.ascontiguousarray(arr)
+    # A uint8 view shares memory, and works for dtypes memoryview cannot express (datetime64, structs)
+    # The digest is keyed by its scheme name ("sha256", "blake3", ...)
+    buffer = memoryview(arr.reshape(-1).view(np.uint8))
+    digest = hash_hex(buffer, scheme)
+    if buffers is not None:
+        buffers[digest] = buffer
+    return {
+        "__array__": ARRAY_ENCODING,
+        "dtype": np.lib.format.dtype_to_descr(dtype),
+        "shape": list(arr.shape),
+        scheme: digest,
+    }
+
+
+def _encode(value: Any, scheme: str, buffers: Optional[Buffers] = None) -> Any:
+    np = sys.modules.get("numpy")
+    if np is not None:
+        if isinstance(value, np.ndarray):
+            return _array_descriptor(value, np, scheme, buffers)
+        if isinstance(value, np.generic):
+            return value.item()
+
+    pd = sys.modules.get("pandas")
+    if pd is not None:
+        if isinstance(value, pd.DataFrame):
+            return {
+                "__frame__": FRAME_ENCODING,
+                "columns": [str(c) for c in value.columns],
+                "index": _array_descriptor(value.index.to_numpy(), np, scheme, buffers),
+                "data": [_array_descriptor(value.iloc[:, i].to_numpy(), np, scheme, buffers)
+                         for i in range(value.shape[1])],
+            }
+        if isinstance(value, pd.Series):
+            return {
+                "__frame__": FRAME_ENCODING,
+                "name": None if value.name is None else str(value.name),
+                "index": _array_descriptor(value.index.to_numpy(), np, scheme, buffers),
+                "data": _array_descriptor(value.to_numpy(), np, scheme, buffers),
+            }
+
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def encode_array_value(value: Any) -> Any:
+    """json.dumps default hook: arrays, numpy scalars and pandas objects to canonical JSON."""
+    return _encode(value, DEFAULT_SCHEME)
+
+
+@lru_cache(maxsize=None)
+def array_encoder(scheme: str) -> Callable[[Any], Any]:
+    """encode_array_value for a given hash scheme (buffer digests use that scheme)."""
+    if scheme == DEFAULT_SCHEME:
+        return encode_array_value
+    return lambda value: _encode(value, scheme)
+
+
+def recording_encoder(scheme: str, buffers: Buffers) -> Callable[[Any], Any]:
+    """Like array_encoder, but also stores each array's raw buffer in buffers, keyed by its digest."""
+    return lambda value: _encode(value, scheme, buffers)
+
+
+def is_encoded_array(value: Dict[str, Any]) -> bool:
+    """True for a decoded array or frame descriptor, as produced by encode_array_value."""
+    return value.get("__array__") == ARRAY_ENCODING or value.get("__frame__") == FRAME_ENCODING
@@ -0,0 +1,199 @@
+import json
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from .core import DecisionRecord, DecisionSnapshot
+from .hash_schemes import DEFAULT_SCHEME
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS decisions (
+    decision_hash    TEXT PRIMARY KEY,
+    agent_id         TEXT NOT NULL,
+    objective_id     TEXT NOT NULL,
+    timestamp        REAL NOT NULL,
+    action_type      TEXT,
+    observation_hash TEXT NOT NULL,
+    prev_hash        TEXT,
+    signature        TEXT,
+    record_json      TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_decisions_objective ON decisions (objective_id, action_type, timestamp);
+CREATE INDEX IF NOT EXISTS idx_decisions_agent ON decisions (agent_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_decisions_action ON decisions (action_type, timestamp);
+CREATE INDEX IF NOT EXISTS idx_decisions_timestamp ON decisions (timestamp);
+"""
+
+_INSERT = """
+INSERT OR IGNORE INTO decisions
+    (decision_hash, agent_id, objective_id, timestamp, action_type,
+     observation_hash, prev_hash, signature, record_json)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def action_type_of(action_payload: Dict[str, Any]) -> Optional[str]:
+    """Action type as used across the demos: `type` (SDK) or `action` (API action_plan)."""
+    value = action_payload.get("type", action_payload.get("action"))
+    return str(value) if value is not None else None
+
+
+def _as_record(record: Union[DecisionRecord, Dict[str, Any]]) -> DecisionRecord:
+    if isinstance(record, DecisionRecord):
+        return record
+    # Dict form, as produced by LogosAgent.export_logs()
+    return DecisionRecord(
+        agent_id=record["agent_id"],
+        timestamp=record["timestamp"],
+        objective_id=record["objective_id"],
+        snapshot=DecisionSnapshot(**record["snapshot"]),
+        prev_hash=record.get("prev_hash"),
+        hash_scheme=record.get("hash_scheme", DEFAULT_SCHEME),
+    )
+
+
+class AuditStore:
+    """
+    Local SQLite index of DecisionRecords for auditor queries.
+    Indexed on agent_id, objective_id, action type and timestamp, so range
+    queries touch only matching rows instead of scanning export_logs() JSON.
+    Safe to share across threads: every statement runs under one lock.
+    """
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def _row(self, record: Union[DecisionRecord, Dict[str, Any]], signature: Optional[str]) -> tuple:
+        record = _as_record(record)
+        record_json = record.to_json()
+        return (
+            record.compute_hash(),
+            record.agent_id,
+            record.objective_id,
+            record.timestamp,
+            action_type_of(record.snapshot.action_payload),
+            record.snapshot.observation_hash,
+            record.prev_hash,
+            signature,
+            record_json,
+        )
+
+    def ingest(self, record: Union[DecisionRecord, Dict[str, Any]], signature: Optional[str] = None) -> str:
+        """Store one record. Returns its decision hash. Re-ingesting the same record is a no-op."""
+        row = self._row(record, signature)
+        with self._lock, self.conn:
+            self.conn.execute(_INSERT, row)
+            if signature:
+                self._set_signature(row[0], signature)
+        return row[0]
+
+    def ingest_many(self, records: Iterable[Union[DecisionRecord, Dict[str, Any]]],
+                    batch_size: int = 10000) -> int:
+        """Bulk load records in batched transactions. Returns the number of rows inserted."""
+        inserted = 0
+        batch = []
+        for record in records:
+            batch.append(self._row(record, None))
+            if len(batch) >= batch_size:
+                inserted += self._insert_batch(batch)
+                batch = []
+        if batch:
+            inserted += self._insert_batch(batch)
+        return inserted
+
+    def _insert_batch(self, rows: List[tuple]) -> int:
+        with self._lock, self.conn:
+            # rowcount of an executemany sums its own inserts; ignored duplicates add 0
+            return self.conn.executemany(_INSERT, rows).rowcount
+
+    def load_export(self, exported: str) -> int:
+        """Bulk load the JSON string produced by LogosAgent.export_logs()."""
+        return self.ingest_many(json.loads(exported))
+
+    def set_signature(self, decision_hash: str, signature: str) -> None:
+        with self._lock, self.conn:
+            self._set_signature(decision_hash, signature)
+
+    def _set_signature(self, decision_hash: str, signature: str) -> None:
+        self.conn.execute(
+            "UPDATE decisions SET signature = ? WHERE decision_hash = ?",
+            (signature, decision_hash),
+        )
+
+    def _where(self, agent_id, objective_id, action_type, start, end):
+        clauses, params = [], []
+        for column, value in (("agent_id", agent_id), ("objective_id", objective_id),
+                              ("action_type", action_type)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if start is not None:
+            clauses.append("timestamp >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("timestamp < ?")
+            params.append(end)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params
+
+    def query(
+        self,
+        agent_id: Optional[str] = None,
+        objective_id: Optional[str] = None,
+        action_type: Optional[str] = None,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        limit: int = 1000,
+        offset: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """
+        Decisions matching every given filter, ordered by timestamp.
+        The time range is half-open: start <= timestamp < end.
+        """
+        where, params = self._where(agent_id, objective_id, action_type, start, end)
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT decision_hash, signature, record_json FROM decisions{where}"
+                " ORDER BY timestamp LIMIT ? OFFSET ?",
+                params + [limit, offset],
+            ).fetchall()
+        results = []
+        for decision_hash, signature, record_json in rows:
+            item = json.loads(record_json)
+            item["decision_hash"] = decision_hash
+            item["signature"] = signature
+            results.append(item)
+        return results
+
+    def count(
+        self,
+        agent_id: Optional[str] = None,
+        objective_id: Optional[str] = None,
+        action_type: Optional[str] = None,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+    ) -> int:
+        where, params = self._where(agent_id, objective_id, action_type, start, end)
+        with self._lock:
+            return self.conn.execute(f"SELECT COUNT(*) FROM decisions{where}", params).fetchone()[0]
+
+    def get(self, decision_hash: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT signature, record_json FROM decisions WHERE decision_hash = ?",
+                (decision_hash,),
+            ).fetchone()
+        if row is None:
+            return None
+        item = json.loads(row[1])
+        item["decision_hash"] = decision_hash
+        item["signature"] = row[0]
+        return item
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.close()
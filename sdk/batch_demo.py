@@ -1,4 +1,4 @@
-from core import LogosAgent
+from sdk.core import LogosAgent  # run from the repo root: python -m sdk.batch_demo
 import json
 
 def run_batch_demo():
@@ -0,0 +1,281 @@
+"""
+Client for the Logos HTTP API (api_server.py).
+
+Decisions are queued, coalesced into /log/batch requests over pooled
+keep-alive connections, and retried with a per-decision idempotency key, so
+a retry can never log the same decision twice. With prehash=True the
+decision hash is computed locally (LogosAgent, pinned timestamp) and handed
+back immediately; the server recomputes it and rejects a mismatch.
+
+    async with AsyncLogosClient("http://localhost:8000") as logos:
+        decision_hash, receipt = logos.submit("Guard-v1", observations, {"cmd": "repay"})
+        ...                      # keep deciding; await receipt when needed
+
+LogosClient offers the same API to synchronous code, driving the async
+client on a background event-loop thread.
+"""
+import asyncio
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import httpx
+
+from .core import LogosAgent
+
+# api_server.py logs every request as this agent_id prefix + objective_id
+SERVER_AGENT_PREFIX = "API-Agent-"
+
+# Per-request or per-item statuses worth retrying with the same idempotency key
+RETRY_STATUS = frozenset({409, 429, 500, 502, 503, 504})
+
+
+@dataclass
+class LogReceipt:
+    decision_hash: str
+    signature: Optional[str]
+    status: str
+    timestamp: str
+    explorer_url: Optional[str] = None
+    replayed: bool = False
+
+
+class LogosAPIError(Exception):
+    def __init__(self, status_code: int, detail: Any):
+        super().__init__(f"{status_code}: {detail}")
+        self.status_code = status_code
+        self.detail = detail
+
+
+def prehash(objective_id: str, observations: List[Dict[str, Any]], action_plan: Dict[str, Any],
+            timestamp: Optional[float] = None) -> Tuple[str, float, List[Dict[str, Any]]]:
+    """
+    The decision hash the server will derive for this request.
+    Returns (decision_hash, timestamp, observations normalised as the server sees them).
+    """
+    obs = [{"source": o["source"], "content": o["content"], "timestamp": float(o["timestamp"])}
+           for o in observations]
+    timestamp = time.time() if timestamp is None else timestamp
+    agent = LogosAgent(SERVER_AGENT_PREFIX + objective_id, objective_id, verbose=False)
+    return agent.decide(obs, action_plan, timestamp=timestamp), timestamp, obs
+
+
+class _Pending:
+    __slots__ = ("item", "future")
+
+    def __init__(self, item: Dict[str, Any], future: asyncio.Future):
+        self.item = item
+        self.future = future
+
+
+class AsyncLogosClient:
+    """
+    asyncio client. At most max_in_flight bulk requests are outstanding at once;
+    decisions queued meanwhile are sent in the next batch (up to batch_size,
+    waiting at most batch_delay seconds to fill it).
+    """
+    def __init__(self, base_url: str = "http://localhost:8000", max_in_flight: int = 4,
+                 batch_size: int = 32, batch_delay: float = 0.005, max_pending: int = 10_000,
+                 max_retries: int = 3, backoff: float = 0.2, prehash: bool = True,
+                 timeout: float = 60.0, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.prehash = prehash
+        self._http = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_in_flight, max_keepalive_connections=max_in_flight),
+            transport=transport,
+        )
+        self._max_in_flight = max_in_flight
+        self._max_pending = max_pending
+        self._queue: Optional[asyncio.Queue] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._flusher: Optional[asyncio.Task] = None
+        self._outstanding: Set[asyncio.Future] = set()
+        self._sends: Set[asyncio.Task] = set()
+
+    async def __aenter__(self) -> "AsyncLogosClient":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+    def build_item(self, objective_id: str, observations: List[Dict[str, Any]], action_plan: Dict[str, Any],
+                   dry_run: bool = False, idempotency_key: Optional[str] = None) -> Dict[str, Any]:
+        """One /log/batch item. Pure CPU; safe to call from any thread."""
+        item = {
+            "objective_id": objective_id,
+            "observations": observations,
+            "action_plan": action_plan,
+            "dry_run": dry_run,
+            "idempotency_key": idempotency_key or uuid.uuid4().hex,
+        }
+        if self.prehash:
+            decision_hash, timestamp, item["observations"] = prehash(objective_id, observations, action_plan)
+            item["timestamp"] = timestamp
+            item["decision_hash"] = decision_hash
+        return item
+
+    def enqueue(self, item: Dict[str, Any]) -> asyncio.Future:
+        """Queue a built item; returns a future for its LogReceipt. Call from the client's loop."""
+        if self._queue is None:
+            self._queue = asyncio.Queue(self._max_pending)
+            self._slots = asyncio.Semaphore(self._max_in_flight)
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.get_running_loop().create_task(self._flush_loop())
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait(_Pending(item, future))  # asyncio.QueueFull past max_pending
+        self._outstanding.add(future)
+        future.add_done_callback(self._outstanding.discard)
+        return future
+
+    def submit(self, objective_id: str, observations: List[Dict[str, Any]], action_plan: Dict[str, Any],
+               dry_run: bool = False, idempotency_key: Optional[str] = None) -> Tuple[Optional[str], asyncio.Future]:
+        """
+        Queue a decision without waiting for the server.
+        Returns (local decision hash, or None without prehash; future for the LogReceipt).
+        """
+        item = self.build_item(objective_id, observations, action_plan, dry_run, idempotency_key)
+        return item.get("decision_hash"), self.enqueue(item)
+
+    async def log(self, objective_id: str, observations: List[Dict[str, Any]], action_plan: Dict[str, Any],
+                  dry_run: bool = False, idempotency_key: Optional[str] = None) -> LogReceipt:
+        return await self.submit(objective_id, observations, action_plan, dry_run, idempotency_key)[1]
+
+    async def flush(self) -> None:
+        """Wait until every queued decision has a result (receipt or error)."""
+        while self._outstanding:
+            await asyncio.gather(*list(self._outstanding), return_exceptions=True)
+
+    async def aclose(self) -> None:
+        await self.flush()
+        if self._flusher is not None:
+            self._flusher.cancel()
+        await self._http.aclose()
+
+    async def _flush_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.batch_delay
+            while len(batch) < self.batch_size:
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            await self._slots.acquire()
+            task = loop.create_task(self._send(batch))
+            self._sends.add(task)
+            task.add_done_callback(self._send_done)
+
+    def _send_done(self, task: asyncio.Task) -> None:
+        self._sends.discard(task)
+        self._slots.release()
+
+    async def _send(self, batch: List[_Pending]) -> None:
+        try:
+            await self._send_with_retries(batch)
+        except Exception as e:
+            # e.g. a malformed response; never leave a caller waiting forever
+            for p in batch:
+                if not p.future.done():
+                    p.future.set_exception(e)
+
+    async def _send_with_retries(self, batch: List[_Pending]) -> None:
+        attempt = 0
+        while True:
+            batch = [p for p in batch if not p.future.done()]  # skip callers that cancelled
+            if not batch:
+                return
+            retry: List[_Pending] = []
+            try:
+                response = await self._http.post("/log/batch", json={"items": [p.item for p in batch]})
+            except httpx.TransportError as e:
+                retry, error = batch, e
+            else:
+                if response.status_code in RETRY_STATUS:
+                    retry, error = batch, LogosAPIError(response.status_code, response.text)
+                elif response.status_code != 200:
+                    error = LogosAPIError(response.status_code, response.text)
+                    for p in batch:
+                        p.future.set_exception(error)
+                    return
+                else:
+                    for p, result in zip(batch, response.json()["results"]):
+                        if result["status_code"] == 200:
+                            p.future.set_result(LogReceipt(**result["result"]))
+                        elif result["status_code"] in RETRY_STATUS:
+                            retry.append(p)
+                            error = LogosAPIError(result["status_code"], result["detail"])
+                        else:
+                            p.future.set_exception(LogosAPIError(result["status_code"], result["detail"]))
+            if not retry:
+                return
+            attempt += 1
+            if attempt > self.max_retries:
+                for p in retry:
+                    if not p.future.done():
+                        p.future.set_exception(error)
+                return
+            # Same idempotency keys: the server replays anything that already went through
+            await asyncio.sleep(self.backoff * 2 ** (attempt - 1))
+            batch = retry
+
+
+class LogosClient:
+    """
+    Synchronous facade over AsyncLogosClient. submit() hashes in the calling
+    thread and returns at once with a concurrent.futures.Future; batching,
+    pooling and retries run on a private event-loop thread.
+    """
+    def __init__(self, base_url: str = "http://localhost:8000", **kwargs):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="logos-client", daemon=True)
+        self._thread.start()
+
+        async def build() -> AsyncLogosClient:
+            return AsyncLogosClient(base_url, **kwargs)
+
+        self._client = asyncio.run_coroutine_threadsafe(build(), self._loop).result()
+
+    def __enter__(self) -> "LogosClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def submit(self, objective_id: str, observations: List[Dict[str, Any]], action_plan: Dict[str, Any],
+               dry_run: bool = False, idempotency_key: Optional[str] = None) -> Tuple[Optional[str], Future]:
+        item = self._client.build_item(objective_id, observations, action_plan, dry_run, idempotency_key)
+
+        async def enqueue_and_wait() -> LogReceipt:
+            return await self._client.enqueue(item)
+
+        return item.get("decision_hash"), asyncio.run_coroutine_threadsafe(enqueue_and_wait(), self._loop)
+
+    def log(self, objective_id: str, observations: List[Dict[str, Any]], action_plan: Dict[str, Any],
+            dry_run: bool = False, idempotency_key: Optional[str] = None) -> LogReceipt:
+        return self.submit(objective_id, observations, action_plan, dry_run, idempotency_key)[1].result()
+
+    def flush(self) -> None:
+        asyncio.run_coroutine_threadsafe(self._client.flush(), self._loop).result()
+
+    def close(self) -> None:
+        if not self._loop.is_running():
+            return
+        asyncio.run_coroutine_threadsafe(self._client.aclose(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
@@ -1,15 +1,87 @@
+"""
+Compliance checks with Ed25519-signed certificates.
+
+A ComplianceProvider signs every verdict (pass or block) with its Solana
+keypair. The certificate is plain JSON, so an agent can embed it in its
+action plan (`"compliance_proof": result["certificate"]`) and it becomes
+part of the decision hash. Anyone holding the provider's public key can
+check it later with CertificateVerifier, which verifies large batches
+across processes and remembers certificates it has already seen.
+"""
 import hashlib
+import json
+import os
 import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, fields
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from solders.keypair import Keypair
+from solders.pubkey import Pubkey
+from solders.signature import Signature
+
+from .hash_schemes import DEFAULT_SCHEME, hash_hex
+
+CERT_VERSION = "logos-compliance-v1"
+
+
+@dataclass(frozen=True)
+class ComplianceCertificate:
+    provider: str           # provider public key, base58
+    provider_name: str
+    recipient: str
+    amount: Any
+    passed: bool
+    reason: Optional[str]
+    issued_at: int
+    signature: str = ""     # Ed25519 over message(), base58
+    version: str = CERT_VERSION
+
+    def message(self) -> bytes:
+        """Canonical bytes the provider signs: every field but the signature."""
+        body = asdict(self)
+        del body["signature"]
+        return json.dumps(body, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ComplianceCertificate":
+        return cls(**{f.name: data[f.name] for f in fields(cls) if f.name in data})
+
+
+CertificateLike = Union[ComplianceCertificate, Dict[str, Any]]
+
 
 class ComplianceProvider:
-    def __init__(self, name="RegTech_Global_Inc"):
+    def __init__(self, name="RegTech_Global_Inc", hash_scheme=DEFAULT_SCHEME, keypair: Optional[Keypair] = None):
         self.name = name
+        self.hash_scheme = hash_scheme
+        # Without a configured key the provider signs with a fresh one; publish self.public_key to verifiers
+        self.keypair = keypair or Keypair()
+        self.public_key = str(self.keypair.pubkey())
         self.blacklist = ["EvilHackerAddress123", "SanctionedEntityXYZ"]
 
+    def sign(self, recipient: str, amount: Any, passed: bool, reason: Optional[str] = None,
+             issued_at: Optional[int] = None) -> ComplianceCertificate:
+        unsigned = ComplianceCertificate(
+            provider=self.public_key,
+            provider_name=self.name,
+            recipient=recipient,
+            amount=amount,
+            passed=passed,
+            reason=reason,
+            issued_at=int(time.time()) if issued_at is None else issued_at,
+        )
+        signature = self.keypair.sign_message(unsigned.message())
+        return ComplianceCertificate(**{**asdict(unsigned), "signature": str(signature)})
+
     def check_transaction(self, tx_data):
         """
         Simulates a compliance check.
-        Returns a signed 'certificate' (mock signature).
+        Returns the verdict with an Ed25519-signed 'certificate'.
         """
         recipient = tx_data.get("recipient")
         amount = tx_data.get("amount", 0)
@@ -17,33 +89,123 @@ class ComplianceProvider:
         print(f"[{self.name}] Checking transaction to {recipient} ({amount} SOL)...")
         time.sleep(1) # Simulate API latency
 
+        reason = None
         # Rule 1: Blacklist
         if recipient in self.blacklist:
             print(f"[{self.name}] ❌ BLOCKED: Recipient is sanctioned.")
-            return {
-                "passed": False,
-                "reason": "SANCTIONED_ADDRESS",
-                "timestamp": int(time.time())
-            }
-
+            reason = "SANCTIONED_ADDRESS"
         # Rule 2: High Value AML
-        if amount > 1000:
+        elif amount > 1000:
             print(f"[{self.name}] ⚠️  FLAGGED: Large transfer requires manual review.")
-            return {
-                "passed": False,
-                "reason": "AML_LIMIT_EXCEEDED",
-                "timestamp": int(time.time())
-            }
-
-        print(f"[{self.name}] ✅ APPROVED.")
-        
-        # Create a mock signature/proof
-        proof_data = f"{recipient}:{amount}:{self.name}:PASSED"
-        proof_hash = hashlib.sha256(proof_data.encode()).hexdigest()
-        
-        return {
-            "passed": True,
+            reason = "AML_LIMIT_EXCEEDED"
+        else:
+            print(f"[{self.name}] ✅ APPROVED.")
+
+        # Blocks are signed too, so an aborted transfer is as provable as an approved one
+        certificate = self.sign(recipient, amount, passed=reason is None, reason=reason)
+        result = {
+            "passed": certificate.passed,
             "provider": self.name,
-            "proof_hash": proof_hash,
-            "timestamp": int(time.time())
+            "proof_hash": hash_hex(certificate.message(), self.hash_scheme),
+            "hash_scheme": self.hash_scheme,
+            "certificate": certificate.to_dict(),
+            "timestamp": certificate.issued_at,
         }
+        if reason is not None:
+            result["reason"] = reason
+        return result
+
+
+def _verify_one(provider: str, message: bytes, signature: str) -> bool:
+    try:
+        return Signature.from_string(signature).verify(Pubkey.from_string(provider), message)
+    except (ValueError, TypeError):   # malformed fields, e.g. a non-string key
+        return False
+
+
+def _verify_chunk(items: List[Tuple[str, bytes, str]]) -> List[bool]:
+    return [_verify_one(*item) for item in items]
+
+
+class CertificateVerifier:
+    """
+    Verifies compliance certificates in bulk.
+
+    Each distinct certificate is checked once: results (valid or not) are kept
+    in an LRU cache keyed by a digest of the signed bytes and signature.
+    Batches with at least parallel_threshold uncached certificates are split
+    into chunks and verified on a process pool, one process per core by
+    default. With trusted_providers set, certificates from other keys are
+    rejected without being checked.
+    """
+    def __init__(self, trusted_providers: Optional[Iterable[str]] = None, cache_size: int = 1_000_000,
+                 workers: Optional[int] = None, chunk_size: int = 2048, parallel_threshold: int = 4096):
+        self.trusted_providers = None if trusted_providers is None else set(trusted_providers)
+        self.cache_size = cache_size
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.parallel_threshold = parallel_threshold
+        self._cache: "OrderedDict[bytes, bool]" = OrderedDict()
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> "CertificateVerifier":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def verify(self, certificate: CertificateLike) -> bool:
+        return self.verify_batch([certificate])[0]
+
+    def verify_batch(self, certificates: Sequence[CertificateLike]) -> List[bool]:
+        """Validity of each certificate, in input order."""
+        results: List[Optional[bool]] = [None] * len(certificates)
+        pending: Dict[bytes, List[int]] = {}
+        work: List[Tuple[str, bytes, str]] = []
+        for i, cert in enumerate(certificates):
+            try:
+                if isinstance(cert, dict):
+                    cert = ComplianceCertificate.from_dict(cert)
+                message = cert.message()
+                key = hashlib.sha256(message + cert.signature.encode("utf-8")).digest()
+            except (TypeError, ValueError, AttributeError):
+                results[i] = False   # missing fields, non-string signature, or not JSON-serialisable
+                continue
+            if cert.version != CERT_VERSION or (
+                    self.trusted_providers is not None and cert.provider not in self.trusted_providers):
+                results[i] = False
+                continue
+
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                results[i] = cached
+            elif key in pending:
+                pending[key].append(i)   # duplicate within the batch: verify once
+            else:
+                pending[key] = [i]
+                work.append((cert.provider, message, cert.signature))
+
+        for key, valid in zip(pending, self._run(work)):
+            for i in pending[key]:
+                results[i] = valid
+            self._remember(key, valid)
+        return results
+
+    def _run(self, work: List[Tuple[str, bytes, str]]) -> List[bool]:
+        if self.workers <= 1 or len(work) < self.parallel_threshold:
+            return _verify_chunk(work)
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(self.workers)
+        chunks = [work[i:i + self.chunk_size] for i in range(0, len(work), self.chunk_size)]
+        return [valid for chunk in self._pool.map(_verify_chunk, chunks) for valid in chunk]
+
+    def _remember(self, key: bytes, valid: bool) -> None:
+        self._cache[key] = valid
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
@@ -0,0 +1,236 @@
+"""
+Single submission coordinator for multi-process deployments.
+
+API workers validate and hash requests on their own cores, then hand the
+(agent_id, objective_id, decision_hash) triple to one coordinator process
+over a local socket. Only the coordinator holds a PooledSubmitter, so key
+registration, blockhash fetches, signing and sending happen in one place,
+in arrival order, and each (agent_id, objective_id) is sent at most once.
+
+State that must be shared across workers lives here too:
+
+  - RemoteIdempotencyStore: one IdempotencyStore for every worker, so a
+    retry that lands on another worker replays the original response.
+  - RemoteDecisionBus: events published by any worker, or by the
+    coordinator's own submitter (give it event_sink=coordinator), are fanned
+    out to every worker's local DecisionBus, so each SSE / WebSocket
+    subscriber sees every decision.
+"""
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from multiprocessing.connection import Client as IpcClient, Listener
+from typing import Any, Dict, List, Optional, Tuple
+
+from .idempotency import IdempotencyKeyReused, IdempotencyStore
+from .prevalidate import PrevalidationError
+
+
+class SubmissionCoordinator:
+    """
+    Serves log, idempotency and event requests from API workers.
+    Remembers the last max_sent submissions so duplicates get the original
+    signature; older completed ones are forgotten (the validator and the
+    chain still reject them).
+    """
+    def __init__(self, submitter, address: str, authkey: bytes, max_workers: Optional[int] = None,
+                 idempotency: Optional[IdempotencyStore] = None, max_sent: int = 100_000):
+        self.submitter = submitter
+        self.address = address
+        self.authkey = authkey
+        pool = getattr(submitter, "pool", None)
+        # Enough threads to fill every key's in-flight window; the pool enforces the limit.
+        if max_workers is None:
+            max_workers = len(pool) * pool.max_in_flight if pool is not None else 4
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="logos-submit")
+        self.idempotency = idempotency or IdempotencyStore()
+        self.max_sent = max_sent
+        self._sent: "OrderedDict[Tuple[str, str], Tuple[str, Future]]" = OrderedDict()
+        self._subscribers: List[Tuple[Any, threading.Lock]] = []
+        self._lock = threading.Lock()
+
+    def _evict_sent(self) -> None:
+        # Called with _lock held. In-flight submissions are skipped, never forgotten early.
+        excess = len(self._sent) - self.max_sent
+        if excess <= 0:
+            return
+        victims = []
+        for key, (_, future) in self._sent.items():
+            if future.done():
+                victims.append(key)
+                if len(victims) == excess:
+                    break
+        for key in victims:
+            del self._sent[key]
+
+    def _submit(self, agent_id: str, objective_id: str, decision_hash: str,
+                timeout: Optional[float] = None) -> str:
+        key = (agent_id, objective_id)
+        with self._lock:
+            previous = self._sent.get(key)
+            if previous is None:
+                future = self.executor.submit(self.submitter.log_decision,
+                                              agent_id=agent_id,
+                                              objective_id=objective_id,
+                                              decision_hash=decision_hash,
+                                              timeout=timeout)
+                self._sent[key] = (decision_hash, future)
+                self._evict_sent()
+        if previous is not None:
+            sent_hash, future = previous
+            if sent_hash != decision_hash:
+                raise PrevalidationError(
+                    "DecisionAlreadyLogged",
+                    f"Objective {objective_id!r} was already submitted with a different decision hash"
+                )
+        try:
+            return future.result()
+        except Exception:
+            # Let a later retry send it again
+            with self._lock:
+                if self._sent.get(key, (None, None))[1] is future:
+                    del self._sent[key]
+            raise
+
+    def publish(self, message: Dict[str, Any]) -> int:
+        """Send an event to every subscribed worker. Returns how many received it."""
+        with self._lock:
+            subscribers = list(self._subscribers)
+        delivered = 0
+        for sub in subscribers:
+            conn, send_lock = sub
+            try:
+                with send_lock:
+                    conn.send(message)
+                delivered += 1
+            except (OSError, ValueError):
+                with self._lock:
+                    if sub in self._subscribers:
+                        self._subscribers.remove(sub)
+        return delivered
+
+    def _handle(self, op: str, args: tuple) -> Any:
+        if op == "log":
+            return self._submit(*args)
+        if op == "begin":
+            return self.idempotency.begin(*args)
+        if op == "complete":
+            return self.idempotency.complete(*args)
+        if op == "fail":
+            return self.idempotency.fail(*args)
+        if op == "publish":
+            return self.publish(*args)
+        raise ValueError(f"Unknown coordinator request: {op!r}")
+
+    def _serve_connection(self, conn) -> None:
+        while True:
+            try:
+                op, *args = conn.recv()
+            except (EOFError, OSError):
+                conn.close()
+                return
+            if op == "subscribe":
+                # From here on the connection only carries events to the worker
+                with self._lock:
+                    self._subscribers.append((conn, threading.Lock()))
+                return
+            try:
+                conn.send(("ok", self._handle(op, tuple(args))))
+            except PrevalidationError as e:
+                conn.send(("invalid", e.code, str(e)))
+            except IdempotencyKeyReused as e:
+                conn.send(("reused", None, str(e)))
+            except TimeoutError as e:
+                conn.send(("timeout", None, str(e)))
+            except Exception as e:
+                conn.send(("error", None, str(e)))
+
+    def serve_forever(self) -> None:
+        with Listener(self.address, family="AF_UNIX", authkey=self.authkey) as listener:
+            print(f"[Coordinator] Listening on {self.address}")
+            while True:
+                conn = listener.accept()
+                threading.Thread(target=self._serve_connection, args=(conn,), daemon=True).start()
+
+
+class _CoordinatorLink:
+    """Request/reply calls to the coordinator. Each worker thread keeps its own connection."""
+    def __init__(self, address: str, authkey: bytes):
+        self.address = address
+        self.authkey = authkey
+        self._local = threading.local()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = IpcClient(self.address, family="AF_UNIX", authkey=self.authkey)
+        return conn
+
+    def _call(self, op: str, *args) -> Any:
+        conn = self._conn()
+        try:
+            conn.send((op, *args))
+            reply = conn.recv()
+        except (EOFError, OSError):
+            self._local.conn = None
+            raise
+        if reply[0] == "ok":
+            return reply[1]
+        if reply[0] == "invalid":
+            raise PrevalidationError(reply[1], reply[2])
+        if reply[0] == "reused":
+            raise IdempotencyKeyReused(reply[2])
+        if reply[0] == "timeout":
+            raise TimeoutError(reply[2])
+        raise RuntimeError(reply[2])
+
+
+class RemoteSubmitter(_CoordinatorLink):
+    """Drop-in for PooledSubmitter.log_decision inside an API worker."""
+    def log_decision(self, agent_id: str, objective_id: str, decision_hash: str, timeout: Optional[float] = None) -> str:
+        return self._call("log", agent_id, objective_id, decision_hash, timeout)
+
+
+class RemoteIdempotencyStore(_CoordinatorLink):
+    """Drop-in for IdempotencyStore inside an API worker; the entries live in the coordinator."""
+    def begin(self, key: str, wait: float = 30.0, fingerprint: Optional[str] = None) -> Tuple[bool, Optional[Any]]:
+        return tuple(self._call("begin", key, wait, fingerprint))
+
+    def complete(self, key: str, result: Any) -> None:
+        self._call("complete", key, result)
+
+    def fail(self, key: str) -> None:
+        self._call("fail", key)
+
+
+class RemoteDecisionBus(_CoordinatorLink):
+    """
+    Publishing side of DecisionBus inside an API worker. publish() goes
+    through the coordinator to every worker; relay() delivers what any
+    worker published to this worker's local bus.
+    """
+    def publish(self, message: Dict[str, Any]) -> int:
+        try:
+            return self._call("publish", message)
+        except (EOFError, OSError, RuntimeError) as e:
+            # The feed is best-effort; never fail a /log request over it
+            print(f"[RemoteDecisionBus] Publish failed: {e}")
+            return 0
+
+    def relay(self, bus, retry_interval: float = 1.0) -> threading.Thread:
+        """Start a daemon thread feeding coordinator events into `bus` (anything with publish())."""
+        def run() -> None:
+            while True:
+                try:
+                    conn = IpcClient(self.address, family="AF_UNIX", authkey=self.authkey)
+                    conn.send(("subscribe",))
+                    while True:
+                        bus.publish(conn.recv())
+                except (EOFError, OSError) as e:
+                    print(f"[RemoteDecisionBus] Relay disconnected: {e}; reconnecting")
+                    time.sleep(retry_interval)
+
+        thread = threading.Thread(target=run, name="logos-bus-relay", daemon=True)
+        thread.start()
+        return thread
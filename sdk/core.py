@@ -1,9 +1,12 @@
-import hashlib
 import json
+import threading
 import time
 from typing import Dict, Any, Optional, Union, List
 from dataclasses import dataclass, asdict
 
+from .arrays import array_encoder
+from .hash_schemes import DEFAULT_SCHEME, get_scheme, hash_hex
+
 @dataclass
 class DecisionSnapshot:
     """
@@ -25,39 +28,86 @@ class DecisionRecord:
     objective_id: str         # The specific policy/goal ID this decision serves
     snapshot: DecisionSnapshot
     prev_hash: Optional[str] = None
+    hash_scheme: str = DEFAULT_SCHEME  # see sdk.hash_schemes; LogosAgent hashes observations with it too
 
     def to_dict(self) -> Dict[str, Any]:
         # Helper to convert nested dataclasses to dict
-        return asdict(self)
+        data = asdict(self)
+        if self.hash_scheme == DEFAULT_SCHEME:
+            # Legacy SHA-256 records serialise (and hash) exactly as before the field existed
+            del data["hash_scheme"]
+        return data
 
     def to_json(self) -> str:
         return json.dumps(self.to_dict(), sort_keys=True, separators=(',', ':'))
 
+    def _hash_dict(self) -> Dict[str, Any]:
+        # Same shape as to_dict(), but without asdict()'s deep copy of the action payload
+        data = {
+            "agent_id": self.agent_id,
+            "timestamp": self.timestamp,
+            "objective_id": self.objective_id,
+            "snapshot": {
+                "observation_hash": self.snapshot.observation_hash,
+                "action_payload": self.snapshot.action_payload,
+            },
+            "prev_hash": self.prev_hash,
+        }
+        if self.hash_scheme != DEFAULT_SCHEME:
+            data["hash_scheme"] = self.hash_scheme
+        return data
+
     def compute_hash(self) -> str:
-        """Computes the SHA-256 hash of the Decision Record (Proof of Decision)."""
-        encoded = self.to_json().encode('utf-8')
-        return hashlib.sha256(encoded).hexdigest()
+        """
+        Computes the Decision Record hash (Proof of Decision) with the record's
+        own hash_scheme, so verifiers never need to be told the algorithm.
+        """
+        try:
+            encoded = json.dumps(self._hash_dict(), sort_keys=True, separators=(',', ':'))
+        except TypeError:
+            # Payload holds values only asdict() can flatten (e.g. nested dataclasses)
+            encoded = self.to_json()
+        return hash_hex(encoded.encode('utf-8'), self.hash_scheme)
 
 class LogosAgent:
     """
     A wrapper for any AI agent that implements the 'Logos Flight Recorder' pattern.
     """
-    def __init__(self, agent_id: str, objective_id: str):
+    def __init__(self, agent_id: str, objective_id: str, observation_store=None, observation_hasher=None,
+                 verbose: bool = True, hash_scheme: str = DEFAULT_SCHEME):
         self.agent_id = agent_id
         self.objective_id = objective_id
         self.history = []
         self.last_hash = None
+        # Optional ObservationStore: keeps the raw observation as evidence for its hash
+        self.observation_store = observation_store
+        # Optional structured hasher (e.g. merkle.MerkleHasher) replacing the flat hash
+        self.observation_hasher = observation_hasher
+        self.verbose = verbose
+        # Hash algorithm for observations and records, e.g. "blake2b-256" for large observations
+        scheme = get_scheme(hash_scheme)
+        scheme.new()  # fail now, not mid-decision, if e.g. blake3 is not installed
+        self.hash_scheme = scheme.name
+        # Records carry one scheme tag, so the observation hasher must use the same
+        # algorithm; hashers that don't declare a hash_scheme are taken as SHA-256.
+        if observation_hasher is not None:
+            hasher_scheme = getattr(observation_hasher, "hash_scheme", DEFAULT_SCHEME)
+            if hasher_scheme != self.hash_scheme:
+                raise ValueError(
+                    f"observation_hasher hashes with {hasher_scheme}, but the agent's hash_scheme is {self.hash_scheme}"
+                )
 
-    def decide(self, observation: Union[Dict[str, Any], List[Dict[str, Any]]], action: Dict[str, Any]) -> str:
+    def decide(self, observation: Union[Dict[str, Any], List[Dict[str, Any]]], action: Dict[str, Any],
+               timestamp: Optional[float] = None) -> str:
         """
         Commits a decision to the log.
         Supports single observation or a batch of observations (e.g. multi-protocol states).
+        timestamp pins the record time (default: now), so a hash computed ahead
+        of time, e.g. by a client, can be reproduced exactly.
         Returns the Decision Hash (PoD).
         """
         # 1. Provide Privacy by hashing the raw observation first
-        # Handles both single dict and list of dicts automatically via JSON serialization
-        obs_str = json.dumps(observation, sort_keys=True).encode('utf-8')
-        obs_hash = hashlib.sha256(obs_str).hexdigest()
+        obs_hash = self.hash_observation(observation)
 
         # 2. Create the snapshot
         snapshot = DecisionSnapshot(
@@ -68,10 +118,11 @@ class LogosAgent:
         # 3. Create the record
         record = DecisionRecord(
             agent_id=self.agent_id,
-            timestamp=time.time(),
+            timestamp=time.time() if timestamp is None else timestamp,
             objective_id=self.objective_id,
             snapshot=snapshot,
-            prev_hash=self.last_hash
+            prev_hash=self.last_hash,
+            hash_scheme=self.hash_scheme
         )
         
         # 4. Compute Proof of Decision
@@ -81,8 +132,116 @@ class LogosAgent:
         self.history.append(record)
         self.last_hash = decision_hash
         
-        print(f"[{self.agent_id}] Decision Logged: {decision_hash[:8]}... | Obj: {self.objective_id}")
+        if self.verbose:
+            print(f"[{self.agent_id}] Decision Logged: {decision_hash[:8]}... | Obj: {self.objective_id}")
         return decision_hash
 
+    def hash_observation(self, observation: Union[Dict[str, Any], List[Dict[str, Any]]]) -> str:
+        """
+        Canonical observation hash. Handles both single dict and list of dicts
+        automatically via JSON serialization. NumPy arrays and pandas objects
+        are committed by dtype, shape and buffer digest (see sdk.arrays), so
+        pass them as-is rather than converting to lists.
+        """
+        if self.observation_hasher is not None:
+            obs_hash = self.observation_hasher(observation)
+            if self.observation_store is not None:
+                self.observation_store.put_observation(observation, observation_hash=obs_hash)
+            return obs_hash
+        if self.observation_store is not None:
+            return self.observation_store.put_observation(observation, self.hash_scheme)
+        obs_str = json.dumps(observation, sort_keys=True, default=array_encoder(self.hash_scheme)).encode('utf-8')
+        return hash_hex(obs_str, self.hash_scheme)
+
     def export_logs(self) -> str:
         return json.dumps([n.to_dict() for n in self.history], indent=2)
+
+
+class ConcurrentLogosAgent(LogosAgent):
+    """
+    Thread-safe LogosAgent with one independent prev_hash chain per objective.
+
+    Observation hashing (the expensive part) runs outside any lock; only the
+    chain-link step (read prev_hash, seal record, publish new head) is
+    serialised, and only against other decisions for the same objective.
+    """
+    def __init__(self, agent_id: str, objective_id: Optional[str] = None,
+                 observation_store=None, observation_hasher=None, verbose: bool = True,
+                 hash_scheme: str = DEFAULT_SCHEME):
+        super().__init__(agent_id, objective_id, observation_store=observation_store,
+                         observation_hasher=observation_hasher, verbose=verbose, hash_scheme=hash_scheme)
+        self.chains: Dict[str, List[DecisionRecord]] = {}
+        self.heads: Dict[str, Optional[str]] = {}
+        self._chain_locks: Dict[str, threading.Lock] = {}
+        self._registry_lock = threading.Lock()
+
+    def _chain_lock(self, objective_id: str) -> threading.Lock:
+        lock = self._chain_locks.get(objective_id)
+        if lock is None:
+            with self._registry_lock:
+                lock = self._chain_locks.get(objective_id)
+                if lock is None:
+                    self.chains[objective_id] = []
+                    self.heads[objective_id] = None
+                    lock = self._chain_locks[objective_id] = threading.Lock()
+        return lock
+
+    @property
+    def last_hash(self) -> Optional[str]:
+        return self.heads.get(self.objective_id) if self.objective_id else None
+
+    @last_hash.setter
+    def last_hash(self, value: Optional[str]) -> None:
+        # LogosAgent.__init__ resets it; chain heads live in self.heads.
+        pass
+
+    def decide(self, observation: Union[Dict[str, Any], List[Dict[str, Any]]], action: Dict[str, Any],
+               timestamp: Optional[float] = None, objective_id: Optional[str] = None) -> str:
+        """
+        Commits a decision to the chain for objective_id (default: the agent's objective).
+        timestamp pins the record time as in LogosAgent.decide.
+        Safe to call from many threads. Returns the Decision Hash (PoD).
+        """
+        objective_id = objective_id or self.objective_id
+        if objective_id is None:
+            raise ValueError("objective_id is required when the agent has no default objective")
+
+        # Outside the lock: serialise and hash the observation
+        snapshot = DecisionSnapshot(
+            observation_hash=self.hash_observation(observation),
+            action_payload=action
+        )
+
+        with self._chain_lock(objective_id):
+            record = DecisionRecord(
+                agent_id=self.agent_id,
+                timestamp=time.time() if timestamp is None else timestamp,
+                objective_id=objective_id,
+                snapshot=snapshot,
+                prev_hash=self.heads[objective_id],
+                hash_scheme=self.hash_scheme
+            )
+            decision_hash = record.compute_hash()
+            self.chains[objective_id].append(record)
+            self.heads[objective_id] = decision_hash
+            self.history.append(record)
+
+        if self.verbose:
+            print(f"[{self.agent_id}] Decision Logged: {decision_hash[:8]}... | Obj: {objective_id}")
+        return decision_hash
+
+    def verify_chain(self, objective_id: Optional[str] = None) -> bool:
+        """Checks that every record in the objective's chain links to its predecessor."""
+        objective_id = objective_id or self.objective_id
+        lock = self._chain_locks.get(objective_id)
+        if lock is None:
+            return True   # no decisions yet: an empty chain is trivially valid
+        with lock:
+            records = list(self.chains[objective_id])
+            head = self.heads[objective_id]
+        prev = None
+        for record in records:
+            if record.prev_hash != prev or record.objective_id != objective_id:
+                return False
+            prev = record.compute_hash()
+        return prev == head
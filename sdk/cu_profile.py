@@ -0,0 +1,123 @@
+"""
+Measured compute-unit profiles for logos_core instructions.
+
+The program-test harness (programs/logos_core/tests/compute_units.rs)
+simulates every instruction at several input sizes and writes a JSON report:
+
+    {"variant": "lean", "instructions": {"log_decision": {"1": 11873, "42": 12410}, ...}}
+
+Sizes are objective / agent ID bytes, or entries for log_decisions. Load a
+report with load_profile() and hand it to FeePlanner so compute-unit limits
+follow the real cost of each transaction instead of fixed defaults:
+
+    python -m sdk.cu_profile --lean --output cu_profile.json
+    LOGOS_PRIORITY_FEES=1 LOGOS_CU_PROFILE=cu_profile.json python api_server.py
+
+Stdlib only; running the harness needs the Rust/Anchor toolchain.
+"""
+import argparse
+import bisect
+import json
+import math
+import os
+import subprocess
+import sys
+import tempfile
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+PROFILE_ENV = "LOGOS_CU_PROFILE"
+PROGRAM_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "programs", "logos_core")
+
+
+@dataclass
+class ComputeProfile:
+    variant: str
+    samples: Dict[str, Dict[int, int]]   # instruction -> input size -> compute units
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ComputeProfile":
+        samples = {
+            kind: {int(size): int(cu) for size, cu in points.items()}
+            for kind, points in data["instructions"].items()
+            if points
+        }
+        return cls(data.get("variant", "default"), samples)
+
+    def covers(self, kind: str) -> bool:
+        return kind in self.samples
+
+    def units(self, kind: str, size: Optional[int] = None) -> int:
+        """
+        Compute units for one instruction. Without a size, the largest measured
+        cost; otherwise interpolated between the measured sizes (and
+        extrapolated past the largest, never below it).
+        """
+        points = self.samples[kind]
+        if size is None:
+            return max(points.values())
+        sizes = sorted(points)
+        if size <= sizes[0]:
+            return points[sizes[0]]
+        i = bisect.bisect_left(sizes, size)
+        if i == len(sizes):
+            if len(sizes) == 1:
+                return points[sizes[0]]
+            i -= 1  # extend the last segment
+        lo, hi = sizes[i - 1], sizes[i]
+        slope = max(0.0, (points[hi] - points[lo]) / (hi - lo))
+        return math.ceil(points[lo] + slope * (size - lo))
+
+    def as_units(self) -> Dict[str, int]:
+        """Worst case per instruction, in the shape of DEFAULT_COMPUTE_UNITS."""
+        return {kind: max(points.values()) for kind, points in self.samples.items()}
+
+
+def load_profile(path: Optional[str] = None) -> Optional[ComputeProfile]:
+    """Read a harness report; path defaults to $LOGOS_CU_PROFILE. None if neither is set."""
+    path = path or os.getenv(PROFILE_ENV)
+    if not path:
+        return None
+    with open(path) as f:
+        return ComputeProfile.from_dict(json.load(f))
+
+
+def run_harness(lean: bool = False, output: Optional[str] = None, build: bool = False,
+                program_dir: str = PROGRAM_DIR) -> ComputeProfile:
+    """
+    Run the program-test harness and return its profile. The program must be
+    built (anchor build, with '-- --features lean' for lean) unless build=True.
+    """
+    features = ["--features", "lean"] if lean else []
+    workspace = os.path.dirname(os.path.dirname(program_dir))
+    if build:
+        subprocess.run(["anchor", "build", "--", *features], cwd=workspace, check=True)
+    with tempfile.TemporaryDirectory() as tmp:
+        report = output or os.path.join(tmp, "cu_profile.json")
+        env = dict(os.environ,
+                   LOGOS_CU_REPORT=os.path.abspath(report),
+                   SBF_OUT_DIR=os.path.join(workspace, "target", "deploy"))
+        subprocess.run(
+            ["cargo", "test", "-p", "logos_core", "--test", "compute_units", *features, "--", "--nocapture"],
+            cwd=workspace, env=env, check=True,
+        )
+        return load_profile(report)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Profile logos_core compute units with program-test")
+    parser.add_argument("--lean", action="store_true", help="profile the 'lean' feature build")
+    parser.add_argument("--build", action="store_true", help="run anchor build first")
+    parser.add_argument("--output", help="write the JSON report here")
+    args = parser.parse_args(argv)
+
+    profile = run_harness(lean=args.lean, output=args.output, build=args.build)
+    print(f"\nvariant: {profile.variant}")
+    for kind, points in sorted(profile.samples.items()):
+        row = "  ".join(f"{size}:{cu}" for size, cu in sorted(points.items()))
+        print(f"  {kind:<22} {row}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
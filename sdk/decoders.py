@@ -0,0 +1,302 @@
+"""
+Decoders for logos_core account and event layouts (Anchor/Borsh).
+
+Every decoder accepts any buffer (bytes, bytearray, memoryview, mmap) and
+reads it through a memoryview with precompiled Structs, so fields are parsed
+in place rather than from sliced copies. The 8-byte discriminator is always
+checked before anything else is read.
+"""
+import base64
+import struct
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from solders.pubkey import Pubkey
+
+from .onchain_utils import HASH_BYTES, get_discriminator
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+AGENT_ACCOUNT_DISCRIMINATOR = get_discriminator("account", "AgentAccount")
+DECISION_RECORD_DISCRIMINATOR = get_discriminator("account", "DecisionRecord")
+COMPACT_DECISION_RECORD_DISCRIMINATOR = get_discriminator("account", "CompactDecisionRecord")
+DECISION_BATCH_DISCRIMINATOR = get_discriminator("account", "DecisionBatch")
+AGENT_REGISTERED_DISCRIMINATOR = get_discriminator("event", "AgentRegistered")
+DECISION_LOGGED_DISCRIMINATOR = get_discriminator("event", "DecisionLogged")
+COMPACT_DECISION_LOGGED_DISCRIMINATOR = get_discriminator("event", "CompactDecisionLogged")
+DECISION_APPENDED_DISCRIMINATOR = get_discriminator("event", "DecisionAppended")
+DECISIONS_LOGGED_DISCRIMINATOR = get_discriminator("event", "DecisionsLogged")
+
+# Both record layouts start with [discriminator(8)][agent(32)], so agent sits at offset 8.
+AGENT_OFFSET = 8
+
+_U32 = struct.Struct("<I")
+_I64 = struct.Struct("<q")
+_U64 = struct.Struct("<Q")
+
+PROGRAM_DATA_PREFIX = "Program data: "
+
+
+@dataclass
+class DecodedAgentAccount:
+    authority: str
+    agent_id: str
+    created_at: int
+
+
+@dataclass
+class DecodedDecisionRecord:
+    agent: str              # agent PDA, base58
+    decision_hash: str      # hex, whichever layout stored it
+    objective_id: str
+    timestamp: int
+    compact: bool = False
+
+
+@dataclass
+class AgentRegisteredEvent:
+    agent: str
+    agent_id: str
+    authority: str
+    timestamp: int
+
+
+@dataclass
+class DecisionLoggedEvent:
+    agent: str
+    objective_id: str
+    decision_hash: str      # hex, for both the string and compact events
+    timestamp: int
+    compact: bool = False
+    sequence: Optional[int] = None  # set for ring-buffer DecisionAppended events
+    batch_root: Optional[str] = None  # set for decisions unpacked from a DecisionsLogged event
+
+
+@dataclass
+class DecodedDecisionBatch:
+    agent: str
+    batch_root: str         # hex
+    count: int
+    timestamp: int
+
+
+@dataclass
+class DecisionsLoggedEvent:
+    agent: str
+    batch_root: str
+    entries: List[Tuple[str, str]]   # (objective_id, decision_hash hex)
+    timestamp: int
+
+    def decisions(self) -> List[DecisionLoggedEvent]:
+        """One DecisionLoggedEvent per entry, for indexers that handle decisions individually."""
+        return [DecisionLoggedEvent(self.agent, objective_id, decision_hash, self.timestamp,
+                                    compact=True, batch_root=self.batch_root)
+                for objective_id, decision_hash in self.entries]
+
+
+def _pubkey(mv: memoryview, offset: int) -> str:
+    if offset + 32 > len(mv):
+        raise ValueError("Buffer ends inside a public key")   # solders panics on short input
+    return str(Pubkey.from_bytes(mv[offset:offset + 32].tobytes()))
+
+
+def _string(mv: memoryview, offset: int) -> Tuple[str, int]:
+    if offset + 4 > len(mv):
+        raise ValueError("Buffer ends before string length")
+    (length,) = _U32.unpack_from(mv, offset)
+    offset += 4
+    end = offset + length
+    if end > len(mv):
+        raise ValueError("String length exceeds buffer")
+    return str(mv[offset:end], "utf-8"), end
+
+
+def _hash(mv: memoryview, offset: int) -> Tuple[str, int]:
+    """A raw 32-byte hash as hex. Slicing alone would silently return a short one."""
+    end = offset + HASH_BYTES
+    if end > len(mv):
+        raise ValueError("Buffer ends inside a 32-byte hash")
+    return mv[offset:end].hex(), end
+
+
+def _i64(mv: memoryview, offset: int) -> int:
+    if offset + 8 > len(mv):
+        raise ValueError("Buffer ends before timestamp")
+    return _I64.unpack_from(mv, offset)[0]
+
+
+def _view(data: Buffer) -> memoryview:
+    mv = data if isinstance(data, memoryview) else memoryview(data)
+    if len(mv) < 8:
+        raise ValueError("Buffer shorter than a discriminator")
+    return mv
+
+
+def decode_agent_account(data: Buffer) -> DecodedAgentAccount:
+    mv = _view(data)
+    if mv[:8] != AGENT_ACCOUNT_DISCRIMINATOR:
+        raise ValueError("Not an AgentAccount")
+    authority = _pubkey(mv, 8)
+    agent_id, offset = _string(mv, 40)
+    (created_at,) = _I64.unpack_from(mv, offset)
+    return DecodedAgentAccount(authority, agent_id, created_at)
+
+
+def decode_decision_record(data: Buffer) -> DecodedDecisionRecord:
+    """Decode a DecisionRecord or CompactDecisionRecord account."""
+    mv = _view(data)
+    discriminator = mv[:8]
+    offset = AGENT_OFFSET + 32
+    if discriminator == DECISION_RECORD_DISCRIMINATOR:
+        decision_hash, offset = _string(mv, offset)
+        compact = False
+    elif discriminator == COMPACT_DECISION_RECORD_DISCRIMINATOR:
+        decision_hash, offset = _hash(mv, offset)
+        compact = True
+    else:
+        raise ValueError("Not a Logos decision record account")
+    objective_id, offset = _string(mv, offset)
+    timestamp = _i64(mv, offset)
+    return DecodedDecisionRecord(_pubkey(mv, AGENT_OFFSET), decision_hash, objective_id, timestamp, compact)
+
+
+def decode_decision_batch(data: Buffer) -> DecodedDecisionBatch:
+    """Decode a DecisionBatch account (root and count of one log_decisions call)."""
+    mv = _view(data)
+    if mv[:8] != DECISION_BATCH_DISCRIMINATOR:
+        raise ValueError("Not a DecisionBatch account")
+    if len(mv) < 84:
+        raise ValueError("Truncated DecisionBatch account")
+    (count,) = _U32.unpack_from(mv, 72)
+    (timestamp,) = _I64.unpack_from(mv, 76)
+    return DecodedDecisionBatch(_pubkey(mv, AGENT_OFFSET), mv[40:72].hex(), count, timestamp)
+
+
+def decode_decision_records(buffers: Iterable[Buffer], skip_invalid: bool = True,
+                            columns: bool = False) -> Union[List[DecodedDecisionRecord], Dict[str, List[Any]]]:
+    """
+    Batch-decode thousands of decision record accounts.
+
+    Per-record work is a handful of unpack_from calls on one memoryview; the
+    agent PDA, which repeats across an agent's records, is base58-encoded once
+    per distinct key. With columns=True, returns a dict of column lists
+    (ready for AuditStore-style bulk loading) instead of objects.
+    """
+    string_disc = DECISION_RECORD_DISCRIMINATOR
+    compact_disc = COMPACT_DECISION_RECORD_DISCRIMINATOR
+    u32 = _U32.unpack_from
+    i64 = _I64.unpack_from
+    agent_cache: Dict[bytes, str] = {}
+
+    agents, hashes, objectives, timestamps, compacts = [], [], [], [], []
+    for data in buffers:
+        mv = data if isinstance(data, memoryview) else memoryview(data)
+        try:
+            discriminator = mv[:8]
+            if discriminator == string_disc:
+                (length,) = u32(mv, 40)
+                offset = 44 + length
+                decision_hash = str(mv[44:offset], "ascii")
+                compact = False
+            elif discriminator == compact_disc:
+                offset = 72     # a short hash fails the length read below
+                decision_hash = mv[40:72].hex()
+                compact = True
+            else:
+                raise ValueError("Not a Logos decision record account")
+            (length,) = u32(mv, offset)
+            end = offset + 4 + length
+            if end + 8 > len(mv):
+                raise ValueError("Truncated decision record")
+            objective_id = str(mv[offset + 4:end], "utf-8")
+            (timestamp,) = i64(mv, end)
+        except (ValueError, struct.error, UnicodeDecodeError):
+            if skip_invalid:
+                continue
+            raise
+
+        agent_raw = mv[8:40].tobytes()
+        agent = agent_cache.get(agent_raw)
+        if agent is None:
+            agent = agent_cache[agent_raw] = str(Pubkey.from_bytes(agent_raw))
+        agents.append(agent)
+        hashes.append(decision_hash)
+        objectives.append(objective_id)
+        timestamps.append(timestamp)
+        compacts.append(compact)
+
+    if columns:
+        return {
+            "agent": agents,
+            "decision_hash": hashes,
+            "objective_id": objectives,
+            "timestamp": timestamps,
+            "compact": compacts,
+        }
+    return [DecodedDecisionRecord(*row) for row in zip(agents, hashes, objectives, timestamps, compacts)]
+
+
+def decode_event(data: Buffer) -> Union[AgentRegisteredEvent, DecisionLoggedEvent, DecisionsLoggedEvent]:
+    """Decode one Anchor event payload (discriminator + Borsh fields)."""
+    mv = _view(data)
+    discriminator = mv[:8]
+    if discriminator == AGENT_REGISTERED_DISCRIMINATOR:
+        agent = _pubkey(mv, 8)
+        agent_id, offset = _string(mv, 40)
+        authority = _pubkey(mv, offset)
+        timestamp = _i64(mv, offset + 32)
+        return AgentRegisteredEvent(agent, agent_id, authority, timestamp)
+
+    if discriminator == DECISION_LOGGED_DISCRIMINATOR:
+        objective_id, offset = _string(mv, 40)
+        decision_hash, offset = _string(mv, offset)
+        timestamp = _i64(mv, offset)
+        return DecisionLoggedEvent(_pubkey(mv, 8), objective_id, decision_hash, timestamp)
+
+    if discriminator == COMPACT_DECISION_LOGGED_DISCRIMINATOR:
+        objective_id, offset = _string(mv, 40)
+        decision_hash, offset = _hash(mv, offset)
+        timestamp = _i64(mv, offset)
+        return DecisionLoggedEvent(_pubkey(mv, 8), objective_id, decision_hash, timestamp, compact=True)
+
+    if discriminator == DECISION_APPENDED_DISCRIMINATOR:
+        if len(mv) < 48:
+            raise ValueError("Truncated DecisionAppended event")
+        (sequence,) = _U64.unpack_from(mv, 40)
+        objective_id, offset = _string(mv, 48)
+        decision_hash, offset = _hash(mv, offset)
+        timestamp = _i64(mv, offset)
+        return DecisionLoggedEvent(_pubkey(mv, 8), objective_id, decision_hash, timestamp,
+                                   compact=True, sequence=sequence)
+
+    if discriminator == DECISIONS_LOGGED_DISCRIMINATOR:
+        batch_root, offset = _hash(mv, 40)
+        if len(mv) < offset + 4:
+            raise ValueError("Truncated DecisionsLogged event")
+        (count,) = _U32.unpack_from(mv, offset)
+        offset += 4
+        entries = []
+        for _ in range(count):
+            objective_id, offset = _string(mv, offset)
+            decision_hash, offset = _hash(mv, offset)
+            entries.append((objective_id, decision_hash))
+        timestamp = _i64(mv, offset)
+        return DecisionsLoggedEvent(_pubkey(mv, 8), batch_root, entries, timestamp)
+
+    raise ValueError("Unknown Logos event discriminator")
+
+
+def parse_events(logs: Iterable[str]) -> List[Union[AgentRegisteredEvent, DecisionLoggedEvent, DecisionsLoggedEvent]]:
+    """
+    Extract Logos events from a transaction's log messages ("Program data: <base64>").
+    Lines from other programs' events are skipped.
+    """
+    events = []
+    for line in logs:
+        if not line.startswith(PROGRAM_DATA_PREFIX):
+            continue
+        try:
+            events.append(decode_event(base64.b64decode(line[len(PROGRAM_DATA_PREFIX):])))
+        except ValueError:
+            continue
+    return events
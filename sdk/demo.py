@@ -1,4 +1,4 @@
-from core import LogosAgent
+from sdk.core import LogosAgent  # run from the repo root: python -m sdk.demo
 import time
 
 def run_demo():
@@ -0,0 +1,289 @@
+"""
+Durable-nonce transactions: sign decision logs offline, submit them later.
+
+A transaction built on a recent blockhash expires after ~150 blocks (about a
+minute), so every send path fetches a fresh blockhash just before signing.
+A transaction built on a durable nonce instead stays valid until the nonce
+account is advanced, which its first instruction (advance_nonce_account)
+does when it lands. So:
+
+  - NoncePool tracks a set of nonce accounts and their current values.
+    One value signs one transaction; a slot is handed out again only after
+    the chain shows its nonce has moved, so two live transactions can never
+    share a nonce.
+  - OfflineSigner signs log_decision transactions against pooled nonces
+    with no RPC call (unless the pool has to refresh), at CPU speed.
+  - The signed bytes can be sent whenever bandwidth allows, and re-sent
+    safely: only one copy can ever land. NoncePool.advance() invalidates a
+    pre-signed transaction that should never land.
+
+    pool = NoncePool.create(client, payer, count=32)
+    signer = OfflineSigner(client, program_id, payer, pool)
+    burst = [signer.sign_log_decision(obj, h) for obj, h in decisions]   # no RPC
+    for presigned in burst:
+        signer.submit(presigned)
+
+The agent account must already be registered (see PooledSubmitter).
+"""
+import struct
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, List, Optional, Sequence
+
+from solders.hash import Hash
+from solders.instruction import Instruction
+from solders.keypair import Keypair
+from solders.message import Message
+from solders.pubkey import Pubkey
+from solders.system_program import AdvanceNonceAccountParams, advance_nonce_account, create_nonce_account
+from solders.transaction import Transaction
+
+from .onchain_utils import build_log_decision_ix
+from .prevalidate import validate_log_decision
+
+if TYPE_CHECKING:   # only solders is needed to sign; the client is duck-typed
+    from solana.rpc.api import Client
+    from solana.rpc.types import TxOpts
+
+# bincode Versions(u32) + State(u32) + authority + durable nonce + lamports_per_signature
+NONCE_ACCOUNT_SIZE = 4 + 4 + 32 + 32 + 8
+NONCE_STATE_INITIALIZED = 1
+
+# create_account + initialize_nonce per account; keeps the create transaction well under 1232 bytes
+NONCES_PER_CREATE_TX = 4
+
+
+@dataclass
+class NonceInfo:
+    authority: Pubkey
+    nonce: Hash
+    lamports_per_signature: int
+
+
+def decode_nonce_account(data: bytes) -> NonceInfo:
+    """Decode a System Program nonce account."""
+    if len(data) < NONCE_ACCOUNT_SIZE:
+        raise ValueError(f"Nonce account too small: {len(data)} < {NONCE_ACCOUNT_SIZE}")
+    _version, state = struct.unpack_from("<II", data, 0)
+    if state != NONCE_STATE_INITIALIZED:
+        raise ValueError("Nonce account is not initialized")
+    (lamports_per_signature,) = struct.unpack_from("<Q", data, 72)
+    return NonceInfo(
+        authority=Pubkey.from_bytes(bytes(data[8:40])),
+        nonce=Hash.from_bytes(bytes(data[40:72])),
+        lamports_per_signature=lamports_per_signature,
+    )
+
+
+@dataclass
+class NonceSlot:
+    pubkey: Pubkey
+    nonce: Optional[Hash] = None    # last value read from chain
+    spent: bool = False             # `nonce` has signed a transaction that may still land
+    in_use: bool = False            # handed out by acquire(), not yet released
+
+    @property
+    def ready(self) -> bool:
+        return not self.in_use and not self.spent and self.nonce is not None
+
+
+class NoncePool:
+    """
+    Nonce accounts sharing one authority. acquire() hands out a slot whose
+    nonce is unused; a released slot that signed something comes back only
+    once refresh() reads a different nonce from chain (the transaction landed,
+    or advance() invalidated it).
+    """
+    def __init__(self, client: "Client", authority: Keypair, nonce_accounts: Sequence[Pubkey],
+                 poll_interval: float = 0.5):
+        if not nonce_accounts:
+            raise ValueError("NoncePool needs at least one nonce account")
+        self.client = client
+        self.authority = authority
+        self.poll_interval = poll_interval
+        self.slots = [NonceSlot(pubkey) for pubkey in nonce_accounts]
+        self._cond = threading.Condition()
+
+    @classmethod
+    def create(cls, client: "Client", payer: Keypair, count: int,
+               authority: Optional[Keypair] = None) -> "NoncePool":
+        """Create and fund `count` nonce accounts (rent-exempt), confirm them, and load their nonces."""
+        authority = authority or payer
+        lamports = client.get_minimum_balance_for_rent_exemption(NONCE_ACCOUNT_SIZE).value
+        accounts = [Keypair() for _ in range(count)]
+        for start in range(0, count, NONCES_PER_CREATE_TX):
+            chunk = accounts[start:start + NONCES_PER_CREATE_TX]
+            ixs: List[Instruction] = []
+            for account in chunk:
+                ixs.extend(create_nonce_account(payer.pubkey(), account.pubkey(), authority.pubkey(), lamports))
+            blockhash = client.get_latest_blockhash().value.blockhash
+            tx = Transaction([payer, *chunk], Message(ixs, payer.pubkey()), blockhash)
+            client.confirm_transaction(client.send_transaction(tx).value)
+        pool = cls(client, authority, [account.pubkey() for account in accounts])
+        pool.refresh()
+        return pool
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def available(self) -> int:
+        with self._cond:
+            return sum(slot.ready for slot in self.slots)
+
+    def refresh(self) -> int:
+        """Re-read every idle slot that needs a new nonce (one RPC call). Returns slots ready."""
+        with self._cond:
+            stale = [slot for slot in self.slots if not slot.in_use and (slot.spent or slot.nonce is None)]
+        if stale:
+            accounts = self.client.get_multiple_accounts([slot.pubkey for slot in stale]).value
+            with self._cond:
+                for slot, account in zip(stale, accounts):
+                    if slot.in_use or account is None:
+                        continue
+                    try:
+                        value = decode_nonce_account(account.data).nonce
+                    except ValueError as e:
+                        print(f"Skipping nonce account {slot.pubkey}: {e}")
+                        continue
+                    if not slot.spent or value != slot.nonce:
+                        # Unchanged while spent: the signed transaction can still land, keep waiting
+                        slot.nonce, slot.spent = value, False
+                self._cond.notify_all()
+        return self.available()
+
+    def _take(self) -> Optional[NonceSlot]:
+        for slot in self.slots:
+            if slot.ready:
+                slot.in_use = True
+                return slot
+        return None
+
+    def acquire(self, timeout: Optional[float] = None) -> NonceSlot:
+        """
+        A slot with an unused nonce. When none is ready, re-reads spent slots
+        from chain every poll_interval seconds until one has moved on.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._cond:
+                slot = self._take()
+            if slot is not None:
+                return slot
+            self.refresh()
+            with self._cond:
+                wait = self.poll_interval if deadline is None else min(self.poll_interval, deadline - time.monotonic())
+                if self._cond.wait_for(lambda: any(s.ready for s in self.slots), max(wait, 0)):
+                    return self._take()
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise TimeoutError("No durable nonce available: every nonce signs a pending transaction")
+
+    def release(self, slot: NonceSlot, spent: bool = False) -> None:
+        """Return a slot; spent=True if its nonce signed a transaction that may land."""
+        with self._cond:
+            if spent:
+                slot.spent = True
+            slot.in_use = False
+            self._cond.notify_all()
+
+    def advance(self, slot: NonceSlot, payer: Optional[Keypair] = None,
+                expected_nonce: Optional[Hash] = None) -> str:
+        """
+        Advance a slot's nonce with an ordinary transaction, so anything signed
+        against the old value can never land. Waits for confirmation. With
+        expected_nonce, does nothing (returns "") if the nonce has already moved.
+        """
+        with self._cond:
+            if slot.in_use:
+                raise ValueError(f"Nonce account {slot.pubkey} is in use")
+            if expected_nonce is not None and slot.nonce != expected_nonce:
+                return ""
+            slot.in_use = True   # keep acquire() and refresh() off it meanwhile
+        try:
+            payer = payer or self.authority
+            ix = advance_nonce_account(AdvanceNonceAccountParams(
+                nonce_pubkey=slot.pubkey,
+                authorized_pubkey=self.authority.pubkey(),
+            ))
+            signers = [payer] if payer.pubkey() == self.authority.pubkey() else [payer, self.authority]
+            blockhash = self.client.get_latest_blockhash().value.blockhash
+            tx = Transaction(signers, Message([ix], payer.pubkey()), blockhash)
+            sig = self.client.send_transaction(tx).value
+            self.client.confirm_transaction(sig)
+            with self._cond:
+                slot.nonce, slot.spent = None, False   # picked up by the next refresh
+        finally:
+            self.release(slot)
+        return str(sig)
+
+
+@dataclass
+class PresignedTx:
+    tx: Transaction
+    slot: NonceSlot
+    nonce: Hash
+    objective_id: Optional[str] = None
+
+    @property
+    def signature(self) -> str:
+        return str(self.tx.signatures[0])
+
+    def raw(self) -> bytes:
+        return bytes(self.tx)
+
+
+class OfflineSigner:
+    """Signs Logos transactions against a NoncePool instead of a recent blockhash."""
+    def __init__(self, client: "Client", program_id: Pubkey, keypair: Keypair, nonce_pool: NoncePool,
+                 opts: Optional["TxOpts"] = None):
+        self.client = client
+        self.program_id = program_id
+        self.keypair = keypair
+        self.pool = nonce_pool
+        self.opts = opts   # None: the client's defaults, preflight included
+
+    def sign(self, ixs: List[Instruction], timeout: Optional[float] = None,
+             objective_id: Optional[str] = None) -> PresignedTx:
+        slot = self.pool.acquire(timeout)
+        spent = False
+        try:
+            # advance_nonce_account must be the first instruction for the runtime to accept the nonce
+            advance = advance_nonce_account(AdvanceNonceAccountParams(
+                nonce_pubkey=slot.pubkey,
+                authorized_pubkey=self.pool.authority.pubkey(),
+            ))
+            signers = [self.keypair]
+            if self.pool.authority.pubkey() != self.keypair.pubkey():
+                signers.append(self.pool.authority)
+            tx = Transaction(signers, Message([advance, *ixs], self.keypair.pubkey()), slot.nonce)
+            spent = True
+            return PresignedTx(tx, slot, slot.nonce, objective_id)
+        finally:
+            self.pool.release(slot, spent)
+
+    def sign_log_decision(self, objective_id: str, decision_hash: str,
+                          timeout: Optional[float] = None) -> PresignedTx:
+        """Pre-sign one log_decision. Raises PrevalidationError for arguments the program would reject."""
+        validate_log_decision(decision_hash, objective_id)
+        ix = build_log_decision_ix(
+            program_id=self.program_id,
+            authority=self.keypair.pubkey(),
+            decision_hash=decision_hash,
+            objective_id=objective_id
+        )
+        return self.sign([ix], timeout, objective_id)
+
+    def submit(self, presigned: PresignedTx, confirm: bool = False) -> str:
+        """
+        Send pre-signed bytes. Safe to call again after a failure: a durable-nonce
+        transaction lands at most once.
+        """
+        sig = self.client.send_raw_transaction(presigned.raw(), opts=self.opts).value
+        if confirm:
+            self.client.confirm_transaction(sig)
+        return str(sig)
+
+    def invalidate(self, presigned: PresignedTx) -> str:
+        """Make sure a pre-signed transaction never lands (e.g. a cancelled decision)."""
+        # A nonce that already moved on means it landed or was invalidated before
+        return self.pool.advance(presigned.slot, self.keypair, expected_nonce=presigned.nonce)
@@ -0,0 +1,123 @@
+import asyncio
+import threading
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+COMMITTED = "committed"
+CONFIRMED = "confirmed"
+FAILED = "failed"
+EXPIRED = "expired"
+
+
+class Subscription:
+    """
+    One consumer's bounded view of the bus. publish() never waits on it:
+    if the buffer is full the subscription is closed and marked dropped.
+    """
+    def __init__(self, loop: asyncio.AbstractEventLoop, agent_id: Optional[str],
+                 objective_id: Optional[str], max_buffer: int):
+        self.agent_id = agent_id
+        self.objective_id = objective_id
+        self.max_buffer = max_buffer
+        self.closed = False
+        self.dropped = False
+        self._queue: deque = deque()
+        self._lock = threading.Lock()   # publishers may run on several threads
+        self._loop = loop
+        self._ready = asyncio.Event()
+
+    def matches(self, message: Dict[str, Any]) -> bool:
+        return (self.agent_id is None or message.get("agent_id") == self.agent_id) and \
+               (self.objective_id is None or message.get("objective_id") == self.objective_id)
+
+    def _wake(self) -> None:
+        try:
+            self._loop.call_soon_threadsafe(self._ready.set)
+        except RuntimeError:
+            self.closed = True  # loop already gone
+
+    def _offer(self, message: Dict[str, Any]) -> Optional[bool]:
+        """True if queued, False if this message overflowed the buffer, None if already closed."""
+        with self._lock:
+            if self.closed:
+                return None
+            if len(self._queue) >= self.max_buffer:
+                self.dropped = True
+                self.closed = True
+                accepted = False
+            else:
+                self._queue.append(message)
+                accepted = True
+        self._wake()
+        return accepted
+
+    def close(self) -> None:
+        self.closed = True
+        self._wake()
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Next message, or None on timeout. Raises ConnectionAbortedError once the
+        subscription is closed (for a dropped consumer, after nothing is left to drain).
+        """
+        while not self._queue:
+            if self.closed:
+                raise ConnectionAbortedError("slow consumer dropped" if self.dropped else "subscription closed")
+            self._ready.clear()
+            if self._queue or self.closed:
+                continue
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        return self._queue.popleft()
+
+
+class DecisionBus:
+    """
+    In-process pub/sub for decision lifecycle events. publish() is safe from
+    any thread and costs O(subscribers) appends; it never blocks the /log path.
+    """
+    def __init__(self, max_buffer: int = 1000):
+        self.max_buffer = max_buffer
+        self._subscribers: List[Subscription] = []
+        self._lock = threading.Lock()
+        self.dropped_consumers = 0
+
+    def subscribe(self, agent_id: Optional[str] = None, objective_id: Optional[str] = None,
+                  max_buffer: Optional[int] = None) -> Subscription:
+        """Must be called from the event loop that will consume the subscription."""
+        sub = Subscription(asyncio.get_running_loop(), agent_id, objective_id,
+                           max_buffer or self.max_buffer)
+        with self._lock:
+            self._subscribers.append(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        sub.close()
+        with self._lock:
+            if sub in self._subscribers:
+                self._subscribers.remove(sub)
+
+    def publish(self, message: Dict[str, Any]) -> int:
+        """Deliver to every matching subscriber. Returns how many received it."""
+        delivered = 0
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for sub in subscribers:
+            if sub.closed or not sub.matches(message):
+                continue
+            accepted = sub._offer(message)
+            if accepted:
+                delivered += 1
+            elif accepted is False:
+                print(f"[DecisionBus] Dropped slow consumer ({sub.max_buffer} messages behind)")
+                with self._lock:
+                    self.dropped_consumers += 1
+                    if sub in self._subscribers:
+                        self._subscribers.remove(sub)
+        return delivered
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
@@ -0,0 +1,189 @@
+"""
+Single-parse JSON path for /log.
+
+The request body is parsed once (orjson when installed), checked against a
+small hand-written schema that mirrors DecisionRequest/ObservationData, and
+the resulting plain dicts go straight into LogosAgent hashing. The coercions
+match the pydantic models (int timestamps become floats, "true"/1 are valid
+booleans), so a request yields the same observation and decision hashes on
+either path. Canonical hashing itself always stays on the stdlib encoder:
+orjson formats floats and non-ASCII text differently.
+"""
+import json
+import re
+from typing import Any, Dict, List
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib
+    orjson = None
+
+# orjson silently turns integers outside the 64-bit range into floats, which would
+# change the observation hash. Any run of 19+ digits sends the body to the stdlib.
+_LONG_INT = re.compile(rb"\d{19}")
+
+_TRUE = frozenset({"1", "on", "t", "true", "y", "yes"})
+_FALSE = frozenset({"0", "off", "f", "false", "n", "no"})
+
+
+class RequestValidationError(ValueError):
+    """Carries pydantic-style error entries ({"loc", "msg", "type"}) for a 422 response."""
+    def __init__(self, errors: List[Dict[str, Any]]):
+        super().__init__("; ".join(f"{'.'.join(map(str, e['loc']))}: {e['msg']}" for e in errors))
+        self.errors = errors
+
+
+def loads(body: bytes) -> Any:
+    if orjson is not None and not _LONG_INT.search(body):
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            # orjson rejects NaN/Infinity, overflowing floats and lone surrogates,
+            # which the stdlib (and therefore the pydantic path) accepts.
+            pass
+    return json.loads(body)
+
+
+def dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+
+def _float(value: Any) -> float:
+    if isinstance(value, float):
+        return value
+    if isinstance(value, (int, str)):
+        return float(value)
+    raise TypeError
+
+
+def _bool(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str):
+        lowered = value.strip().lower()
+        if lowered in _TRUE:
+            return True
+        if lowered in _FALSE:
+            return False
+    raise TypeError
+
+
+def _check_decision(data: Any, loc: List[Any], errors: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Validate one DecisionRequest-shaped dict, appending to errors; returns _log_decision kwargs."""
+    def fail(sub, msg, type_):
+        errors.append({"loc": [*loc, *sub], "msg": msg, "type": type_})
+
+    if not isinstance(data, dict):
+        fail([], "value is not a valid dict", "type_error.dict")
+        return {}
+
+    objective_id = data.get("objective_id")
+    if "objective_id" not in data:
+        fail(["objective_id"], "field required", "value_error.missing")
+    elif not isinstance(objective_id, str):
+        fail(["objective_id"], "str type expected", "type_error.str")
+
+    observations = []
+    raw_observations = data.get("observations")
+    if "observations" not in data:
+        fail(["observations"], "field required", "value_error.missing")
+    elif not isinstance(raw_observations, list):
+        fail(["observations"], "value is not a valid list", "type_error.list")
+    else:
+        for i, obs in enumerate(raw_observations):
+            if not isinstance(obs, dict):
+                fail(["observations", i], "value is not a valid dict", "type_error.dict")
+                continue
+            source, content, timestamp = obs.get("source"), obs.get("content"), obs.get("timestamp")
+            if not isinstance(source, str):
+                fail(["observations", i, "source"],
+                     "field required" if "source" not in obs else "str type expected",
+                     "value_error.missing" if "source" not in obs else "type_error.str")
+            if not isinstance(content, dict):
+                fail(["observations", i, "content"],
+                     "field required" if "content" not in obs else "value is not a valid dict",
+                     "value_error.missing" if "content" not in obs else "type_error.dict")
+            try:
+                timestamp = _float(timestamp)
+            except (TypeError, ValueError):
+                fail(["observations", i, "timestamp"],
+                     "field required" if "timestamp" not in obs else "value is not a valid float",
+                     "value_error.missing" if "timestamp" not in obs else "type_error.float")
+            observations.append({"source": source, "content": content, "timestamp": timestamp})
+
+    action_plan = data.get("action_plan")
+    if "action_plan" not in data:
+        fail(["action_plan"], "field required", "value_error.missing")
+    elif not isinstance(action_plan, dict):
+        fail(["action_plan"], "value is not a valid dict", "type_error.dict")
+
+    dry_run = False
+    if "dry_run" in data:
+        try:
+            dry_run = _bool(data["dry_run"])
+        except TypeError:
+            fail(["dry_run"], "value could not be parsed to a boolean", "type_error.bool")
+
+    # Optional client pre-hash: the record timestamp and the hash it expects
+    timestamp = data.get("timestamp")
+    if timestamp is not None:
+        try:
+            timestamp = _float(timestamp)
+        except (TypeError, ValueError):
+            fail(["timestamp"], "value is not a valid float", "type_error.float")
+    optional = {}
+    for field in ("decision_hash", "idempotency_key"):
+        value = data.get(field)
+        if value is not None and not isinstance(value, str):
+            fail([field], "str type expected", "type_error.str")
+        optional[field] = value
+
+    return {
+        "objective_id": objective_id,
+        "obs_dicts": observations,
+        "action_plan": action_plan,
+        "dry_run": dry_run,
+        "timestamp": timestamp,
+        "decision_hash": optional["decision_hash"],
+        "idempotency_key": optional["idempotency_key"],
+    }
+
+
+def _load_body(body: bytes) -> Any:
+    try:
+        return loads(body)
+    except ValueError as e:
+        raise RequestValidationError([{"loc": ["body"], "msg": f"Invalid JSON: {e}", "type": "value_error.jsondecode"}])
+
+
+def parse_decision_request(body: bytes) -> Dict[str, Any]:
+    """
+    Parse and validate a /log body. Returns _log_decision keyword arguments,
+    with observations (obs_dicts) shaped like ObservationData.model_dump().
+    idempotency_key is only set for bulk items; /log takes it from the header.
+    """
+    errors: List[Dict[str, Any]] = []
+    fields = _check_decision(_load_body(body), ["body"], errors)
+    if errors:
+        raise RequestValidationError(errors)
+    return fields
+
+
+def parse_batch_request(body: bytes, max_items: int) -> List[Dict[str, Any]]:
+    """Parse and validate a /log/batch body ({"items": [...]}); any invalid item rejects the batch."""
+    data = _load_body(body)
+    items = data.get("items") if isinstance(data, dict) else None
+    if not isinstance(items, list):
+        raise RequestValidationError([{"loc": ["body", "items"], "msg": "value is not a valid list", "type": "type_error.list"}])
+    if len(items) > max_items:
+        raise RequestValidationError([{"loc": ["body", "items"], "msg": f"at most {max_items} items per batch",
+                                       "type": "value_error.list.max_items"}])
+    errors: List[Dict[str, Any]] = []
+    parsed = [_check_decision(item, ["body", "items", i], errors) for i, item in enumerate(items)]
+    if errors:
+        raise RequestValidationError(errors)
+    return parsed
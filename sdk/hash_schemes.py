@@ -0,0 +1,81 @@
+"""
+Versioned hash schemes for Proof of Decision.
+
+Every scheme yields a 32-byte digest, so hashes keep their 64-hex-char form
+and fit the on-chain [u8; 32] / string layouts unchanged. The scheme name is
+stored in each DecisionRecord (omitted for the default, which keeps legacy
+SHA-256 records byte-identical) and its code in v3 memos, so verifiers pick
+the algorithm from the data instead of assuming SHA-256.
+
+Anchor discriminators are fixed by the framework and stay SHA-256.
+"""
+import hashlib
+from dataclasses import dataclass
+from typing import Callable, Dict, Union
+
+SHA256 = "sha256"
+BLAKE2B_256 = "blake2b-256"
+BLAKE3 = "blake3"
+
+DEFAULT_SCHEME = SHA256
+DIGEST_BYTES = 32
+
+
+@dataclass(frozen=True)
+class HashScheme:
+    name: str
+    code: int                   # one byte, used in binary (memo) encodings
+    new: Callable[[], "hashlib._Hash"]
+
+
+def _blake3():
+    try:
+        from blake3 import blake3
+    except ImportError:
+        raise ValueError("The blake3 hash scheme requires the 'blake3' package")
+    return blake3()
+
+
+_SCHEMES: Dict[str, HashScheme] = {}
+_BY_CODE: Dict[int, HashScheme] = {}
+
+
+def register_scheme(scheme: HashScheme) -> None:
+    existing = _BY_CODE.get(scheme.code)
+    if existing is not None and existing.name != scheme.name:
+        raise ValueError(f"Scheme code {scheme.code} already used by {existing.name}")
+    _SCHEMES[scheme.name] = scheme
+    _BY_CODE[scheme.code] = scheme
+
+
+register_scheme(HashScheme(SHA256, 0, hashlib.sha256))
+register_scheme(HashScheme(BLAKE2B_256, 1, lambda: hashlib.blake2b(digest_size=DIGEST_BYTES)))
+register_scheme(HashScheme(BLAKE3, 2, _blake3))
+
+
+def get_scheme(scheme: Union[str, int]) -> HashScheme:
+    """Look up a scheme by name or memo code."""
+    found = _BY_CODE.get(scheme) if isinstance(scheme, int) else _SCHEMES.get(scheme)
+    if found is None:
+        raise ValueError(f"Unknown hash scheme: {scheme!r}")
+    return found
+
+
+def hash_hex(data: bytes, scheme: str = DEFAULT_SCHEME) -> str:
+    if scheme == SHA256:
+        return hashlib.sha256(data).hexdigest()
+    h = get_scheme(scheme).new()
+    h.update(data)
+    return h.hexdigest()
+
+
+def available_schemes() -> Dict[str, bool]:
+    """Scheme name -> whether it can run in this environment."""
+    result = {}
+    for name, scheme in _SCHEMES.items():
+        try:
+            scheme.new()
+            result[name] = True
+        except ValueError:
+            result[name] = False
+    return result
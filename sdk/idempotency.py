@@ -0,0 +1,131 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+def content_key(agent_id: str, objective_id: str, observations: Any, action_plan: Dict[str, Any],
+                dry_run: bool = False) -> str:
+    """
+    Dedup key for a decision request. The decision hash itself embeds the
+    decide() timestamp, so retries are matched on the canonical request content.
+    """
+    payload = json.dumps(
+        {
+            "agent_id": agent_id,
+            "objective_id": objective_id,
+            "observations": observations,
+            "action_plan": action_plan,
+            "dry_run": dry_run,
+        },
+        sort_keys=True,
+        separators=(',', ':'),
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def body_hash(body: Dict[str, Any]) -> str:
+    """Digest of a request body, stored with its key so reusing the key for another body is caught."""
+    payload = json.dumps(body, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class IdempotencyKeyReused(ValueError):
+    """The key was already used for a request with a different body."""
+
+
+class _Entry:
+    __slots__ = ("done", "result", "expires_at", "fingerprint")
+
+    def __init__(self, expires_at: float, fingerprint: Optional[str]):
+        self.done = threading.Event()
+        self.result = None
+        self.expires_at = expires_at
+        self.fingerprint = fingerprint
+
+
+class IdempotencyStore:
+    """
+    Bounded, TTL-expiring record of in-flight and completed requests.
+
+    The first caller for a key owns it and must call complete() or fail().
+    Concurrent callers with the same key wait for the owner's result instead
+    of sending a second transaction. Never holds more than max_entries keys:
+    completed entries are evicted oldest first, and while every entry is in
+    flight new keys wait for room.
+    """
+    def __init__(self, max_entries: int = 100_000, ttl: float = 3600.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._room = threading.Condition(self._lock)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _evict(self, now: float) -> None:
+        # Entries are in insertion order with a common TTL, so the oldest sit at the front.
+        # Over capacity, completed entries are dropped; in-flight ones are skipped, never evicted early.
+        excess = len(self._entries) - self.max_entries + 1   # leave room for one new key
+        victims = []
+        for key, entry in self._entries.items():
+            if entry.expires_at <= now:
+                victims.append(key)
+                excess -= 1
+            elif excess <= 0:
+                break
+            elif entry.done.is_set():
+                victims.append(key)
+                excess -= 1
+        for key in victims:
+            del self._entries[key]
+
+    def begin(self, key: str, wait: float = 30.0, fingerprint: Optional[str] = None) -> Tuple[bool, Optional[Any]]:
+        """
+        Returns (True, None) if the caller owns the key and should do the work,
+        or (False, result) with the original result for a duplicate.
+        With a fingerprint (see body_hash), raises IdempotencyKeyReused when the
+        key was first used with a different one.
+        """
+        deadline = time.monotonic() + wait
+        with self._room:
+            while True:
+                now = time.monotonic()
+                entry = self._entries.get(key)
+                if entry is not None and entry.expires_at > now:
+                    break
+                self._evict(now)
+                if len(self._entries) < self.max_entries:
+                    self._entries[key] = _Entry(now + self.ttl, fingerprint)
+                    self._entries.move_to_end(key)
+                    return True, None
+                if not self._room.wait(deadline - now) or time.monotonic() >= deadline:
+                    raise TimeoutError(f"Idempotency store full: {len(self._entries)} requests in flight")
+
+        if fingerprint is not None and entry.fingerprint is not None and fingerprint != entry.fingerprint:
+            raise IdempotencyKeyReused(f"Key {key[:16]} was already used with a different request body")
+        if not entry.done.wait(max(deadline - time.monotonic(), 0)):
+            raise TimeoutError(f"Original request for key {key[:16]} is still in flight")
+        if entry.result is None:
+            # The original failed and released the key; let this caller retry it.
+            return self.begin(key, max(deadline - time.monotonic(), 0), fingerprint)
+        return False, entry.result
+
+    def complete(self, key: str, result: Any) -> None:
+        with self._room:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.result = result
+                entry.done.set()
+            self._room.notify()   # a completed entry can now be evicted
+
+    def fail(self, key: str) -> None:
+        """Release a key whose request failed, so a retry can run it again."""
+        with self._room:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                entry.done.set()
+            self._room.notify()
@@ -4,11 +4,161 @@ from solders.pubkey import Pubkey
 from solders.instruction import Instruction, AccountMeta
 from solders.system_program import ID as SYS_PROGRAM_ID
 from solders.keypair import Keypair
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
 import json
 import base64
+import logging
+import re
+import struct
+import threading
+
+from .hash_schemes import DEFAULT_SCHEME, get_scheme
+
+logger = logging.getLogger(__name__)
 
 MEMO_PROGRAM_ID = Pubkey.from_string("MemoSq4gqABAXKb96qnH8TysNcWxMyWCqXgDLGmfcQb")
 
+# Batched memo format (v2):
+#   "LOGOS:v2:" + base64(payload)
+#   payload = [n_objectives: u8] ([len: u8] [objective_id utf-8])*
+#             [n_entries: u16 LE] ([objective_index: u8] [decision_hash: 32 bytes])*
+# Objective ids are interned once per memo, so each extra decision costs 33 bytes.
+#
+# v3 is v2 for hashes made with a non-default scheme (sdk.hash_schemes):
+#   "LOGOS:v3:" + base64([hash_scheme code: u8] + v2 payload)
+# v1 and v2 memos always carry SHA-256 hashes.
+MEMO_V1_PREFIX = "LOGOS:v1:"
+MEMO_V2_PREFIX = "LOGOS:v2:"
+MEMO_V3_PREFIX = "LOGOS:v3:"
+HASH_BYTES = 32
+MAX_OBJECTIVE_BYTES = 255
+MAX_OBJECTIVES_PER_MEMO = 255
+# A single-signer memo transaction has ~170 bytes of fixed overhead out of the
+# 1232-byte packet limit; keep the memo comfortably below what remains.
+MAX_MEMO_BYTES = 1000
+
+
+def _base64_len(n: int) -> int:
+    return 4 * ((n + 2) // 3)
+
+
+def encode_batch_memo(entries: List[Tuple[str, str]], hash_scheme: str = DEFAULT_SCHEME) -> str:
+    """
+    Pack (objective_id, decision_hash) pairs into a single v2 memo payload,
+    or v3 when the hashes were made with a non-default hash_scheme.
+    decision_hash is the 64-char hex PoD returned by LogosAgent.decide.
+    """
+    scheme = get_scheme(hash_scheme)
+    if not entries:
+        raise ValueError("Cannot encode an empty batch")
+
+    objectives: List[bytes] = []
+    index = {}
+    body = bytearray()
+    for objective_id, decision_hash in entries:
+        if objective_id not in index:
+            obj_bytes = objective_id.encode("utf-8")
+            if len(obj_bytes) > MAX_OBJECTIVE_BYTES:
+                raise ValueError(f"objective_id too long for batch memo: {objective_id!r}")
+            if len(objectives) == MAX_OBJECTIVES_PER_MEMO:
+                raise ValueError("Too many distinct objectives in one batch memo")
+            index[objective_id] = len(objectives)
+            objectives.append(obj_bytes)
+        hash_bytes = bytes.fromhex(decision_hash)
+        if len(hash_bytes) != HASH_BYTES:
+            raise ValueError(f"Decision hash must be {HASH_BYTES} bytes: {decision_hash!r}")
+        body.append(index[objective_id])
+        body += hash_bytes
+
+    payload = bytearray([len(objectives)])
+    for obj_bytes in objectives:
+        payload.append(len(obj_bytes))
+        payload += obj_bytes
+    payload += struct.pack("<H", len(entries))
+    payload += body
+    if scheme.name == DEFAULT_SCHEME:
+        return MEMO_V2_PREFIX + base64.b64encode(bytes(payload)).decode("ascii")
+    return MEMO_V3_PREFIX + base64.b64encode(bytes([scheme.code]) + bytes(payload)).decode("ascii")
+
+
+def decode_memo(memo: str) -> List[Tuple[str, str]]:
+    """
+    Expand a Logos memo (v1, v2 or v3) back into (objective_id, decision_hash) pairs.
+    """
+    return decode_memo_with_scheme(memo)[1]
+
+
+def decode_memo_with_scheme(memo: str) -> Tuple[str, List[Tuple[str, str]]]:
+    """Like decode_memo, but also returns the hash scheme name the hashes were made with."""
+    if memo.startswith(MEMO_V1_PREFIX):
+        objective_id, _, decision_hash = memo[len(MEMO_V1_PREFIX):].rpartition(":")
+        if not objective_id:
+            raise ValueError(f"Malformed v1 memo: {memo!r}")
+        return DEFAULT_SCHEME, [(objective_id, decision_hash)]
+
+    if memo.startswith(MEMO_V2_PREFIX):
+        payload = base64.b64decode(memo[len(MEMO_V2_PREFIX):], validate=True)
+        return DEFAULT_SCHEME, _decode_batch_payload(payload)
+
+    if memo.startswith(MEMO_V3_PREFIX):
+        payload = base64.b64decode(memo[len(MEMO_V3_PREFIX):], validate=True)
+        if not payload:
+            raise ValueError("Malformed v3 memo: empty payload")
+        return get_scheme(payload[0]).name, _decode_batch_payload(payload[1:])
+
+    raise ValueError(f"Not a Logos memo: {memo[:32]!r}")
+
+
+def _decode_batch_payload(payload: bytes) -> List[Tuple[str, str]]:
+    try:
+        offset = 0
+        n_objectives = payload[offset]
+        offset += 1
+        objectives = []
+        for _ in range(n_objectives):
+            length = payload[offset]
+            offset += 1
+            objectives.append(payload[offset:offset + length].decode("utf-8"))
+            offset += length
+        (n_entries,) = struct.unpack_from("<H", payload, offset)
+        offset += 2
+        if len(payload) != offset + n_entries * (1 + HASH_BYTES):
+            raise ValueError("Batch memo length does not match entry count")
+        decisions = []
+        for _ in range(n_entries):
+            objective_id = objectives[payload[offset]]
+            decisions.append((objective_id, payload[offset + 1:offset + 1 + HASH_BYTES].hex()))
+            offset += 1 + HASH_BYTES
+    except (IndexError, struct.error) as e:
+        raise ValueError(f"Malformed batch memo: {e}")
+    return decisions
+
+
+_MEMO_FIELD_ITEM = re.compile(rb"\[(\d+)\] ")
+
+
+def parse_memo_field(field: Optional[str]) -> List[str]:
+    """
+    Split the `memo` field of getSignaturesForAddress results, which joins
+    every memo of a transaction as "[byte length] text; [byte length] text".
+    """
+    if not field:
+        return []
+    raw = field.encode("utf-8")
+    memos = []
+    pos = 0
+    while pos < len(raw):
+        match = _MEMO_FIELD_ITEM.match(raw, pos)
+        if match is None:
+            break
+        start = match.end()
+        end = start + int(match.group(1))
+        memos.append(raw[start:end].decode("utf-8", "replace"))
+        pos = end + 2   # "; "
+    return memos
+
+
 class MemoAdapter:
     def __init__(self, rpc_url: str, keypair_path: str):
         self.client = Client(rpc_url)
@@ -16,14 +166,25 @@ class MemoAdapter:
             secret = json.load(f)
         self.payer = Keypair.from_bytes(bytes(secret))
 
-    def log_decision(self, objective_id: str, decision_hash: str) -> str:
+    def log_decision(self, objective_id: str, decision_hash: str, hash_scheme: str = DEFAULT_SCHEME) -> str:
         """
         Log a decision hash to the Solana Devnet using the Memo Program.
         Payload Format: "LOGOS:v1:{objective_id}:{decision_hash}"
+        (a one-entry v3 memo for hashes made with a non-default hash_scheme)
         """
         
         # 1. Create Memo Payload
-        payload = f"LOGOS:v1:{objective_id}:{decision_hash}"
+        if hash_scheme != DEFAULT_SCHEME:
+            payload = encode_batch_memo([(objective_id, decision_hash)], hash_scheme)
+        else:
+            payload = f"{MEMO_V1_PREFIX}{objective_id}:{decision_hash}"
+        return self.send_memo(payload)
+
+    def sign_memo(self, payload: str) -> Tuple[Transaction, int]:
+        """
+        Build and sign a transaction carrying one memo.
+        Returns it with the last block height at which it can still land.
+        """
         memo_bytes = payload.encode("utf-8")
         
         # 2. Build Memo Instruction
@@ -35,22 +196,198 @@ class MemoAdapter:
             data=memo_bytes
         )
         
-        # 3. Create Transaction
-        recent_blockhash = self.client.get_latest_blockhash().value.blockhash
-        tx = Transaction(recent_blockhash=recent_blockhash, fee_payer=self.payer.pubkey())
+        # 3. Create and sign the Transaction
+        latest = self.client.get_latest_blockhash().value
+        tx = Transaction(recent_blockhash=latest.blockhash, fee_payer=self.payer.pubkey())
         tx.add(memo_ix)
         tx.sign(self.payer)
-        
-        # 4. Send Transaction
+        return tx, latest.last_valid_block_height
+
+    def send_memo(self, payload: str) -> Optional[str]:
+        """Send a raw memo string in its own transaction. Returns the signature or None."""
+        # 4. Send it as signed (send_transaction would re-sign with a new blockhash)
         try:
-            result = self.client.send_transaction(tx, self.payer)
+            tx, _ = self.sign_memo(payload)
+            result = self.client.send_raw_transaction(tx.serialize())
             return str(result.value)
         except Exception as e:
-            print(f"Error sending transaction: {e}")
+            logger.warning("Error sending transaction: %s", e)
             return None
 
+
+@dataclass
+class UnsentBatch:
+    """A batch whose send failed. Its signed transaction is kept so a retry cannot log it twice."""
+    entries: List[Tuple[str, str]]
+    transaction: Optional[Transaction] = None
+    last_valid_block_height: int = 0
+    attempts: int = 0
+
+    @property
+    def signature(self) -> Optional[str]:
+        return str(self.transaction.signature()) if self.transaction is not None else None
+
+
+class BatchedMemoAdapter(MemoAdapter):
+    """
+    Coalesces decisions into v2 batch memos (v3 for a non-default hash_scheme).
+    A batch is flushed when the next decision would not fit in max_memo_bytes,
+    or max_delay seconds after the first pending decision was queued.
+
+    A batch whose send fails stays in `unsent`, and the timer keeps retrying
+    it. A failed send may still have reached the cluster, so a retry checks
+    the signature's status. While the blockhash is still valid it resends the
+    same signed transaction. Only once that transaction can no longer land is
+    it re-signed. After max_retries retries the batch moves to `failed`.
+    """
+    def __init__(self, rpc_url: str, keypair_path: str, max_delay: float = 2.0,
+                 max_memo_bytes: int = MAX_MEMO_BYTES, hash_scheme: str = DEFAULT_SCHEME,
+                 max_retries: int = 3):
+        super().__init__(rpc_url, keypair_path)
+        self.hash_scheme = get_scheme(hash_scheme).name
+        self.max_delay = max_delay
+        self.max_memo_bytes = max_memo_bytes
+        self.max_retries = max_retries
+        self.pending: List[Tuple[str, str]] = []
+        self.unsent: List[UnsentBatch] = []
+        self.failed: List[UnsentBatch] = []
+        self._objectives = set()
+        self._payload_bytes = 0
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+
+    def _payload_size_with(self, objective_id: str) -> int:
+        # Binary payload size if one more decision were appended.
+        size = self._payload_bytes or 3  # n_objectives (u8) + n_entries (u16)
+        size += 1 + HASH_BYTES
+        if objective_id not in self._objectives:
+            size += 1 + len(objective_id.encode("utf-8"))
+        return size
+
+    def _fits(self, objective_id: str) -> bool:
+        if objective_id not in self._objectives and len(self._objectives) == MAX_OBJECTIVES_PER_MEMO:
+            return False
+        if self.hash_scheme == DEFAULT_SCHEME:
+            memo_len = len(MEMO_V2_PREFIX) + _base64_len(self._payload_size_with(objective_id))
+        else:
+            memo_len = len(MEMO_V3_PREFIX) + _base64_len(1 + self._payload_size_with(objective_id))
+        return memo_len <= self.max_memo_bytes
+
+    def _arm_timer_locked(self) -> None:
+        if self._timer is None and self.max_delay > 0:
+            self._timer = threading.Timer(self.max_delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _take_pending_locked(self) -> List[Tuple[str, str]]:
+        batch = self.pending
+        self.pending = []
+        self._objectives = set()
+        self._payload_bytes = 0
+        return batch
+
+    def log_decision(self, objective_id: str, decision_hash: str, hash_scheme: Optional[str] = None) -> Optional[str]:
+        """
+        Queue a decision for the next batch memo. Every decision in a batch
+        shares the adapter's hash_scheme.
+        Returns the signature of a batch if this call forced a flush, otherwise None.
+        """
+        if hash_scheme is not None and get_scheme(hash_scheme).name != self.hash_scheme:
+            raise ValueError(f"Adapter batches {self.hash_scheme} hashes, got {hash_scheme}")
+        # Validate eagerly so a bad entry is rejected here, not at flush time.
+        encode_batch_memo([(objective_id, decision_hash)], self.hash_scheme)
+
+        full = None
+        with self._lock:
+            if self.pending and not self._fits(objective_id):
+                full = self._take_pending_locked()
+            if not self._fits(objective_id):
+                raise ValueError(f"Decision does not fit in a memo: {objective_id!r}")
+
+            self._payload_bytes = self._payload_size_with(objective_id)
+            self._objectives.add(objective_id)
+            self.pending.append((objective_id, decision_hash))
+            self._arm_timer_locked()
+        # The full batch is sent outside the lock so other callers keep queueing meanwhile
+        return self._send_batch(UnsentBatch(full)) if full else None
+
+    def flush(self) -> Optional[str]:
+        """
+        Send all pending decisions as one memo, after retrying any batches
+        left unsent by earlier failures. Returns the signature of the pending
+        batch, or None if there was nothing pending or its send failed.
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            batches, self.unsent = self.unsent, []
+            pending = self._take_pending_locked()
+        signature = None
+        for batch in batches:
+            self._send_batch(batch)
+        if pending:
+            signature = self._send_batch(UnsentBatch(pending))
+        return signature
+
+    def _already_sent(self, batch: UnsentBatch) -> bool:
+        """
+        For a retry: True if the batch's transaction landed. Drops a transaction
+        that failed or can no longer land, so the batch is signed afresh.
+        """
+        if batch.transaction is None:
+            return False
+        status = self.client.get_signature_statuses([batch.transaction.signature()]).value[0]
+        if status is not None:
+            if status.err is None:
+                return True
+            batch.transaction = None
+        elif self.client.get_block_height().value > batch.last_valid_block_height:
+            batch.transaction = None
+        return False
+
+    def _send_batch(self, batch: UnsentBatch) -> Optional[str]:
+        batch.attempts += 1
+        try:
+            if self._already_sent(batch):
+                logger.info("Batch of %d decisions already landed -> %s", len(batch.entries), batch.signature)
+                return batch.signature
+            if batch.transaction is None:
+                batch.transaction, batch.last_valid_block_height = self.sign_memo(
+                    encode_batch_memo(batch.entries, self.hash_scheme))
+            self.client.send_raw_transaction(batch.transaction.serialize())
+        except Exception as e:
+            with self._lock:
+                if batch.attempts > self.max_retries:
+                    self.failed.append(batch)
+                else:
+                    self.unsent.append(batch)
+                    self._arm_timer_locked()
+            if batch.attempts > self.max_retries:
+                logger.error("Giving up on %d decisions after %d attempts (last signature %s): %s",
+                             len(batch.entries), batch.attempts, batch.signature, e)
+            else:
+                logger.warning("Flush of %d decisions failed; kept for retry: %s", len(batch.entries), e)
+            return None
+        logger.debug("Flushed %d decisions -> %s", len(batch.entries), batch.signature)
+        return batch.signature
+
+    def close(self) -> Optional[str]:
+        """
+        Flush anything still pending. Call before the process exits; batches
+        still in `unsent` or in `failed` afterwards may not have been logged.
+        """
+        signature = self.flush()
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        return signature
+
+
 if __name__ == "__main__":
-    # Test
+    # Devnet smoke test. Run as a module (the relative imports need the package):
+    #   python -m sdk.memo_adapter
     adapter = MemoAdapter("https://api.devnet.solana.com", "./id.json")
     sig = adapter.log_decision("TEST-OBJ-001", "e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855")
     print(f"✅ Logged to Devnet! Signature: {sig}")
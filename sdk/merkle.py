@@ -0,0 +1,271 @@
+"""
+Structured (Merkle) observation hashing.
+
+An observation is hashed as a tree that mirrors its JSON structure. Each dict
+or list node commits to its children through a binary Merkle tree over
+(key, child_hash) entries, so:
+  - re-hashing a snapshot where one field changed only rehashes that field's
+    path to the root (MerkleHasher reuses cached subtrees), and
+  - a single field can be proven to an auditor with O(depth * log width)
+    hashes, without revealing the rest of the snapshot. prove() works on any
+    observation, e.g. one read back from an ObservationStore.
+
+Domain-separation prefixes keep leaf, entry, inner and node hashes distinct.
+Arrays are leaves (committed by their sdk.arrays descriptor), and so are
+descriptor dicts decoded from stored JSON, so a stored observation hashes
+to the same root as the original. Every node is SHA-256, whatever the
+agent's hash_scheme; LogosAgent refuses the combination.
+"""
+import hashlib
+import json
+import struct
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from .arrays import encode_array_value, is_encoded_array
+from .hash_schemes import SHA256
+
+LEAF = b"\x00"
+ENTRY = b"\x01"
+INNER = b"\x02"
+DICT_NODE = b"\x03"
+LIST_NODE = b"\x04"
+EMPTY_ROOT = bytes(32)
+
+PathKey = Union[str, int]
+
+
+def _sha256(*parts: bytes) -> bytes:
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(part)
+    return h.digest()
+
+
+def leaf_hash(value: Any) -> bytes:
+    return _sha256(LEAF, json.dumps(value, sort_keys=True, default=encode_array_value).encode('utf-8'))
+
+
+def entry_hash(key: PathKey, child: bytes) -> bytes:
+    key_bytes = str(key).encode('utf-8')
+    return _sha256(ENTRY, struct.pack("<I", len(key_bytes)), key_bytes, child)
+
+
+def _levels(leaves: List[bytes]) -> List[List[bytes]]:
+    """Binary Merkle levels, bottom-up. An unpaired last node is promoted unchanged."""
+    levels = [leaves]
+    while len(levels[-1]) > 1:
+        prev = levels[-1]
+        nxt = [_sha256(INNER, prev[i], prev[i + 1]) for i in range(0, len(prev) - 1, 2)]
+        if len(prev) % 2:
+            nxt.append(prev[-1])
+        levels.append(nxt)
+    return levels
+
+
+def _node_hash(kind: bytes, count: int, root: bytes) -> bytes:
+    return _sha256(kind, struct.pack("<I", count), root)
+
+
+class _Node:
+    __slots__ = ("kind", "value", "hash", "children", "keys", "entries")
+
+    def __init__(self, kind: bytes, hash_: bytes, value: Any = None,
+                 children: Any = None, keys: Optional[List[PathKey]] = None,
+                 entries: Optional[List[bytes]] = None):
+        self.kind = kind
+        self.hash = hash_
+        self.value = value
+        self.children = children
+        self.keys = keys
+        self.entries = entries
+
+
+_SCALARS = (str, int, float, bool, type(None))
+
+
+def _float_key(value: float) -> bytes:
+    # 0.0 == -0.0 but they encode differently, so floats are compared bitwise
+    return struct.pack("<d", value)
+
+
+def _scalar_snapshot(items: List[Any]) -> Optional[Tuple[tuple, tuple]]:
+    """
+    (values, types) for a container of scalars, else None. Lets an unchanged
+    price vector or flat dict be recognised with C-level comparisons instead
+    of one _build call per element. Types are kept because 1, 1.0 and True
+    compare equal but hash differently; floats are kept as their IEEE bytes.
+    """
+    values = tuple(items)
+    types = tuple(map(type, values))
+    kinds = set(types)
+    if not all(t in _SCALARS for t in kinds):
+        return None
+    if kinds == {float}:
+        values = (struct.pack(f"<{len(values)}d", *values),)
+    elif float in kinds:
+        values = tuple(_float_key(v) if t is float else v for v, t in zip(values, types))
+    return values, types
+
+
+def _same_scalar(a: Any, b: Any) -> bool:
+    if type(a) is not type(b) or type(a) not in _SCALARS:
+        return False
+    if type(a) is float:
+        return _float_key(a) == _float_key(b)
+    return a == b
+
+
+def _build(value: Any, cached: Optional[_Node]) -> _Node:
+    """Build the node for value, reusing cached subtrees whose content is unchanged."""
+    # Array descriptors read back from JSON stay leaves, hashing like the arrays they encode
+    if isinstance(value, dict) and not is_encoded_array(value):
+        if cached is not None and cached.kind == DICT_NODE and cached.value is not None:
+            keys = sorted(value)
+            if keys == cached.keys and _scalar_snapshot([value[k] for k in keys]) == cached.value:
+                return cached
+        old = cached.children if cached is not None and cached.kind == DICT_NODE else {}
+        keys = sorted(value)
+        children = {k: _build(value[k], old.get(k)) for k in keys}
+        if cached is not None and cached.kind == DICT_NODE and cached.keys == keys and all(
+            children[k] is old[k] for k in keys
+        ):
+            return cached
+        entries = [entry_hash(k, children[k].hash) for k in keys]
+        root = _levels(entries)[-1][0] if entries else EMPTY_ROOT
+        return _Node(DICT_NODE, _node_hash(DICT_NODE, len(keys), root),
+                     value=_scalar_snapshot([value[k] for k in keys]),
+                     children=children, keys=keys, entries=entries)
+
+    if isinstance(value, (list, tuple)):
+        if cached is not None and cached.kind == LIST_NODE and cached.value is not None \
+                and _scalar_snapshot(value) == cached.value:
+            return cached
+        old = cached.children if cached is not None and cached.kind == LIST_NODE else []
+        children = [_build(v, old[i] if i < len(old) else None) for i, v in enumerate(value)]
+        if cached is not None and cached.kind == LIST_NODE and len(old) == len(children) and all(
+            c is o for c, o in zip(children, old)
+        ):
+            return cached
+        keys = list(range(len(children)))
+        entries = [entry_hash(i, c.hash) for i, c in enumerate(children)]
+        root = _levels(entries)[-1][0] if entries else EMPTY_ROOT
+        return _Node(LIST_NODE, _node_hash(LIST_NODE, len(children), root),
+                     value=_scalar_snapshot(value),
+                     children=children, keys=keys, entries=entries)
+
+    # Scalars are immutable, so comparing against the cached value is enough.
+    # type() is compared too so that 1, 1.0 and True never share a cached hash.
+    # Arrays are leaves too, but mutable, so they are always rehashed.
+    if cached is not None and cached.kind == LEAF and _same_scalar(cached.value, value):
+        return cached
+    return _Node(LEAF, leaf_hash(value), value=value)
+
+
+def merkle_root(observation: Any) -> str:
+    """Structured observation hash (hex), without caching."""
+    return _build(observation, None).hash.hex()
+
+
+def _prove(tree: _Node, path: Sequence[PathKey]) -> Dict[str, Any]:
+    node = tree
+    steps = []
+    for key in path:
+        if node.kind == DICT_NODE:
+            if key not in node.children:
+                raise KeyError(f"Path element {key!r} not found")
+        elif node.kind == LIST_NODE:
+            if not isinstance(key, int) or not 0 <= key < len(node.children):
+                raise KeyError(f"Path element {key!r} not found")
+        else:
+            raise KeyError(f"Path element {key!r} descends into a scalar")
+        index = node.keys.index(key)
+        siblings = []
+        i = index
+        for level in _levels(node.entries)[:-1]:
+            sibling = i ^ 1
+            if sibling < len(level):
+                siblings.append(level[sibling].hex())
+            i //= 2
+        steps.append({
+            "kind": "dict" if node.kind == DICT_NODE else "list",
+            "key": key,
+            "index": index,
+            "count": len(node.keys),
+            "siblings": siblings,
+        })
+        node = node.children[key]
+
+    if node.kind != LEAF:
+        raise ValueError("Proofs are per field: path must end at a scalar value")
+    return {"value": node.value, "steps": steps}
+
+
+def prove(observation: Any, path: Sequence[PathKey]) -> Dict[str, Any]:
+    """
+    Inclusion proof for the value at path (e.g. [1, "health_factor"]) in any
+    observation, such as one fetched from an ObservationStore by its hash.
+    Returns {"value", "steps"}; pass it to verify_proof.
+    """
+    return _prove(_build(observation, None), path)
+
+
+class MerkleHasher:
+    """
+    Incremental structured hasher. Keeps the last observation's tree, so
+    hashing the next snapshot only rehashes branches whose values changed.
+    Safe to share between threads (e.g. in a ConcurrentLogosAgent): calls
+    are serialised, and each returns the hash of its own observation.
+    """
+    hash_scheme = SHA256   # the scheme LogosAgent checks observation hashers against
+
+    def __init__(self):
+        self._tree: Optional[_Node] = None
+        self._lock = threading.Lock()
+
+    def hash(self, observation: Any) -> str:
+        with self._lock:
+            self._tree = _build(observation, self._tree)
+            return self._tree.hash.hex()
+
+    __call__ = hash
+
+    def prove(self, path: Sequence[PathKey]) -> Dict[str, Any]:
+        """
+        Inclusion proof for the value at path in the last hashed observation.
+        For older observations use the module-level prove().
+        """
+        tree = self._tree
+        if tree is None:
+            raise ValueError("Nothing hashed yet")
+        return _prove(tree, path)
+
+
+def verify_proof(root_hex: str, path: Sequence[PathKey], proof: Dict[str, Any]) -> bool:
+    """Check that proof["value"] sits at path inside the observation hashed to root_hex."""
+    steps = proof["steps"]
+    if len(steps) != len(path) or any(s["key"] != k for s, k in zip(steps, path)):
+        return False
+
+    current = leaf_hash(proof["value"])
+    for step in reversed(steps):
+        count, index = step["count"], step["index"]
+        if not 0 <= index < count:
+            return False
+        h = entry_hash(step["key"], current)
+        siblings = iter(step["siblings"])
+        width = count
+        while width > 1:
+            sibling = index ^ 1
+            if sibling < width:
+                other = bytes.fromhex(next(siblings, ""))
+                if len(other) != 32:
+                    return False
+                h = _sha256(INNER, h, other) if index % 2 == 0 else _sha256(INNER, other, h)
+            index //= 2
+            width = (width + 1) // 2
+        if next(siblings, None) is not None:
+            return False
+        kind = DICT_NODE if step["kind"] == "dict" else LIST_NODE
+        current = _node_hash(kind, count, h)
+    return current.hex() == root_hex
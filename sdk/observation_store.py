@@ -0,0 +1,171 @@
+import json
+import mmap
+import os
+import tempfile
+import zlib
+from typing import Any, Callable, Dict, Optional
+
+from .arrays import recording_encoder
+from .hash_schemes import DEFAULT_SCHEME, get_scheme, hash_hex
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional; fall back to zlib
+    zstandard = None
+
+# One header byte per blob records how the rest of the file is encoded,
+# so stores written with and without zstd remain readable by both.
+# Its low nibble is the codec, its high nibble the hash scheme code the key
+# was computed with (0, SHA-256, for blobs written before schemes existed),
+# or STRUCTURED when the key is an observation_hasher's hash of the decoded
+# observation rather than a digest of the bytes.
+CODEC_RAW = 0
+CODEC_ZLIB = 1
+CODEC_ZSTD = 2
+STRUCTURED = 0xF
+
+# Below this size compression rarely pays for its header and CPU.
+MIN_COMPRESS_BYTES = 256
+
+
+class ObservationStore:
+    """
+    Content-addressed store for raw observations, keyed by observation_hash.
+
+    Blobs are the exact canonical bytes LogosAgent.decide hashes, so anyone
+    holding a blob can recompute the hash committed in a DecisionRecord.
+    Each blob records the hash scheme of its key, and get() verifies with it.
+    Array buffers are stored as blobs of their own, keyed by the digest in
+    their descriptor (see sdk.arrays), so get_array() restores the data.
+    Layout: {root}/{hash[:2]}/{hash[2:]}, one compressed file per blob.
+    """
+    def __init__(self, root: str, level: int = 3):
+        self.root = root
+        self.level = level
+        os.makedirs(root, exist_ok=True)
+        if zstandard is not None:
+            self._compressor = zstandard.ZstdCompressor(level=level)
+            self._decompressor = zstandard.ZstdDecompressor()
+
+    def _path(self, observation_hash: str) -> str:
+        if len(observation_hash) != 64:
+            raise ValueError(f"Invalid observation hash: {observation_hash!r}")
+        return os.path.join(self.root, observation_hash[:2], observation_hash[2:])
+
+    def __contains__(self, observation_hash: str) -> bool:
+        return os.path.exists(self._path(observation_hash))
+
+    def _encode(self, data: bytes, tag: int) -> bytes:
+        tag <<= 4
+        if len(data) < MIN_COMPRESS_BYTES:
+            return bytes([CODEC_RAW | tag]) + data
+        if zstandard is not None:
+            return bytes([CODEC_ZSTD | tag]) + self._compressor.compress(data)
+        return bytes([CODEC_ZLIB | tag]) + zlib.compress(data, self.level)
+
+    def _decode(self, blob) -> bytes:
+        codec, body = blob[0] & 0x0F, blob[1:]
+        if codec == CODEC_RAW:
+            return bytes(body)
+        if codec == CODEC_ZLIB:
+            return zlib.decompress(body)
+        if codec == CODEC_ZSTD:
+            if zstandard is None:
+                raise RuntimeError("Blob is zstd-compressed but the zstandard package is not installed")
+            return self._decompressor.decompress(body)
+        raise ValueError(f"Unknown blob codec: {codec}")
+
+    def put(self, observation_hash: str, data: bytes, hash_scheme: Optional[str] = DEFAULT_SCHEME) -> bool:
+        """
+        Store canonical observation bytes under their hash, computed with
+        hash_scheme; None marks a structured hash (see put_observation).
+        Returns False without writing if the observation is already stored.
+        """
+        tag = STRUCTURED if hash_scheme is None else get_scheme(hash_scheme).code
+        path = self._path(observation_hash)
+        if os.path.exists(path):
+            return False
+
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        # Write-then-rename so concurrent writers and crashes never leave a partial blob.
+        fd, tmp_path = tempfile.mkstemp(dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(self._encode(data, tag))
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return True
+
+    def put_observation(self, observation: Any, hash_scheme: str = DEFAULT_SCHEME,
+                        observation_hash: Optional[str] = None) -> str:
+        """
+        Canonicalise, hash and store an observation the way LogosAgent.decide
+        does, along with the raw buffer of every array in it. Pass
+        observation_hash when it comes from an observation_hasher (e.g.
+        MerkleHasher); the canonical bytes are then stored under that hash.
+        """
+        if observation_hash is not None:
+            hash_scheme = DEFAULT_SCHEME   # structured hashers commit to SHA-256 array descriptors
+        buffers: Dict[str, memoryview] = {}
+        data = json.dumps(observation, sort_keys=True, default=recording_encoder(hash_scheme, buffers)).encode('utf-8')
+        # Arrays first, so a stored observation always has its data
+        for digest, buffer in buffers.items():
+            self.put(digest, buffer, hash_scheme)
+        if observation_hash is None:
+            observation_hash = hash_hex(data, hash_scheme)
+            self.put(observation_hash, data, hash_scheme)
+        else:
+            self.put(observation_hash, data, None)
+        return observation_hash
+
+    def get(self, observation_hash: str, verify: bool = True,
+            observation_hasher: Optional[Callable[[Any], str]] = None) -> Optional[bytes]:
+        """
+        Return the canonical observation bytes, or None if unknown.
+        The blob is memory-mapped and decompressed straight from the mapping.
+        Structured blobs are verified by rehashing the decoded observation with
+        observation_hasher (default: merkle.merkle_root).
+        """
+        path = self._path(observation_hash)
+        try:
+            f = open(path, "rb")
+        except FileNotFoundError:
+            return None
+        with f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                tag = view[0] >> 4
+                data = self._decode(view)
+
+        if verify:
+            if tag == STRUCTURED:
+                if observation_hasher is None:
+                    from .merkle import merkle_root as observation_hasher
+                actual = observation_hasher(json.loads(data))
+            else:
+                actual = hash_hex(data, get_scheme(tag).name)
+            if actual != observation_hash:
+                raise ValueError(f"Stored observation does not match its hash: {observation_hash}")
+        return data
+
+    def get_observation(self, observation_hash: str, verify: bool = True,
+                        observation_hasher: Optional[Callable[[Any], str]] = None) -> Any:
+        """
+        Return the decoded observation object, or None if unknown.
+        Arrays come back as their descriptors; pass one to get_array for the data.
+        """
+        data = self.get(observation_hash, verify=verify, observation_hasher=observation_hasher)
+        return json.loads(data) if data is not None else None
+
+    def get_array(self, descriptor: Dict[str, Any], verify: bool = True):
+        """The NumPy array behind an array descriptor, or None if its data is not stored. Needs numpy."""
+        import numpy as np
+
+        scheme = next(key for key in descriptor if key not in ("__array__", "dtype", "shape"))
+        data = self.get(descriptor[scheme], verify=verify)
+        if data is None:
+            return None
+        dtype = np.lib.format.descr_to_dtype(descriptor["dtype"])
+        return np.frombuffer(data, dtype=dtype).reshape(descriptor["shape"])
@@ -1,14 +1,28 @@
 import hashlib
 import struct
-from typing import List
+from dataclasses import dataclass
+from typing import List, Sequence, Tuple, Union
 # from solana.transaction import Transaction
 from solders.transaction import Transaction
-from solana.rpc.api import Client
 from solders.pubkey import Pubkey
 from solders.instruction import Instruction, AccountMeta
+from solders.message import Message
 from solders.system_program import ID as SYS_PROGRAM_ID
 from solders.sysvar import RENT, CLOCK
 
+HASH_BYTES = 32
+
+# Ring-buffer decision log (see `DecisionLog` in lib.rs)
+DECISION_LOG_CAPACITY = 128
+LOG_ENTRY_SIZE = 32 + 8 + 8             # decision_hash, objective_tag, timestamp
+DECISION_LOG_HEADER_SIZE = 8 + 32 + 8   # discriminator, agent, total
+
+# Batched log_decisions (see `DecisionBatch` in lib.rs)
+MAX_BATCH_ENTRIES = 64
+
+# Largest serialized transaction the cluster accepts (IPv6 MTU minus headers)
+MAX_TRANSACTION_BYTES = 1232
+
 def get_discriminator(namespace: str, name: str) -> bytes:
     """Calculate Anchor instruction discriminator."""
     preimage = f"{namespace}:{name}".encode("ascii")
@@ -49,32 +63,47 @@ def build_register_agent_ix(
         data=data
     )
 
-def build_log_decision_ix(
-    program_id: Pubkey,
-    authority: Pubkey,
-    decision_hash: str,
-    objective_id: str
-) -> Instruction:
-    """Build 'log_decision' instruction."""
-    
-    # PDA: seeds = [b"agent", authority]
+def find_agent_pda(program_id: Pubkey, authority: Pubkey) -> Pubkey:
+    """PDA: seeds = [b"agent", authority]"""
     agent_pda, _ = Pubkey.find_program_address(
         [b"agent", bytes(authority)],
         program_id
     )
-    
-    # PDA: seeds = [b"decision", agent_pda, objective_id]
+    return agent_pda
+
+def find_decision_pda(program_id: Pubkey, agent_pda: Pubkey, objective_id: str) -> Pubkey:
+    """PDA: seeds = [b"decision", agent_pda, objective_id]"""
     decision_pda, _ = Pubkey.find_program_address(
         [b"decision", bytes(agent_pda), objective_id.encode("utf-8")],
         program_id
     )
-    
-    accounts = [
+    return decision_pda
+
+def _log_decision_accounts(program_id: Pubkey, authority: Pubkey, objective_id: str) -> List[AccountMeta]:
+    agent_pda = find_agent_pda(program_id, authority)
+    decision_pda = find_decision_pda(program_id, agent_pda, objective_id)
+    return [
         AccountMeta(pubkey=decision_pda, is_signer=False, is_writable=True),
         AccountMeta(pubkey=agent_pda, is_signer=False, is_writable=True), # mut, has_one=authority
         AccountMeta(pubkey=authority, is_signer=True, is_writable=True),
         AccountMeta(pubkey=SYS_PROGRAM_ID, is_signer=False, is_writable=False),
     ]
+
+def hash_to_bytes(decision_hash: Union[str, bytes]) -> bytes:
+    """Normalise a PoD hash (64-char hex or raw bytes) to its 32 raw bytes."""
+    raw = bytes.fromhex(decision_hash) if isinstance(decision_hash, str) else bytes(decision_hash)
+    if len(raw) != HASH_BYTES:
+        raise ValueError(f"Decision hash must be {HASH_BYTES} bytes, got {len(raw)}")
+    return raw
+
+def build_log_decision_ix(
+    program_id: Pubkey,
+    authority: Pubkey,
+    decision_hash: str,
+    objective_id: str
+) -> Instruction:
+    """Build 'log_decision' instruction."""
+    accounts = _log_decision_accounts(program_id, authority, objective_id)
     
     # Data
     discriminator = get_discriminator("global", "log_decision")
@@ -94,3 +123,301 @@ def build_log_decision_ix(
         accounts=accounts,
         data=data
     )
+
+def build_log_decision_compact_ix(
+    program_id: Pubkey,
+    authority: Pubkey,
+    decision_hash: Union[str, bytes],
+    objective_id: str
+) -> Instruction:
+    """
+    Build 'log_decision_compact' instruction.
+    Same accounts as 'log_decision', but the hash travels as raw [u8; 32]
+    instead of a 64-byte hex string.
+    """
+    accounts = _log_decision_accounts(program_id, authority, objective_id)
+
+    discriminator = get_discriminator("global", "log_decision_compact")
+
+    # Args: decision_hash ([u8; 32]), objective_id (String)
+    obj_bytes = objective_id.encode("utf-8")
+    data = (
+        discriminator +
+        hash_to_bytes(decision_hash) +
+        struct.pack("<I", len(obj_bytes)) + obj_bytes
+    )
+
+    return Instruction(
+        program_id=program_id,
+        accounts=accounts,
+        data=data
+    )
+
+def _read_string(data: bytes, offset: int) -> Tuple[str, int]:
+    if offset + 4 > len(data):
+        raise ValueError("Instruction data ends before string length")
+    (length,) = struct.unpack_from("<I", data, offset)
+    offset += 4
+    if offset + length > len(data):
+        raise ValueError("String length exceeds instruction data")
+    return data[offset:offset + length].decode("utf-8"), offset + length
+
+def decode_log_decision_ix_data(data: bytes) -> Tuple[str, str]:
+    """
+    Decode 'log_decision' or 'log_decision_compact' instruction data.
+    Returns (decision_hash_hex, objective_id) regardless of variant.
+    """
+    discriminator, offset = bytes(data[:8]), 8
+    if discriminator == get_discriminator("global", "log_decision"):
+        decision_hash, offset = _read_string(data, offset)
+    elif discriminator == get_discriminator("global", "log_decision_compact"):
+        if offset + HASH_BYTES > len(data):
+            raise ValueError("Instruction data ends inside the 32-byte hash")
+        decision_hash = bytes(data[offset:offset + HASH_BYTES]).hex()
+        offset += HASH_BYTES
+    else:
+        raise ValueError("Not a Logos log_decision instruction")
+    objective_id, _ = _read_string(data, offset)
+    return decision_hash, objective_id
+
+# ---------- Ring-buffer decision log ----------
+
+@dataclass
+class LogEntry:
+    sequence: int
+    decision_hash: str
+    objective_tag: str
+    timestamp: int
+
+def objective_tag(objective_id: str) -> bytes:
+    """First 8 bytes of SHA-256(objective_id), as stored in each ring-buffer entry."""
+    return hashlib.sha256(objective_id.encode("utf-8")).digest()[:8]
+
+def find_decision_log_pda(program_id: Pubkey, agent_pda: Pubkey) -> Pubkey:
+    """PDA: seeds = [b"decision_log", agent_pda]"""
+    log_pda, _ = Pubkey.find_program_address(
+        [b"decision_log", bytes(agent_pda)],
+        program_id
+    )
+    return log_pda
+
+def build_init_decision_log_ix(program_id: Pubkey, authority: Pubkey) -> Instruction:
+    """Build 'init_decision_log' instruction."""
+    agent_pda = find_agent_pda(program_id, authority)
+    accounts = [
+        AccountMeta(pubkey=find_decision_log_pda(program_id, agent_pda), is_signer=False, is_writable=True),
+        AccountMeta(pubkey=agent_pda, is_signer=False, is_writable=False),
+        AccountMeta(pubkey=authority, is_signer=True, is_writable=True),
+        AccountMeta(pubkey=SYS_PROGRAM_ID, is_signer=False, is_writable=False),
+    ]
+    return Instruction(
+        program_id=program_id,
+        accounts=accounts,
+        data=get_discriminator("global", "init_decision_log")
+    )
+
+def build_append_decision_ix(
+    program_id: Pubkey,
+    authority: Pubkey,
+    decision_hash: Union[str, bytes],
+    objective_id: str
+) -> Instruction:
+    """
+    Build 'append_decision' instruction.
+    Writes into the agent's ring buffer; no new account, so no new rent.
+    """
+    agent_pda = find_agent_pda(program_id, authority)
+    accounts = [
+        AccountMeta(pubkey=find_decision_log_pda(program_id, agent_pda), is_signer=False, is_writable=True),
+        AccountMeta(pubkey=agent_pda, is_signer=False, is_writable=False),
+        AccountMeta(pubkey=authority, is_signer=True, is_writable=False),
+    ]
+
+    # Args: decision_hash ([u8; 32]), objective_id (String)
+    obj_bytes = objective_id.encode("utf-8")
+    data = (
+        get_discriminator("global", "append_decision") +
+        hash_to_bytes(decision_hash) +
+        struct.pack("<I", len(obj_bytes)) + obj_bytes
+    )
+    return Instruction(program_id=program_id, accounts=accounts, data=data)
+
+def build_close_decision_log_ix(program_id: Pubkey, authority: Pubkey) -> Instruction:
+    """Build 'close_decision_log' instruction. Rent is returned to the authority."""
+    agent_pda = find_agent_pda(program_id, authority)
+    accounts = [
+        AccountMeta(pubkey=find_decision_log_pda(program_id, agent_pda), is_signer=False, is_writable=True),
+        AccountMeta(pubkey=agent_pda, is_signer=False, is_writable=False),
+        AccountMeta(pubkey=authority, is_signer=True, is_writable=True),
+    ]
+    return Instruction(
+        program_id=program_id,
+        accounts=accounts,
+        data=get_discriminator("global", "close_decision_log")
+    )
+
+def decode_decision_log(data: bytes) -> Tuple[Pubkey, int, List[LogEntry]]:
+    """
+    Decode a DecisionLog account.
+    Returns (agent, total, entries) with entries ordered oldest -> newest.
+    """
+    if bytes(data[:8]) != get_discriminator("account", "DecisionLog"):
+        raise ValueError("Not a DecisionLog account")
+    expected = DECISION_LOG_HEADER_SIZE + DECISION_LOG_CAPACITY * LOG_ENTRY_SIZE
+    if len(data) < expected:
+        raise ValueError(f"DecisionLog account too small: {len(data)} < {expected}")
+
+    agent = Pubkey.from_bytes(bytes(data[8:40]))
+    (total,) = struct.unpack_from("<Q", data, 40)
+
+    entries = []
+    for sequence in range(max(0, total - DECISION_LOG_CAPACITY), total):
+        offset = DECISION_LOG_HEADER_SIZE + (sequence % DECISION_LOG_CAPACITY) * LOG_ENTRY_SIZE
+        (timestamp,) = struct.unpack_from("<q", data, offset + 40)
+        entries.append(LogEntry(
+            sequence=sequence,
+            decision_hash=bytes(data[offset:offset + 32]).hex(),
+            objective_tag=bytes(data[offset + 32:offset + 40]).hex(),
+            timestamp=timestamp,
+        ))
+    return agent, total, entries
+
+# ---------- Batched decisions ----------
+
+BatchEntry = Tuple[str, Union[str, bytes]]   # (objective_id, decision_hash)
+
+def batch_leaf(objective_id: str, decision_hash: Union[str, bytes]) -> bytes:
+    """SHA-256(0x00 || u32 len || objective_id || decision_hash), as `batch_leaf` in lib.rs."""
+    obj_bytes = objective_id.encode("utf-8")
+    return hashlib.sha256(
+        b"\x00" + struct.pack("<I", len(obj_bytes)) + obj_bytes + hash_to_bytes(decision_hash)
+    ).digest()
+
+def _batch_node(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(b"\x01" + left + right).digest()
+
+def decision_batch_root(entries: Sequence[BatchEntry]) -> bytes:
+    """
+    Merkle root the program recomputes for 'log_decisions'.
+    Inner nodes are SHA-256(0x01 || left || right); an unpaired last node is promoted.
+    """
+    level = [batch_leaf(objective_id, decision_hash) for objective_id, decision_hash in entries]
+    if not level:
+        return bytes(HASH_BYTES)
+    while len(level) > 1:
+        nxt = [_batch_node(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            nxt.append(level[-1])
+        level = nxt
+    return level[0]
+
+# One step per tree level the leaf is paired on: (sibling hash, sibling is the left node)
+BatchProof = List[Tuple[bytes, bool]]
+
+def batch_proof(entries: Sequence[BatchEntry], index: int) -> BatchProof:
+    """
+    Inclusion proof for entries[index] against decision_batch_root(entries).
+    Levels where the node is the promoted unpaired one contribute no step.
+    """
+    if not 0 <= index < len(entries):
+        raise IndexError(f"Entry {index} is outside a batch of {len(entries)}")
+    level = [batch_leaf(objective_id, decision_hash) for objective_id, decision_hash in entries]
+    proof: BatchProof = []
+    while len(level) > 1:
+        sibling = index ^ 1
+        if sibling < len(level):
+            proof.append((level[sibling], sibling < index))
+        level = [_batch_node(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)] + \
+                ([level[-1]] if len(level) % 2 else [])
+        index //= 2
+    return proof
+
+def batch_root_from_proof(objective_id: str, decision_hash: Union[str, bytes], proof: BatchProof) -> bytes:
+    """The batch root implied by one entry and its proof."""
+    node = batch_leaf(objective_id, decision_hash)
+    for sibling, sibling_is_left in proof:
+        node = _batch_node(sibling, node) if sibling_is_left else _batch_node(node, sibling)
+    return node
+
+def verify_batch_inclusion(objective_id: str, decision_hash: Union[str, bytes], proof: BatchProof,
+                           batch_root: Union[str, bytes]) -> bool:
+    """
+    True if (objective_id, decision_hash) is in the batch with this root. Check
+    the root itself against the DecisionBatch account (DecisionVerifier.verify_in_batch).
+    """
+    return batch_root_from_proof(objective_id, decision_hash, proof) == hash_to_bytes(batch_root)
+
+def find_decision_batch_pda(program_id: Pubkey, agent_pda: Pubkey, batch_root: bytes) -> Pubkey:
+    """PDA: seeds = [b"decision_batch", agent_pda, batch_root]"""
+    batch_pda, _ = Pubkey.find_program_address(
+        [b"decision_batch", bytes(agent_pda), bytes(batch_root)],
+        program_id
+    )
+    return batch_pda
+
+def transaction_size(instructions: Sequence[Instruction], payer: Pubkey) -> int:
+    """Serialized size of a legacy transaction carrying these instructions, signatures included."""
+    return len(bytes(Transaction.new_unsigned(Message(list(instructions), payer))))
+
+def build_log_decisions_ix(
+    program_id: Pubkey,
+    authority: Pubkey,
+    entries: Sequence[BatchEntry],
+    reserve_bytes: int = 0
+) -> Instruction:
+    """
+    Build 'log_decisions' instruction: many (objective_id, decision_hash) pairs,
+    one DecisionBatch account and one DecisionsLogged event. Objective IDs may
+    repeat. Raises ValueError unless a transaction signed by the authority, plus
+    reserve_bytes for other instructions (compute budget: about 60), fits the
+    1232-byte limit.
+    """
+    if not entries:
+        raise ValueError("A decision batch needs at least one entry")
+    if len(entries) > MAX_BATCH_ENTRIES:
+        raise ValueError(f"A decision batch may hold at most {MAX_BATCH_ENTRIES} entries, got {len(entries)}")
+
+    batch_root = decision_batch_root(entries)
+    agent_pda = find_agent_pda(program_id, authority)
+    accounts = [
+        AccountMeta(pubkey=find_decision_batch_pda(program_id, agent_pda, batch_root), is_signer=False, is_writable=True),
+        AccountMeta(pubkey=agent_pda, is_signer=False, is_writable=False),
+        AccountMeta(pubkey=authority, is_signer=True, is_writable=True),
+        AccountMeta(pubkey=SYS_PROGRAM_ID, is_signer=False, is_writable=False),
+    ]
+
+    # Args: batch_root ([u8; 32]), entries (Vec<BatchEntry { objective_id: String, decision_hash: [u8; 32] }>)
+    parts = [get_discriminator("global", "log_decisions"), batch_root, struct.pack("<I", len(entries))]
+    for objective_id, decision_hash in entries:
+        obj_bytes = objective_id.encode("utf-8")
+        parts.append(struct.pack("<I", len(obj_bytes)) + obj_bytes + hash_to_bytes(decision_hash))
+    ix = Instruction(program_id=program_id, accounts=accounts, data=b"".join(parts))
+
+    size = transaction_size([ix], authority) + reserve_bytes
+    if size > MAX_TRANSACTION_BYTES:
+        raise ValueError(
+            f"A batch of {len(entries)} entries needs a {size}-byte transaction "
+            f"(limit {MAX_TRANSACTION_BYTES}); split it"
+        )
+    return ix
+
+def decode_log_decisions_ix_data(data: bytes) -> Tuple[str, List[Tuple[str, str]]]:
+    """
+    Decode 'log_decisions' instruction data.
+    Returns (batch_root_hex, [(objective_id, decision_hash_hex), ...]).
+    """
+    if bytes(data[:8]) != get_discriminator("global", "log_decisions"):
+        raise ValueError("Not a Logos log_decisions instruction")
+    if len(data) < 44:
+        raise ValueError("Instruction data ends before the entry count")
+    batch_root = bytes(data[8:40]).hex()
+    (count,) = struct.unpack_from("<I", data, 40)
+    offset = 44
+    entries = []
+    for _ in range(count):
+        objective_id, offset = _read_string(data, offset)
+        if offset + HASH_BYTES > len(data):
+            raise ValueError("Entry hash exceeds instruction data")
+        entries.append((objective_id, bytes(data[offset:offset + HASH_BYTES]).hex()))
+        offset += HASH_BYTES
+    return batch_root, entries
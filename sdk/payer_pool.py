@@ -0,0 +1,331 @@
+import hashlib
+import json
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+from solana.rpc.api import Client
+from solana.rpc.core import RPCException, TransactionExpiredBlockheightExceededError, UnconfirmedTxError
+from solana.rpc.types import TxOpts
+from solders.keypair import Keypair
+from solders.message import Message
+from solders.pubkey import Pubkey
+from solders.signature import Signature
+from solders.transaction import Transaction
+from solders.transaction_status import TransactionConfirmationStatus
+
+from .event_bus import COMMITTED, CONFIRMED, EXPIRED, FAILED
+from .onchain_utils import build_log_decision_ix, build_register_agent_ix, find_agent_pda
+from .prevalidate import LocalValidator, validate_log_decision, validate_register_agent
+from .priority_fees import FeePlanner, Kind
+
+# Statuses that free a key's in-flight slot; "processed" can still be rolled back
+SETTLED = (TransactionConfirmationStatus.Confirmed, TransactionConfirmationStatus.Finalized)
+
+
+def is_expired_or_dropped(error: Exception) -> bool:
+    """
+    True if a send failed because its transaction expired or never reached the
+    cluster, so a retry with a fresh blockhash (and a higher fee) can succeed.
+    Preflight and program errors are deterministic and are not retried.
+    """
+    if isinstance(error, (TransactionExpiredBlockheightExceededError, UnconfirmedTxError, httpx.TransportError)):
+        return True
+    if isinstance(error, RPCException):
+        text = str(error)
+        return "Blockhash not found" in text or "BlockhashNotFound" in text
+    return False
+
+
+def load_keypair(path: str) -> Keypair:
+    """Load a Solana CLI keypair file (JSON array of 64 bytes)."""
+    with open(path, 'r') as f:
+        secret = json.load(f)
+    return Keypair.from_bytes(bytes(secret))
+
+
+@dataclass
+class PoolMember:
+    """One payer/authority key. Each key owns its own agent PDA, so keys never share write locks."""
+    keypair: Keypair
+    agent_pda: Optional[Pubkey] = None
+    registered: bool = False
+    in_flight: int = 0
+    submitted: int = 0
+    register_lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def pubkey(self) -> Pubkey:
+        return self.keypair.pubkey()
+
+
+class PayerPool:
+    """
+    Spreads submissions over several payer/authority keys.
+
+    Every key owns its own agent PDA, and the program allows one record per
+    (agent, objective_id). So member_for() pins each objective to one key by
+    rendezvous hashing over the key set: the same objective always goes to
+    the same key, and adding a key moves only the objectives it wins.
+    Load is spread only as evenly as the objectives hash: a busy objective
+    keeps its one key busy. acquire() blocks while the objective's key
+    already has max_in_flight transactions outstanding.
+    """
+    def __init__(self, keypairs: List[Keypair], max_in_flight: int = 4):
+        if not keypairs:
+            raise ValueError("PayerPool needs at least one keypair")
+        self.members = [PoolMember(keypair=kp) for kp in keypairs]
+        self.max_in_flight = max_in_flight
+        self._cond = threading.Condition()
+
+    @classmethod
+    def from_files(cls, paths: List[str], **kwargs) -> "PayerPool":
+        return cls([load_keypair(p) for p in paths], **kwargs)
+
+    def __len__(self) -> int:
+        return len(self.members)
+
+    def member_for(self, objective_id: str) -> PoolMember:
+        """The key that owns objective_id's decision record."""
+        seed = objective_id.encode("utf-8")
+        return max(self.members, key=lambda m: hashlib.sha256(bytes(m.pubkey) + seed).digest())
+
+    def checkout(self, objective_id: str, timeout: Optional[float] = None) -> PoolMember:
+        """
+        Take an in-flight slot on objective_id's key, waiting up to timeout
+        seconds (forever if None). Pair with release(), or use acquire().
+        """
+        member = self.member_for(objective_id)
+        with self._cond:
+            if not self._cond.wait_for(lambda: member.in_flight < self.max_in_flight, timeout):
+                raise TimeoutError("No payer available: key at its in-flight limit")
+            member.in_flight += 1
+            member.submitted += 1
+        return member
+
+    def release(self, member: PoolMember) -> None:
+        with self._cond:
+            member.in_flight -= 1
+            self._cond.notify_all()
+
+    @contextmanager
+    def acquire(self, objective_id: str, timeout: Optional[float] = None) -> Iterator[PoolMember]:
+        member = self.checkout(objective_id, timeout)
+        try:
+            yield member
+        finally:
+            self.release(member)
+
+
+class ConfirmationTracker:
+    """
+    Holds a key's in-flight slot until its transaction settles: confirmed,
+    failed, or its blockhash expired. A background thread polls
+    getSignatureStatuses for every outstanding signature in one call.
+    A signature tracked with on_settle gets it called with the outcome
+    (CONFIRMED, FAILED or EXPIRED) once its slot is released.
+    """
+    MAX_SIGNATURES_PER_CALL = 256
+
+    def __init__(self, client: Client, pool: PayerPool, interval: float = 0.5):
+        self.client = client
+        self.pool = pool
+        self.interval = interval
+        self._pending: Dict[str, Tuple[PoolMember, int, Optional[Callable[[str], None]]]] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def track(self, member: PoolMember, signature: str, last_valid_block_height: int,
+              on_settle: Optional[Callable[[str], None]] = None) -> None:
+        with self._lock:
+            self._pending[signature] = (member, last_valid_block_height, on_settle)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="logos-confirmations", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"[ConfirmationTracker] Status poll failed: {e}")
+
+    def poll(self) -> int:
+        """Release the slots of settled transactions. Returns how many were released."""
+        with self._lock:
+            pending = list(self._pending.items())
+        if not pending:
+            return 0
+        block_height = self.client.get_block_height().value
+        settled = []
+        for start in range(0, len(pending), self.MAX_SIGNATURES_PER_CALL):
+            chunk = pending[start:start + self.MAX_SIGNATURES_PER_CALL]
+            statuses = self.client.get_signature_statuses(
+                [Signature.from_string(sig) for sig, _ in chunk]
+            ).value
+            for (sig, (member, last_valid_block_height, _)), status in zip(chunk, statuses):
+                if status is not None and status.err is not None:
+                    settled.append((sig, FAILED))
+                elif status is not None and status.confirmation_status in SETTLED:
+                    settled.append((sig, CONFIRMED))
+                elif status is None and block_height > last_valid_block_height:
+                    settled.append((sig, EXPIRED))   # expired unseen: can no longer land
+        for sig, outcome in settled:
+            with self._lock:
+                entry = self._pending.pop(sig, None)
+            if entry is None:
+                continue
+            member, _, on_settle = entry
+            self.pool.release(member)
+            if on_settle is not None:
+                on_settle(outcome)
+        return len(settled)
+
+
+class PooledSubmitter:
+    """
+    Builds, signs and sends log_decision transactions through a PayerPool,
+    registering each key's agent account on first use.
+    With a FeePlanner, every transaction carries a tight compute-unit limit and
+    a priority fee that escalates on each retry, per the objective's FeePolicy.
+    Only expired or dropped sends are retried (see is_expired_or_dropped).
+    With a LocalValidator and skip_preflight=True, log_decision transactions that
+    pass local checks are sent without the RPC simulation round trip.
+    A log_decision keeps its key's in-flight slot, and its LocalValidator
+    reservation, until the transaction settles on-chain (see
+    ConfirmationTracker), not just until it is sent. Only a confirmed record
+    is marked logged; a failed or expired one can be submitted again.
+    With an event_sink (anything with publish(), e.g. a DecisionBus), each
+    log_decision publishes "committed" once sent and then "confirmed",
+    "failed" or "expired" as decided by the same tracker that frees its slot.
+    """
+    def __init__(self, client: Client, program_id: Pubkey, pool: PayerPool,
+                 opts: Optional[TxOpts] = None, fee_planner: Optional[FeePlanner] = None,
+                 validator: Optional[LocalValidator] = None, skip_preflight: bool = False,
+                 event_sink=None):
+        self.client = client
+        self.program_id = program_id
+        self.pool = pool
+        self.opts = opts or TxOpts(skip_preflight=False)
+        self.fee_planner = fee_planner
+        self.validator = validator
+        self.event_sink = event_sink
+        self.log_opts = self.opts
+        if validator is not None and skip_preflight:
+            self.log_opts = TxOpts(skip_preflight=True, preflight_commitment=self.opts.preflight_commitment)
+        self.confirmations = ConfirmationTracker(client, pool)
+
+    def _send_once(self, member: PoolMember, ixs, opts: TxOpts):
+        latest = self.client.get_latest_blockhash().value
+        msg = Message(ixs, member.pubkey)
+        tx = Transaction([member.keypair], msg, latest.blockhash)
+        return self.client.send_transaction(tx, opts=opts).value, latest.last_valid_block_height
+
+    def _send(self, member: PoolMember, ixs, kinds: List[Kind], objective_id: Optional[str] = None,
+              opts: Optional[TxOpts] = None):
+        """Send (with fee escalation when planned). Returns (signature, last_valid_block_height)."""
+        opts = opts or self.opts
+        if self.fee_planner is None:
+            return self._send_once(member, ixs, opts)
+
+        policy = self.fee_planner.policy_for(objective_id)
+        base_price = self.fee_planner.base_price(ixs, policy)
+        last_error = None
+        for attempt in range(policy.max_retries + 1):
+            planned = self.fee_planner.plan(ixs, kinds, policy, base_price, attempt)
+            try:
+                sig, last_valid_block_height = self._send_once(member, planned, opts)
+                if policy.await_confirmation:
+                    # Waits until the blockhash expires, so a retry can never double-land
+                    self.client.confirm_transaction(sig, last_valid_block_height=last_valid_block_height)
+                return sig, last_valid_block_height
+            except Exception as e:
+                if not is_expired_or_dropped(e):
+                    raise
+                last_error = e
+                print(f"Submit attempt {attempt + 1}/{policy.max_retries + 1} expired or dropped: {e}")
+        raise last_error
+
+    def ensure_registered(self, member: PoolMember, agent_id: str) -> None:
+        """Register the key's agent account unless it is already known to exist."""
+        if member.registered:
+            return
+        with member.register_lock:
+            if member.registered:
+                return
+            member.agent_pda = find_agent_pda(self.program_id, member.pubkey)
+            try:
+                exists = self.client.get_account_info(member.agent_pda).value is not None
+            except Exception:
+                exists = False
+            if not exists:
+                print(f"Agent not registered for payer {member.pubkey}. Registering {agent_id}...")
+                ix_register = build_register_agent_ix(self.program_id, member.pubkey, agent_id)
+                sig, _ = self._send(member, [ix_register], [("register_agent", len(agent_id.encode("utf-8")))])
+                self.client.confirm_transaction(sig)
+            member.registered = True
+
+    def log_decision(self, agent_id: str, objective_id: str, decision_hash: str,
+                     timeout: Optional[float] = None) -> str:
+        """
+        Send one log_decision through the key that owns objective_id. Returns the signature.
+        Raises PrevalidationError for arguments the program would reject, and
+        TimeoutError if the key has no free in-flight slot within timeout seconds.
+        """
+        validate_log_decision(decision_hash, objective_id)
+        validate_register_agent(agent_id)
+        member = self.pool.checkout(objective_id, timeout=timeout)
+        try:
+            if self.validator is not None:
+                self.validator.check_log_decision(member.pubkey, decision_hash, objective_id)
+            try:
+                self.ensure_registered(member, agent_id)
+                ix = build_log_decision_ix(
+                    program_id=self.program_id,
+                    authority=member.pubkey,
+                    decision_hash=decision_hash,
+                    objective_id=objective_id
+                )
+                kinds = [("log_decision", len(objective_id.encode("utf-8")))]
+                sig, last_valid_block_height = self._send(member, [ix], kinds, objective_id, opts=self.log_opts)
+            except Exception:
+                if self.validator is not None:
+                    self.validator.release(member.pubkey, objective_id)
+                raise
+        except Exception:
+            self.pool.release(member)
+            raise
+        event = {
+            "type": COMMITTED,
+            "decision_hash": decision_hash,
+            "agent_id": agent_id,
+            "objective_id": objective_id,
+            "signature": str(sig),
+            "timestamp": time.time()
+        }
+        if self.event_sink is not None:
+            self.event_sink.publish(event)
+        self.confirmations.track(member, str(sig), last_valid_block_height,
+                                 on_settle=self._settle_callback(member.pubkey, event))
+        return str(sig)
+
+    def _settle_callback(self, authority: Pubkey, event: Dict[str, Any]) -> Optional[Callable[[str], None]]:
+        if self.validator is None and self.event_sink is None:
+            return None
+
+        def on_settle(outcome: str) -> None:
+            if self.validator is not None:
+                if outcome == CONFIRMED:
+                    self.validator.mark_logged(authority, event["objective_id"])
+                else:
+                    self.validator.release(authority, event["objective_id"])
+            if self.event_sink is not None:
+                self.event_sink.publish(dict(event, type=outcome))
+        return on_settle
@@ -1,4 +1,4 @@
-from core import LogosAgent
+from sdk.core import LogosAgent  # run from the repo root: python -m sdk.polt_demo
 import json
 import time
 
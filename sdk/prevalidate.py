@@ -0,0 +1,123 @@
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Optional, Set, Tuple
+
+from solders.pubkey import Pubkey
+
+from .onchain_utils import find_agent_pda, find_decision_pda, hash_to_bytes
+
+if TYPE_CHECKING:
+    from solana.rpc.api import Client
+
+# Limits enforced on-chain (lib.rs), restated so failures are caught before sending.
+HASH_HEX_LEN = 64
+MAX_SEED_BYTES = 32                     # Solana PDA seed limit; objective_id is a seed
+# `space = 8 + 32 + 64 + 50 + 8` omits the two 4-byte Borsh length prefixes,
+# so a string-hash DecisionRecord only has room for 42 bytes of objective_id.
+MAX_OBJECTIVE_BYTES = 42
+MAX_COMPACT_OBJECTIVE_BYTES = 50
+# `space = 8 + 32 + 50 + 8` minus the 4-byte length prefix
+MAX_AGENT_ID_BYTES = 46
+
+
+class PrevalidationError(ValueError):
+    """A transaction that would fail on-chain. `code` mirrors the LogosError / runtime cause."""
+    def __init__(self, code: str, message: str):
+        super().__init__(message)
+        self.code = code
+
+
+def validate_register_agent(agent_id: str) -> None:
+    if len(agent_id.encode("utf-8")) > MAX_AGENT_ID_BYTES:
+        raise PrevalidationError(
+            "AgentIdTooLong", f"agent_id must be at most {MAX_AGENT_ID_BYTES} bytes: {agent_id!r}"
+        )
+
+
+def validate_log_decision(decision_hash, objective_id: str, compact: bool = False) -> None:
+    """Stateless checks for log_decision / log_decision_compact arguments."""
+    if compact:
+        try:
+            hash_to_bytes(decision_hash)
+        except ValueError as e:
+            raise PrevalidationError("InvalidHashLength", str(e))
+    elif len(decision_hash.encode("utf-8")) != HASH_HEX_LEN:
+        raise PrevalidationError(
+            "InvalidHashLength", f"Decision hash must be exactly {HASH_HEX_LEN} characters"
+        )
+
+    obj_len = len(objective_id.encode("utf-8"))
+    if obj_len > MAX_SEED_BYTES:
+        raise PrevalidationError(
+            "MaxSeedLengthExceeded", f"objective_id is a PDA seed and must be at most {MAX_SEED_BYTES} bytes"
+        )
+    limit = MAX_COMPACT_OBJECTIVE_BYTES if compact else MAX_OBJECTIVE_BYTES
+    if obj_len > limit:
+        raise PrevalidationError(
+            "ObjectiveIdTooLong", f"objective_id must be at most {limit} bytes"
+        )
+
+
+class LocalValidator:
+    """
+    Catches predictable log_decision failures locally so RPC preflight can be skipped.
+    Remembers the (authority, objective_id) records this process has sent (the
+    most recent max_entries of them) and reserves each one until its
+    transaction settles, so concurrent callers cannot both send it.
+    With check_chain=True it also asks the RPC whether the decision PDA exists,
+    which catches records created before a restart or by another process;
+    enable it whenever preflight is skipped.
+    """
+    def __init__(self, program_id: Pubkey, client: Optional["Client"] = None, check_chain: bool = False,
+                 max_entries: int = 100_000):
+        self.program_id = program_id
+        self.client = client
+        self.check_chain = check_chain and client is not None
+        self.max_entries = max_entries
+        self._logged: "OrderedDict[Tuple[str, str], None]" = OrderedDict()
+        self._in_flight: Set[Tuple[str, str]] = set()
+        self._lock = threading.Lock()
+
+    def check_log_decision(self, authority: Pubkey, decision_hash, objective_id: str,
+                           compact: bool = False) -> None:
+        """
+        Raise PrevalidationError if the transaction would fail. On success the
+        (authority, objective_id) pair is reserved: follow up with mark_logged()
+        once the transaction confirms, or release() if sending failed or the
+        transaction failed or expired on-chain.
+        """
+        validate_log_decision(decision_hash, objective_id, compact=compact)
+
+        key = (str(authority), objective_id)
+        with self._lock:
+            duplicate = key in self._logged or key in self._in_flight
+            if not duplicate:
+                self._in_flight.add(key)
+        if not duplicate and self.check_chain:
+            try:
+                agent_pda = find_agent_pda(self.program_id, authority)
+                decision_pda = find_decision_pda(self.program_id, agent_pda, objective_id)
+                duplicate = self.client.get_account_info(decision_pda).value is not None
+            except Exception:
+                self.release(authority, objective_id)
+                raise
+            if duplicate:
+                self.mark_logged(authority, objective_id)
+        if duplicate:
+            raise PrevalidationError(
+                "DecisionAlreadyLogged", f"A decision for objective {objective_id!r} is already on-chain"
+            )
+
+    def mark_logged(self, authority: Pubkey, objective_id: str) -> None:
+        key = (str(authority), objective_id)
+        with self._lock:
+            self._in_flight.discard(key)
+            self._logged[key] = None
+            self._logged.move_to_end(key)
+            while len(self._logged) > self.max_entries:
+                self._logged.popitem(last=False)
+
+    def release(self, authority: Pubkey, objective_id: str) -> None:
+        """Drop the reservation taken by check_log_decision without marking the record logged."""
+        with self._lock:
+            self._in_flight.discard((str(authority), objective_id))
@@ -0,0 +1,169 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from solana.rpc.api import Client
+from solders.compute_budget import set_compute_unit_limit, set_compute_unit_price
+from solders.instruction import Instruction
+from solders.pubkey import Pubkey
+
+from .cu_profile import ComputeProfile
+
+# Compute units per Logos instruction, with init/rent CPI and event emission.
+# Conservative defaults; pass FeePlanner a ComputeProfile from the program-test
+# harness (sdk/cu_profile.py) or calibrate with measure_compute_units().
+DEFAULT_COMPUTE_UNITS: Dict[str, int] = {
+    "register_agent": 20_000,
+    "log_decision": 25_000,
+    "log_decision_compact": 22_000,
+    "log_decisions": 60_000,
+    "init_decision_log": 15_000,
+    "append_decision": 8_000,
+    "close_decision_log": 5_000,
+}
+# Each ComputeBudget instruction itself costs ~150 CU.
+COMPUTE_BUDGET_OVERHEAD = 300
+
+
+@dataclass
+class FeePolicy:
+    """
+    How hard to push a decision through congestion.
+    Prices are in micro-lamports per compute unit.
+    """
+    percentile: float = 50.0
+    min_price: int = 0
+    max_price: int = 1_000_000
+    escalation: float = 2.0       # price multiplier per retry
+    max_retries: int = 2
+    cu_margin: float = 1.1        # headroom over the measured compute units
+    await_confirmation: bool = False  # confirm before returning; required to detect drops
+
+
+# Latency-critical objectives get a higher percentile and confirmation-driven escalation.
+URGENT_POLICY = FeePolicy(percentile=90.0, min_price=10_000, escalation=3.0, max_retries=4,
+                          await_confirmation=True)
+
+
+class FeeProvider(ABC):
+    """Source of recent prioritization fees (micro-lamports per CU)."""
+    @abstractmethod
+    def recent_fees(self, writable_accounts: Sequence[Pubkey]) -> List[int]:
+        """Recent per-CU fees paid by transactions locking any of these accounts."""
+
+    def estimate(self, writable_accounts: Sequence[Pubkey], percentile: float) -> int:
+        fees = sorted(self.recent_fees(writable_accounts))
+        if not fees:
+            return 0
+        index = min(len(fees) - 1, int(len(fees) * percentile / 100.0))
+        return fees[index]
+
+
+class RpcFeeProvider(FeeProvider):
+    """Reads getRecentPrioritizationFees for the accounts the transaction write-locks."""
+    def __init__(self, client: Client):
+        self.client = client
+
+    def recent_fees(self, writable_accounts: Sequence[Pubkey]) -> List[int]:
+        resp = self.client.get_recent_prioritization_fees(list(writable_accounts))
+        return [f.prioritization_fee for f in resp.value]
+
+
+class StaticFeeProvider(FeeProvider):
+    """Fixed fee samples, for local runs and tests."""
+    def __init__(self, fees: Sequence[int] = (0,)):
+        self.fees = list(fees)
+
+    def recent_fees(self, writable_accounts: Sequence[Pubkey]) -> List[int]:
+        return list(self.fees)
+
+
+# An instruction kind, optionally with its input size (objective/agent ID bytes,
+# or entries for log_decisions) so a ComputeProfile can price it exactly.
+Kind = Union[str, Tuple[str, int]]
+
+
+def compute_unit_limit(kinds: Sequence[Kind], margin: float = 1.1,
+                       units: Optional[Dict[str, int]] = None,
+                       profile: Optional[ComputeProfile] = None) -> int:
+    """Tight CU limit for a transaction made of the given Logos instructions."""
+    units = units or DEFAULT_COMPUTE_UNITS
+    total = 0
+    for kind in kinds:
+        name, size = kind if isinstance(kind, tuple) else (kind, None)
+        total += profile.units(name, size) if profile is not None and profile.covers(name) else units[name]
+    return int(total * margin) + COMPUTE_BUDGET_OVERHEAD
+
+
+def escalated_price(base_price: int, attempt: int, policy: FeePolicy) -> int:
+    price = max(base_price, policy.min_price) * (policy.escalation ** attempt)
+    if attempt and price == 0:
+        # Nothing to escalate from: start at 1 micro-lamport and grow from there
+        price = policy.escalation ** attempt
+    return int(min(price, policy.max_price))
+
+
+def with_compute_budget(ixs: List[Instruction], unit_limit: int, unit_price: int) -> List[Instruction]:
+    """Prepend ComputeBudget instructions to a Logos instruction list."""
+    budget = [set_compute_unit_limit(unit_limit)]
+    if unit_price > 0:
+        budget.append(set_compute_unit_price(unit_price))
+    return budget + list(ixs)
+
+
+def writable_accounts(ixs: Sequence[Instruction]) -> List[Pubkey]:
+    seen = []
+    for ix in ixs:
+        for meta in ix.accounts:
+            if meta.is_writable and meta.pubkey not in seen:
+                seen.append(meta.pubkey)
+    return seen
+
+
+def measure_compute_units(client: Client, tx) -> int:
+    """Simulate a signed transaction and return the compute units it consumed."""
+    resp = client.simulate_transaction(tx, sig_verify=False)
+    if resp.value.err is not None:
+        raise RuntimeError(f"Simulation failed: {resp.value.err}")
+    return resp.value.units_consumed
+
+
+class FeePlanner:
+    """
+    Chooses compute-unit limit and price per transaction, using a per-objective
+    FeePolicy (falling back to "default") and a pluggable FeeProvider.
+    With a ComputeProfile, limits follow the measured cost per input size.
+    """
+    def __init__(self, provider: FeeProvider, policies: Optional[Dict[str, FeePolicy]] = None,
+                 units: Optional[Dict[str, int]] = None, profile: Optional[ComputeProfile] = None):
+        self.provider = provider
+        self.policies = dict(policies or {})
+        self.policies.setdefault("default", FeePolicy())
+        self.units = dict(DEFAULT_COMPUTE_UNITS)
+        if units:
+            self.units.update(units)
+        self.profile = None
+        if profile is not None:
+            self.profile = ComputeProfile(profile.variant, {k: dict(v) for k, v in profile.samples.items()})
+
+    def policy_for(self, objective_id: Optional[str]) -> FeePolicy:
+        return self.policies.get(objective_id, self.policies["default"])
+
+    def calibrate(self, kind: str, units_consumed: int) -> None:
+        """Record measured usage (e.g. from measure_compute_units) for an instruction kind."""
+        self.units[kind] = units_consumed
+        if self.profile is not None:
+            # A live measurement outranks the profile, at every size
+            self.profile.samples.pop(kind, None)
+
+    def base_price(self, ixs: Sequence[Instruction], policy: FeePolicy) -> int:
+        try:
+            return self.provider.estimate(writable_accounts(ixs), policy.percentile)
+        except Exception as e:
+            print(f"Priority fee estimate failed, using policy minimum: {e}")
+            return policy.min_price
+
+    def plan(self, ixs: List[Instruction], kinds: Sequence[Kind], policy: FeePolicy,
+             base_price: int, attempt: int = 0) -> List[Instruction]:
+        limit = compute_unit_limit(kinds, policy.cu_margin, self.units, self.profile)
+        return with_compute_budget(ixs, limit, escalated_price(base_price, attempt, policy))
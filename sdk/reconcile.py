@@ -0,0 +1,453 @@
+"""
+Reconciliation: find decisions that never reached the chain, and resubmit them.
+
+Both sides are reduced to streams sorted by decision hash and merge-diffed,
+so memory stays bounded by the sort run size however many records there
+are. Unsorted inputs (export_logs output, JSON Lines logs, indexer dumps)
+go through an external merge sort: sorted runs of run_size records are
+spilled to temporary files and merged with heapq. An AuditStore database
+is already sorted by its primary key and streams straight into the diff.
+
+    python -m sdk.reconcile --local audit.db --remote onchain_hashes.txt --missing-out missing.tsv
+    python -m sdk.reconcile --local export.json --remote-agent <agent PDA> \\
+        --submit memo --rpc-url https://api.devnet.solana.com --keypair id.json --rate 5
+
+With --submit memo, memos signed by --keypair count as on-chain, so a
+decision resubmitted by one run is not resubmitted by the next.
+
+Only the stdlib is needed unless --remote-agent or --submit reaches Solana.
+"""
+import argparse
+import heapq
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import IO, Callable, Iterable, Iterator, List, Optional, Tuple
+
+from .hash_schemes import DEFAULT_SCHEME
+
+# (decision_hash, objective_id, hash_scheme)
+Entry = Tuple[str, str, str]
+# submit(objective_id, decision_hash, hash_scheme) -> signature, or None on failure
+SubmitFn = Callable[[str, str, str], Optional[str]]
+
+DEFAULT_RUN_SIZE = 1_000_000
+_READ_CHUNK = 1 << 20
+_SQLITE_MAGIC = b"SQLite format 3\x00"
+
+
+@dataclass
+class ReconcileReport:
+    local: int = 0          # distinct local decision hashes
+    remote: int = 0         # distinct on-chain / indexed hashes
+    matched: int = 0
+    missing: int = 0        # local only: never made it on-chain
+    unexpected: int = 0     # remote only: on-chain but absent from the local log
+    submitted: int = 0
+    failed: int = 0
+
+
+# ---------- Sources ----------
+
+def _iter_json_array(f: IO[str], chunk_size: int = _READ_CHUNK) -> Iterator[dict]:
+    """Stream the objects of a top-level JSON array without loading the whole file."""
+    decoder = json.JSONDecoder()
+    buf, pos, opened = "", 0, False
+    while True:
+        while pos < len(buf) and buf[pos] in " \t\r\n,":
+            pos += 1
+        if pos >= len(buf):
+            more = f.read(chunk_size)
+            if not more:
+                raise ValueError("Unterminated JSON array")
+            buf, pos = more, 0
+            continue
+        if not opened:
+            if buf[pos] != "[":
+                raise ValueError("Expected a JSON array")
+            opened, pos = True, pos + 1
+            continue
+        if buf[pos] == "]":
+            return
+        try:
+            obj, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            # Items are objects, so a parse error here means the item is cut off at the chunk edge
+            more = f.read(chunk_size)
+            if not more:
+                raise
+            buf, pos = buf[pos:] + more, 0
+            continue
+        yield obj
+        pos = end
+        if pos > chunk_size:
+            buf, pos = buf[pos:], 0
+
+
+def _entry(item: dict) -> Entry:
+    if "decision_hash" in item:
+        # Logs that already carry the hash (e.g. /log responses joined with their requests)
+        return item["decision_hash"].lower(), item["objective_id"], item.get("hash_scheme", DEFAULT_SCHEME)
+    from .audit_store import _as_record
+    record = _as_record(item)
+    return record.compute_hash(), record.objective_id, record.hash_scheme
+
+
+def iter_local_entries(path: str) -> Iterator[Entry]:
+    """
+    Local decisions from an export_logs() JSON array or a JSON Lines file
+    (records, or {"decision_hash", "objective_id"} objects). Unsorted.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        head = f.read(4096).lstrip()
+        f.seek(0)
+        if head.startswith("["):
+            for item in _iter_json_array(f):
+                yield _entry(item)
+        else:
+            for line in f:
+                if line.strip():
+                    yield _entry(json.loads(line))
+
+
+def iter_audit_store_entries(path: str) -> Iterator[Entry]:
+    """Local decisions from an AuditStore database, already sorted by hash."""
+    conn = sqlite3.connect(path)
+    try:
+        rows = conn.execute(
+            "SELECT decision_hash, objective_id, "
+            f"COALESCE(json_extract(record_json, '$.hash_scheme'), '{DEFAULT_SCHEME}') "
+            "FROM decisions ORDER BY decision_hash"
+        )
+        yield from rows
+    finally:
+        conn.close()
+
+
+def iter_remote_hashes(path: str) -> Iterator[str]:
+    """
+    On-chain / indexed hashes from a text file: one per line, optionally
+    followed by tab-separated columns, or JSON Lines with a decision_hash key.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith("{"):
+                yield json.loads(line)["decision_hash"].lower()
+            else:
+                yield line.split("\t", 1)[0].lower()
+
+
+def iter_chain_hashes(rpc_url: str, program_id: str, agents: Iterable[str],
+                      memo_authorities: Iterable[str] = ()) -> Iterator[str]:
+    """
+    Decision hashes recorded on-chain for the given agent PDAs, however they
+    were logged: record accounts (log_decision / log_decision_compact),
+    log_decisions batches, and the append_decision ring buffer (its live
+    entries plus the history of its events). Memos signed by
+    memo_authorities are included too.
+    """
+    from solana.rpc.api import Client
+    from solders.pubkey import Pubkey
+
+    from .verify import DecisionVerifier
+
+    verifier = DecisionVerifier(Client(rpc_url), Pubkey.from_string(program_id))
+    for agent in map(Pubkey.from_string, agents):
+        for record in verifier.list_agent_decisions(agent):
+            yield record.decision_hash.lower()
+        for event in verifier.list_agent_batch_decisions(agent):
+            yield event.decision_hash
+        for entry in verifier.fetch_decision_log(agent):
+            yield entry.decision_hash
+        for event in verifier.list_agent_appended_decisions(agent):
+            yield event.decision_hash
+    for authority in map(Pubkey.from_string, memo_authorities):
+        for event in verifier.list_memo_decisions(authority):
+            yield event.decision_hash.lower()
+
+
+# ---------- Sorting ----------
+
+def _spill(lines: List[str], tmpdir: Optional[str]) -> IO[str]:
+    run = tempfile.TemporaryFile("w+", encoding="utf-8", dir=tmpdir)
+    run.writelines(lines)
+    run.seek(0)
+    return run
+
+
+def external_sort(lines: Iterable[str], run_size: int = DEFAULT_RUN_SIZE,
+                  tmpdir: Optional[str] = None) -> Iterator[str]:
+    """
+    Sorted, de-duplicated stream of newline-terminated lines, holding at most
+    run_size lines in memory. Temporary run files are removed when the
+    stream is exhausted or closed.
+    """
+    runs: List[IO[str]] = []
+    try:
+        batch: List[str] = []
+        for line in lines:
+            batch.append(line)
+            if len(batch) >= run_size:
+                batch.sort()
+                runs.append(_spill(batch, tmpdir))
+                batch = []
+        batch.sort()
+        merged = heapq.merge(*runs, batch) if runs else iter(batch)
+        previous = None
+        for line in merged:
+            if line != previous:
+                yield line
+                previous = line
+    finally:
+        for run in runs:
+            run.close()
+
+
+def _entry_line(entry: Entry) -> str:
+    decision_hash, objective_id, hash_scheme = entry
+    # json.dumps escapes tabs and newlines, so the line splits back unambiguously
+    return f"{decision_hash}\t{hash_scheme}\t{json.dumps(objective_id)}\n"
+
+
+def _line_entry(line: str) -> Entry:
+    decision_hash, hash_scheme, objective = line.rstrip("\n").split("\t", 2)
+    return decision_hash, json.loads(objective), hash_scheme
+
+
+def sort_entries(entries: Iterable[Entry], run_size: int = DEFAULT_RUN_SIZE,
+                 tmpdir: Optional[str] = None) -> Iterator[Entry]:
+    return map(_line_entry, external_sort(map(_entry_line, entries), run_size, tmpdir))
+
+
+def sort_hashes(hashes: Iterable[str], run_size: int = DEFAULT_RUN_SIZE,
+                tmpdir: Optional[str] = None) -> Iterator[str]:
+    lines = (h + "\n" for h in hashes)
+    return (line[:-1] for line in external_sort(lines, run_size, tmpdir))
+
+
+def _checked_sorted(items: Iterable, key: Callable = lambda x: x) -> Iterator:
+    """Pass through an input claimed to be sorted, failing loudly if it is not."""
+    previous = None
+    for item in items:
+        k = key(item)
+        if previous is not None and k < previous:
+            raise ValueError(f"Input is not sorted by decision hash: {k} after {previous}")
+        previous = k
+        yield item
+
+
+# ---------- Diff ----------
+
+def _distinct(items: Iterable[str]) -> Iterator[str]:
+    previous = None
+    for item in items:
+        if item != previous:
+            yield item
+            previous = item
+
+
+def diff_sorted(local: Iterable[Entry], remote: Iterable[str],
+                report: Optional[ReconcileReport] = None) -> Iterator[Entry]:
+    """
+    Merge-diff two hash-sorted streams; yields local entries whose hash is
+    not in remote. Fills report counts as it goes (final once exhausted).
+    """
+    report = report if report is not None else ReconcileReport()
+    remote_iter = _distinct(remote)
+    current = None
+
+    def step() -> None:
+        nonlocal current
+        current = next(remote_iter, None)
+        if current is not None:
+            report.remote += 1
+
+    step()
+    last_local = None
+    for entry in local:
+        decision_hash = entry[0]
+        if decision_hash == last_local:
+            continue   # same decision listed twice locally
+        last_local = decision_hash
+        report.local += 1
+        while current is not None and current < decision_hash:
+            report.unexpected += 1
+            step()
+        if current == decision_hash:
+            report.matched += 1
+            step()
+        else:
+            report.missing += 1
+            yield entry
+
+    while current is not None:
+        report.unexpected += 1
+        step()
+
+
+# ---------- Resubmission ----------
+
+class RateLimiter:
+    """Token bucket: at most `rate` acquisitions per second, bursts of up to `burst`."""
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            wait = (1 - self._tokens) / self.rate if self._tokens < 1 else 0.0
+            self._tokens -= 1
+        if wait > 0:
+            time.sleep(wait)
+
+
+def resubmit(missing: Iterable[Entry], submit: SubmitFn, rate: float = 5.0, max_workers: int = 4,
+             report: Optional[ReconcileReport] = None, failed_out: Optional[IO[str]] = None) -> ReconcileReport:
+    """
+    Resubmit missing entries at most `rate` per second over max_workers
+    threads. Entries are pulled lazily, so a huge stream is never held in
+    memory. Failures (None or an exception from submit) are counted and,
+    with failed_out, written there in the --missing-out format.
+    """
+    report = report if report is not None else ReconcileReport()
+    limiter = RateLimiter(rate, burst=max_workers)
+    slots = threading.BoundedSemaphore(max_workers * 2)
+    lock = threading.Lock()
+
+    def run(entry: Entry) -> None:
+        decision_hash, objective_id, hash_scheme = entry
+        try:
+            limiter.acquire()
+            try:
+                ok = submit(objective_id, decision_hash, hash_scheme) is not None
+            except Exception:
+                ok = False   # counted and written to failed_out below, like a None result
+            with lock:
+                if ok:
+                    report.submitted += 1
+                else:
+                    report.failed += 1
+                    if failed_out is not None:
+                        failed_out.write(_entry_line(entry))
+        finally:
+            slots.release()
+
+    with ThreadPoolExecutor(max_workers) as pool:
+        for entry in missing:
+            slots.acquire()
+            pool.submit(run, entry)
+    return report
+
+
+def reconcile(local: Iterable[Entry], remote: Iterable[str], submit: Optional[SubmitFn] = None,
+              local_sorted: bool = False, remote_sorted: bool = False,
+              run_size: int = DEFAULT_RUN_SIZE, tmpdir: Optional[str] = None,
+              rate: float = 5.0, max_workers: int = 4,
+              missing_out: Optional[IO[str]] = None, failed_out: Optional[IO[str]] = None) -> ReconcileReport:
+    """
+    Diff local decisions against the remote hash set. Missing entries are
+    written to missing_out and, with submit, resubmitted under rate limiting.
+    Inputs flagged as sorted skip the external sort (and are checked).
+    """
+    local = _checked_sorted(local, key=lambda e: e[0]) if local_sorted else sort_entries(local, run_size, tmpdir)
+    remote = _checked_sorted(remote) if remote_sorted else sort_hashes(remote, run_size, tmpdir)
+    report = ReconcileReport()
+    missing = diff_sorted(local, remote, report)
+    if missing_out is not None:
+        missing = _tee(missing, missing_out)
+    if submit is None:
+        for _ in missing:
+            pass
+        return report
+    return resubmit(missing, submit, rate, max_workers, report, failed_out)
+
+
+def _tee(entries: Iterator[Entry], out: IO[str]) -> Iterator[Entry]:
+    for entry in entries:
+        out.write(_entry_line(entry))
+        yield entry
+
+
+# ---------- CLI ----------
+
+def _local_source(path: str) -> Tuple[Iterator[Entry], bool]:
+    with open(path, "rb") as f:
+        is_sqlite = f.read(len(_SQLITE_MAGIC)) == _SQLITE_MAGIC
+    if is_sqlite:
+        return iter_audit_store_entries(path), True
+    return iter_local_entries(path), False
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Diff the local decision log against on-chain state")
+    parser.add_argument("--local", required=True, help="AuditStore database, export_logs JSON, or JSON Lines")
+    parser.add_argument("--remote", action="append", default=[], help="file of on-chain/indexed hashes (repeatable)")
+    parser.add_argument("--remote-agent", action="append", default=[], help="agent PDA to read from chain (repeatable)")
+    parser.add_argument("--memo-authority", action="append", default=[],
+                        help="also read Logos memos signed by this key (repeatable)")
+    parser.add_argument("--program-id", default=os.getenv("PROGRAM_ID", "Ldm2tof9CHcyaHWh3nBkwiWNGYN8rG5tex7NMbHQxG3"))
+    parser.add_argument("--rpc-url", default=os.getenv("SOLANA_RPC_URL", "https://api.devnet.solana.com"))
+    parser.add_argument("--submit", choices=["memo"], help="resubmit missing decisions this way")
+    parser.add_argument("--keypair", default=os.getenv("SOLANA_KEYPAIR_PATH", "id.json"))
+    parser.add_argument("--rate", type=float, default=5.0, help="resubmissions per second")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--run-size", type=int, default=DEFAULT_RUN_SIZE, help="records per in-memory sort run")
+    parser.add_argument("--tmpdir", help="directory for sort runs")
+    parser.add_argument("--missing-out", help="write missing entries here (hash, scheme, objective; tab-separated)")
+    parser.add_argument("--failed-out", help="write entries whose resubmission failed here")
+    args = parser.parse_args(argv)
+    if not args.remote and not args.remote_agent:
+        parser.error("give at least one --remote file or --remote-agent")
+
+    local, local_sorted = _local_source(args.local)
+
+    submit = None
+    memo_authorities = list(args.memo_authority)
+    if args.submit == "memo":
+        from .memo_adapter import MemoAdapter
+        adapter = MemoAdapter(args.rpc_url, args.keypair)
+        submit = adapter.log_decision
+        # Resubmitted memos create no program account; read them back by their signer
+        memo_authorities.append(str(adapter.payer.pubkey()))
+
+    def remote_hashes() -> Iterator[str]:
+        for path in args.remote:
+            yield from iter_remote_hashes(path)
+        if args.remote_agent or memo_authorities:
+            yield from iter_chain_hashes(args.rpc_url, args.program_id, args.remote_agent, memo_authorities)
+
+    missing_out = open(args.missing_out, "w", encoding="utf-8") if args.missing_out else None
+    failed_out = open(args.failed_out, "w", encoding="utf-8") if args.failed_out else None
+    try:
+        report = reconcile(
+            local, remote_hashes(), submit,
+            local_sorted=local_sorted,
+            run_size=args.run_size, tmpdir=args.tmpdir,
+            rate=args.rate, max_workers=args.workers,
+            missing_out=missing_out, failed_out=failed_out,
+        )
+    finally:
+        for out in (missing_out, failed_out):
+            if out is not None:
+                out.close()
+    print(json.dumps(asdict(report), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,275 @@
+import struct
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from solana.rpc.api import Client
+from solana.rpc.types import MemcmpOpts
+from solders.pubkey import Pubkey
+
+from .decoders import (
+    AGENT_OFFSET,
+    COMPACT_DECISION_RECORD_DISCRIMINATOR,
+    DECISION_BATCH_DISCRIMINATOR,
+    DECISION_RECORD_DISCRIMINATOR,
+    DecisionLoggedEvent,
+    DecisionsLoggedEvent,
+    DecodedDecisionBatch,
+    DecodedDecisionRecord,
+    decode_decision_batch,
+    decode_decision_record,
+    parse_events,
+)
+from .onchain_utils import (
+    BatchProof,
+    LogEntry,
+    batch_root_from_proof,
+    decision_batch_root,
+    decode_decision_log,
+    decode_log_decisions_ix_data,
+    find_decision_batch_pda,
+    find_decision_log_pda,
+    find_decision_pda,
+)
+
+# getMultipleAccounts accepts at most 100 keys per call
+MAX_ACCOUNTS_PER_CALL = 100
+# getSignaturesForAddress returns at most 1000 signatures per call
+MAX_SIGNATURES_PER_CALL = 1000
+
+_B58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+
+
+def _b58encode(data: bytes) -> str:
+    """Base58 for memcmp filter bytes (the RPC expects base58, not raw)."""
+    n = int.from_bytes(data, "big")
+    out = ""
+    while n:
+        n, rem = divmod(n, 58)
+        out = _B58_ALPHABET[rem] + out
+    pad = len(data) - len(data.lstrip(b"\0"))
+    return "1" * pad + out
+
+
+@dataclass
+class VerificationResult:
+    agent: str
+    objective_id: str
+    decision_pda: str
+    found: bool
+    record: Optional[DecodedDecisionRecord] = None
+    expected_hash: Optional[str] = None
+
+    @property
+    def verified(self) -> bool:
+        """Found on-chain, and matching the expected hash if one was given."""
+        if not self.found:
+            return False
+        return self.expected_hash is None or self.record.decision_hash == self.expected_hash
+
+
+class DecisionVerifier:
+    """
+    Checks many decisions against chain with few RPC calls: decision PDAs are
+    derived locally and fetched MAX_ACCOUNTS_PER_CALL at a time, and an agent's
+    full history comes from filtered getProgramAccounts.
+
+    Batched decisions (log_decisions) live in DecisionBatch accounts that only
+    hold a Merkle root: verify_in_batch() checks one decision with its proof,
+    and list_agent_batch_decisions() recovers every entry from the
+    transactions that created the batches. Ring-buffer (append_decision) and
+    memo decisions are read back from transaction history the same way.
+    """
+    def __init__(self, client: Client, program_id: Pubkey):
+        self.client = client
+        self.program_id = program_id
+
+    def fetch_records(self, pairs: Iterable[Tuple[Pubkey, str]]) -> Dict[Tuple[str, str], Optional[DecodedDecisionRecord]]:
+        """
+        Fetch decision records for (agent_pda, objective_id) pairs.
+        Missing or undecodable accounts map to None.
+        """
+        keys = []
+        pdas = []
+        for agent, objective_id in pairs:
+            keys.append((str(agent), objective_id))
+            pdas.append(find_decision_pda(self.program_id, agent, objective_id))
+
+        records: Dict[Tuple[str, str], Optional[DecodedDecisionRecord]] = {}
+        for start in range(0, len(pdas), MAX_ACCOUNTS_PER_CALL):
+            chunk = pdas[start:start + MAX_ACCOUNTS_PER_CALL]
+            accounts = self.client.get_multiple_accounts(chunk).value
+            for key, account in zip(keys[start:start + MAX_ACCOUNTS_PER_CALL], accounts):
+                record = None
+                if account is not None and account.owner == self.program_id:
+                    try:
+                        record = decode_decision_record(account.data)
+                    except (ValueError, struct.error):   # truncated or foreign data
+                        record = None
+                records[key] = record
+        return records
+
+    def verify(self, items: Sequence[Tuple[Pubkey, str, Optional[str]]]) -> List[VerificationResult]:
+        """
+        Verify (agent_pda, objective_id, expected_hash) triples; expected_hash may be None
+        to only check existence. Results are returned in input order.
+        """
+        records = self.fetch_records((agent, objective_id) for agent, objective_id, _ in items)
+        results = []
+        for agent, objective_id, expected_hash in items:
+            record = records[(str(agent), objective_id)]
+            results.append(VerificationResult(
+                agent=str(agent),
+                objective_id=objective_id,
+                decision_pda=str(find_decision_pda(self.program_id, agent, objective_id)),
+                found=record is not None,
+                record=record,
+                expected_hash=expected_hash,
+            ))
+        return results
+
+    def _program_accounts(self, discriminator: bytes, agent: Pubkey):
+        return self.client.get_program_accounts(
+            self.program_id,
+            encoding="base64",
+            filters=[
+                MemcmpOpts(offset=0, bytes=_b58encode(discriminator)),
+                MemcmpOpts(offset=AGENT_OFFSET, bytes=str(agent)),
+            ],
+        ).value
+
+    def list_agent_decisions(self, agent: Pubkey) -> List[DecodedDecisionRecord]:
+        """
+        Every decision record owned by an agent PDA, oldest first.
+        One getProgramAccounts call per record layout, filtered server-side on
+        the account discriminator and the `agent` field.
+        """
+        decisions = []
+        for discriminator in (DECISION_RECORD_DISCRIMINATOR, COMPACT_DECISION_RECORD_DISCRIMINATOR):
+            for keyed in self._program_accounts(discriminator, agent):
+                decisions.append(decode_decision_record(keyed.account.data))
+        decisions.sort(key=lambda r: r.timestamp)
+        return decisions
+
+    def list_agent_batches(self, agent: Pubkey) -> List[Tuple[Pubkey, DecodedDecisionBatch]]:
+        """Every DecisionBatch account of an agent PDA as (address, batch), oldest first."""
+        batches = [(keyed.pubkey, decode_decision_batch(keyed.account.data))
+                   for keyed in self._program_accounts(DECISION_BATCH_DISCRIMINATOR, agent)]
+        batches.sort(key=lambda item: item[1].timestamp)
+        return batches
+
+    def fetch_batch_entries(self, batch_pda: Pubkey, batch: DecodedDecisionBatch) -> Optional[DecisionsLoggedEvent]:
+        """
+        The entries of one batch, read from the transaction that created it:
+        its DecisionsLogged event, or the log_decisions instruction data when
+        the logs were truncated. Entries are accepted only if they hash to
+        the stored root. None if no such transaction is found.
+        """
+        signatures = self.client.get_signatures_for_address(batch_pda, limit=MAX_SIGNATURES_PER_CALL).value
+        for info in reversed(signatures):   # oldest first: the creating transaction
+            if info.err is not None:
+                continue
+            tx = self._transaction(info.signature)
+            if tx is None:
+                continue
+            candidates = [event.entries for event in parse_events(tx.transaction.meta.log_messages or [])
+                          if isinstance(event, DecisionsLoggedEvent)]
+            message = tx.transaction.transaction.message
+            for ix in message.instructions:
+                if message.account_keys[ix.program_id_index] != self.program_id:
+                    continue
+                try:
+                    candidates.append(decode_log_decisions_ix_data(bytes(ix.data))[1])
+                except (ValueError, struct.error):
+                    continue
+            for entries in candidates:
+                if decision_batch_root(entries).hex() == batch.batch_root:
+                    return DecisionsLoggedEvent(batch.agent, batch.batch_root, entries, batch.timestamp)
+        return None
+
+    def list_agent_batch_decisions(self, agent: Pubkey) -> List[DecisionLoggedEvent]:
+        """Every decision an agent logged through log_decisions, batch by batch, oldest first."""
+        decisions = []
+        for batch_pda, batch in self.list_agent_batches(agent):
+            event = self.fetch_batch_entries(batch_pda, batch)
+            if event is None:
+                print(f"[DecisionVerifier] Entries of batch {batch.batch_root[:16]} not found")
+                continue
+            decisions.extend(event.decisions())
+        return decisions
+
+    def _signatures(self, address: Pubkey) -> Iterator:
+        """Every successful transaction touching address, newest first, paged."""
+        before = None
+        while True:
+            page = self.client.get_signatures_for_address(address, before=before,
+                                                          limit=MAX_SIGNATURES_PER_CALL).value
+            for info in page:
+                if info.err is None:
+                    yield info
+            if len(page) < MAX_SIGNATURES_PER_CALL:
+                return
+            before = page[-1].signature
+
+    def _transaction(self, signature):
+        return self.client.get_transaction(signature, encoding="base64",
+                                           max_supported_transaction_version=0).value
+
+    def fetch_decision_log(self, agent: Pubkey) -> List[LogEntry]:
+        """The entries still held in an agent's ring buffer (the last DECISION_LOG_CAPACITY), oldest first."""
+        account = self.client.get_account_info(find_decision_log_pda(self.program_id, agent)).value
+        if account is None or account.owner != self.program_id:
+            return []
+        return decode_decision_log(account.data)[2]
+
+    def list_agent_appended_decisions(self, agent: Pubkey) -> List[DecisionLoggedEvent]:
+        """
+        Every DecisionAppended event of an agent's ring buffer, including entries
+        the buffer has since overwritten, oldest first. One getTransaction per
+        append, so this is for batch jobs such as reconciliation.
+        """
+        events: Dict[int, DecisionLoggedEvent] = {}
+        for info in self._signatures(find_decision_log_pda(self.program_id, agent)):
+            tx = self._transaction(info.signature)
+            if tx is None:
+                continue
+            for event in parse_events(tx.transaction.meta.log_messages or []):
+                if isinstance(event, DecisionLoggedEvent) and event.sequence is not None \
+                        and event.agent == str(agent):
+                    events[event.sequence] = event
+        return [events[sequence] for sequence in sorted(events)]
+
+    def list_memo_decisions(self, authority: Pubkey) -> List[DecisionLoggedEvent]:
+        """
+        Decisions logged as Logos memos (v1, v2, v3) by a signer, oldest first.
+        Memo text comes with the signature list, so no transaction is fetched.
+        `agent` is the signer and `timestamp` the block time.
+        """
+        from .memo_adapter import decode_memo, parse_memo_field
+
+        decisions = []
+        for info in self._signatures(authority):
+            for memo in parse_memo_field(info.memo):
+                try:
+                    entries = decode_memo(memo)
+                except ValueError:
+                    continue   # not a Logos memo
+                decisions.extend(DecisionLoggedEvent(str(authority), objective_id, decision_hash,
+                                                     info.block_time or 0)
+                                 for objective_id, decision_hash in entries)
+        decisions.reverse()
+        return decisions
+
+    def verify_in_batch(self, agent: Pubkey, objective_id: str, decision_hash: str, proof: BatchProof) -> bool:
+        """
+        True if the decision is in a DecisionBatch of this agent: the root implied
+        by the proof (onchain_utils.batch_proof) must have an account on-chain.
+        """
+        root = batch_root_from_proof(objective_id, decision_hash, proof)
+        account = self.client.get_account_info(find_decision_batch_pda(self.program_id, agent, root)).value
+        if account is None or account.owner != self.program_id:
+            return False
+        try:
+            batch = decode_decision_batch(account.data)
+        except (ValueError, struct.error):
+            return False
+        return batch.batch_root == root.hex() and batch.agent == str(agent)
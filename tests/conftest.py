@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Make `sdk` importable from the repo root, as api_server.py does.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,51 @@
+import hashlib
+import json
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from sdk.core import LogosAgent
+from sdk.merkle import merkle_root
+
+
+def obs_hash(observation):
+    return LogosAgent("a", "o", verbose=False).hash_observation(observation)
+
+
+def test_plain_json_observations_hash_as_before():
+    observation = {"price": 101.5, "depth": [1, 2, 3]}
+    expected = hashlib.sha256(json.dumps(observation, sort_keys=True).encode('utf-8')).hexdigest()
+    assert obs_hash(observation) == expected
+
+
+def test_array_hash_is_layout_independent():
+    base = np.arange(12, dtype="<f8").reshape(3, 4)
+    h = obs_hash({"book": base})
+    assert obs_hash({"book": np.asfortranarray(base)}) == h
+    assert obs_hash({"book": base.astype(">f8")}) == h
+    assert obs_hash({"book": np.arange(24, dtype="<f8").reshape(3, 8)[:, ::2]}) == obs_hash({"book": np.arange(0, 24, 2, dtype="<f8").reshape(3, 4)})
+
+
+def test_array_hash_commits_to_dtype_shape_and_values():
+    base = np.arange(12, dtype="<f8").reshape(3, 4)
+    h = obs_hash({"book": base})
+    assert obs_hash({"book": base.reshape(4, 3)}) != h
+    assert obs_hash({"book": base.astype("<f4")}) != h
+    changed = base.copy()
+    changed[2, 3] = -1
+    assert obs_hash({"book": changed}) != h
+    assert obs_hash({"n": np.int64(3)}) == obs_hash({"n": 3})
+
+
+def test_merkle_leaves_accept_arrays():
+    a = np.linspace(0, 1, 5)
+    assert merkle_root({"curve": a}) == merkle_root({"curve": a.copy()})
+    assert merkle_root({"curve": a}) != merkle_root({"curve": a[::-1]})
+
+
+def test_dataframe_encoding():
+    pd = pytest.importorskip("pandas")
+    frame = pd.DataFrame({"bid": [1.0, 2.0], "venue": ["a", "b"]})
+    assert obs_hash({"book": frame}) == obs_hash({"book": frame.copy()})
+    assert obs_hash({"book": frame}) != obs_hash({"book": frame.rename(columns={"bid": "ask"})})
@@ -0,0 +1,61 @@
+import json
+import threading
+
+import pytest
+
+from sdk.audit_store import AuditStore
+from sdk.core import LogosAgent
+
+
+def _records(agent_id, count):
+    agent = LogosAgent(agent_id, "obj", verbose=False)
+    for i in range(count):
+        agent.decide({"i": i}, {"type": "buy" if i % 2 else "sell", "i": i})
+    return json.loads(agent.export_logs())
+
+
+def test_ingest_query_and_signature(tmp_path):
+    store = AuditStore(str(tmp_path / "audit.db"))
+    records = _records("a", 4)
+    first = store.ingest(records[0], signature="sig0")
+    assert store.ingest(records[0]) == first   # re-ingest is a no-op
+    assert store.ingest_many(records) == 3
+    assert store.count() == 4
+    assert store.count(action_type="buy") == 2
+    assert store.get(first)["signature"] == "sig0"
+
+    store.set_signature(first, "sig1")
+    assert store.get(first)["signature"] == "sig1"
+    assert [d["snapshot"]["action_payload"]["i"] for d in store.query(limit=2, offset=1)] == [1, 2]
+    store.close()
+
+
+def test_ingest_many_counts_only_its_own_rows_under_concurrency():
+    store = AuditStore()
+    batches = [_records(f"agent{n}", 300) for n in range(4)]
+    counts = [None] * len(batches)
+    errors = []
+
+    def load(n):
+        try:
+            # Singles and signatures race with the bulk loads
+            store.ingest(batches[n][0], signature=f"sig{n}")
+            counts[n] = store.ingest_many(batches[n], batch_size=50)
+        except Exception as e:   # pragma: no cover - surfaced below
+            errors.append(e)
+
+    threads = [threading.Thread(target=load, args=(n,)) for n in range(len(batches))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert not errors
+    assert counts == [299] * len(batches)
+    assert store.count() == 1200
+
+
+def test_unknown_hash_scheme_is_a_value_error():
+    record = dict(_records("a", 1)[0], hash_scheme="md5")
+    with pytest.raises(ValueError):
+        AuditStore().ingest_many([record])
@@ -0,0 +1,78 @@
+import asyncio
+import json
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+from sdk.client import AsyncLogosClient, LogosAPIError, LogosClient
+from sdk.core import LogosAgent
+
+OBS = [{"source": "pyth", "content": {"price": 101.5}, "timestamp": 1707000000}]
+
+
+class FakeServer:
+    """Mimics /log/batch: recomputes each hash like api_server and replays idempotency keys."""
+    def __init__(self, fail_first: int = 0):
+        self.fail_first = fail_first
+        self.requests = []
+        self.sent = {}
+
+    def __call__(self, request):
+        items = json.loads(request.content)["items"]
+        self.requests.append(items)
+        if self.fail_first:
+            self.fail_first -= 1
+            return httpx.Response(503, text="busy")
+        results = []
+        for item in items:
+            if item["objective_id"].startswith("bad"):
+                results.append({"status_code": 400, "result": None, "detail": "ObjectiveIdTooLong"})
+                continue
+            agent = LogosAgent("API-Agent-" + item["objective_id"], item["objective_id"], verbose=False)
+            decision_hash = agent.decide(item["observations"], item["action_plan"], timestamp=item.get("timestamp"))
+            if item.get("decision_hash", decision_hash) != decision_hash:
+                results.append({"status_code": 400, "result": None, "detail": "HashMismatch"})
+                continue
+            replayed = item["idempotency_key"] in self.sent
+            self.sent.setdefault(item["idempotency_key"], decision_hash)
+            results.append({"status_code": 200, "detail": None, "result": {
+                "decision_hash": decision_hash, "signature": "sig", "status": "committed",
+                "timestamp": "t", "explorer_url": None, "replayed": replayed}})
+        return httpx.Response(200, json={"results": results})
+
+
+def test_async_client_batches_and_prehashes():
+    server = FakeServer()
+
+    async def run():
+        async with AsyncLogosClient(transport=httpx.MockTransport(server), batch_delay=0.05) as logos:
+            pending = [logos.submit("Guard-v1", OBS, {"cmd": "repay", "n": i}) for i in range(10)]
+            receipts = await asyncio.gather(*(f for _, f in pending))
+        return pending, receipts
+
+    pending, receipts = asyncio.run(run())
+    assert len(server.requests) == 1 and len(server.requests[0]) == 10
+    assert [h for h, _ in pending] == [r.decision_hash for r in receipts]
+
+
+def test_sync_client_retries_with_same_idempotency_key():
+    server = FakeServer(fail_first=2)
+    with LogosClient(transport=httpx.MockTransport(server), backoff=0.01) as logos:
+        decision_hash, future = logos.submit("Guard-v1", OBS, {"cmd": "repay"})
+        receipt = future.result(timeout=5)
+    assert receipt.decision_hash == decision_hash
+    keys = {item["idempotency_key"] for batch in server.requests for item in batch}
+    assert len(server.requests) == 3 and len(keys) == 1
+
+
+def test_item_errors_fail_only_that_item():
+    server = FakeServer()
+    with LogosClient(transport=httpx.MockTransport(server), batch_delay=0.05) as logos:
+        _, bad = logos.submit("bad-objective", OBS, {"cmd": "repay"})
+        _, good = logos.submit("Guard-v1", OBS, {"cmd": "repay"})
+        assert good.result(timeout=5).status == "committed"
+        with pytest.raises(LogosAPIError) as exc:
+            bad.result(timeout=5)
+    assert exc.value.status_code == 400
+    assert len(server.requests) == 1
@@ -0,0 +1,44 @@
+import pytest
+
+pytest.importorskip("solders")
+
+from sdk.compliance import CertificateVerifier, ComplianceCertificate, ComplianceProvider
+
+
+def test_certificates_verify_and_reject_tampering():
+    provider = ComplianceProvider("Test_Oracle")
+    cert = provider.sign("GoodUserAddr", 50, passed=True).to_dict()
+    blocked = provider.sign("EvilHackerAddress123", 10, passed=False, reason="SANCTIONED_ADDRESS")
+
+    verifier = CertificateVerifier(trusted_providers=[provider.public_key])
+    assert verifier.verify_batch([cert, blocked]) == [True, True]
+
+    assert not verifier.verify(dict(cert, amount=5000))
+    assert not verifier.verify(dict(cert, passed=False))
+    assert not verifier.verify(dict(cert, signature="not-a-signature"))
+    assert not verifier.verify({"recipient": "GoodUserAddr"})
+
+    # Validly signed, but by a key the auditor does not trust
+    impostor = ComplianceProvider("Test_Oracle").sign("GoodUserAddr", 50, passed=True)
+    assert not verifier.verify(impostor)
+    assert CertificateVerifier().verify(impostor)
+
+
+def test_batch_uses_cache_and_process_pool():
+    provider = ComplianceProvider("Test_Oracle")
+    certs = [provider.sign(f"Recipient{i}", i, passed=True, issued_at=1_700_000_000).to_dict() for i in range(40)]
+    forged = dict(certs[3], recipient="Someone-Else")
+
+    with CertificateVerifier(workers=2, chunk_size=8, parallel_threshold=10) as verifier:
+        batch = certs + [forged, certs[0]]
+        assert verifier.verify_batch(batch) == [True] * 40 + [False, True]
+        assert len(verifier._cache) == 41   # the in-batch duplicate was verified once
+        assert verifier.verify_batch(batch) == [True] * 40 + [False, True]
+
+
+def test_malformed_certificate_does_not_abort_the_batch():
+    provider = ComplianceProvider("Test_Oracle")
+    valid = provider.sign("GoodUserAddr", 50, passed=True).to_dict()
+    verifier = CertificateVerifier()
+    assert verifier.verify_batch([valid, dict(valid, provider=123)]) == [True, False]
+    assert verifier.verify_batch([dict(valid, signature=None), valid]) == [False, True]
@@ -0,0 +1,85 @@
+import threading
+
+from sdk.core import ConcurrentLogosAgent, DecisionRecord, LogosAgent
+
+THREADS = 16
+DECISIONS_PER_THREAD = 500
+OBJECTIVES = ["Auto-Repay-Policy-v4", "Arbitrage-Policy-V1", "Liquidation-Guard-v2"]
+
+
+def _run_threads(agent, worker):
+    start = threading.Barrier(THREADS)
+
+    def run(t):
+        start.wait()
+        worker(t)
+
+    threads = [threading.Thread(target=run, args=(t,)) for t in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_single_chain_survives_concurrent_decides():
+    agent = ConcurrentLogosAgent("Stress-Bot", "Auto-Repay-Policy-v4", verbose=False)
+
+    def worker(t):
+        for i in range(DECISIONS_PER_THREAD):
+            agent.decide({"thread": t, "i": i, "depth": list(range(64))}, {"type": "REPAY"})
+
+    _run_threads(agent, worker)
+
+    chain = agent.chains["Auto-Repay-Policy-v4"]
+    assert len(chain) == THREADS * DECISIONS_PER_THREAD
+    assert agent.verify_chain()
+    # Every prev_hash is used exactly once: no fork in the chain
+    prev_hashes = [r.prev_hash for r in chain]
+    assert len(set(prev_hashes)) == len(prev_hashes)
+
+
+def test_per_objective_chains_are_independent():
+    agent = ConcurrentLogosAgent("Stress-Bot", verbose=False)
+
+    def worker(t):
+        for i in range(DECISIONS_PER_THREAD):
+            objective = OBJECTIVES[(t + i) % len(OBJECTIVES)]
+            agent.decide({"thread": t, "i": i}, {"type": "SWAP"}, objective_id=objective)
+
+    _run_threads(agent, worker)
+
+    assert sum(len(agent.chains[o]) for o in OBJECTIVES) == THREADS * DECISIONS_PER_THREAD
+    assert len(agent.history) == THREADS * DECISIONS_PER_THREAD
+    for objective in OBJECTIVES:
+        assert agent.verify_chain(objective)
+        assert agent.chains[objective][0].prev_hash is None
+
+
+def test_verify_chain_detects_tampering():
+    agent = ConcurrentLogosAgent("Stress-Bot", "Obj", verbose=False)
+    for i in range(5):
+        agent.decide({"i": i}, {"type": "HOLD"})
+    original = agent.chains["Obj"][2]
+    agent.chains["Obj"][2] = DecisionRecord(
+        agent_id=original.agent_id,
+        timestamp=original.timestamp + 1,
+        objective_id=original.objective_id,
+        snapshot=original.snapshot,
+        prev_hash=original.prev_hash,
+    )
+    assert not agent.verify_chain()
+
+
+def test_pinned_timestamp_reproduces_the_plain_agent_hash():
+    plain = LogosAgent("Stress-Bot", "Obj", verbose=False)
+    concurrent = ConcurrentLogosAgent("Stress-Bot", "Obj", verbose=False)
+    observation, action = {"price": 101.5}, {"type": "HOLD"}
+    assert concurrent.decide(observation, action, timestamp=1_700_000_000.0) == \
+        plain.decide(observation, action, timestamp=1_700_000_000.0)
+    assert concurrent.chains["Obj"][0].timestamp == 1_700_000_000.0
+
+
+def test_verify_chain_has_no_side_effects():
+    agent = ConcurrentLogosAgent("Stress-Bot", verbose=False)
+    assert agent.verify_chain("Unknown-Objective")
+    assert "Unknown-Objective" not in agent.chains and "Unknown-Objective" not in agent.heads
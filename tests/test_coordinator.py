@@ -0,0 +1,85 @@
+import os
+import tempfile
+import threading
+import time
+
+import pytest
+
+from sdk.coordinator import RemoteDecisionBus, RemoteIdempotencyStore, RemoteSubmitter, SubmissionCoordinator
+from sdk.idempotency import IdempotencyKeyReused
+from sdk.prevalidate import PrevalidationError
+
+AUTHKEY = b"test-key"
+
+
+class FakeSubmitter:
+    def __init__(self):
+        self.calls = []
+
+    def log_decision(self, agent_id, objective_id, decision_hash, timeout=None):
+        self.calls.append((agent_id, objective_id, decision_hash))
+        return f"sig-{objective_id}-{decision_hash}"
+
+
+class ListBus:
+    def __init__(self):
+        self.messages = []
+
+    def publish(self, message):
+        self.messages.append(message)
+        return 1
+
+
+@pytest.fixture
+def coordinator():
+    address = os.path.join(tempfile.mkdtemp(), "c.sock")
+    coordinator = SubmissionCoordinator(FakeSubmitter(), address, AUTHKEY, max_workers=2, max_sent=3)
+    threading.Thread(target=coordinator.serve_forever, daemon=True).start()
+    for _ in range(100):
+        if os.path.exists(address):
+            break
+        time.sleep(0.01)
+    return coordinator
+
+
+def test_submissions_are_deduplicated_and_bounded(coordinator):
+    worker_a = RemoteSubmitter(coordinator.address, AUTHKEY)
+    worker_b = RemoteSubmitter(coordinator.address, AUTHKEY)
+    first = worker_a.log_decision("agent", "obj", "h1")
+    assert worker_b.log_decision("agent", "obj", "h1") == first
+    with pytest.raises(PrevalidationError) as e:
+        worker_b.log_decision("agent", "obj", "h2")
+    assert e.value.code == "DecisionAlreadyLogged"
+    assert len(coordinator.submitter.calls) == 1
+
+    for i in range(10):
+        worker_a.log_decision("agent", f"obj-{i}", "h")
+    assert len(coordinator._sent) == 3
+
+
+def test_idempotency_is_shared_across_workers(coordinator):
+    worker_a = RemoteIdempotencyStore(coordinator.address, AUTHKEY)
+    worker_b = RemoteIdempotencyStore(coordinator.address, AUTHKEY)
+    assert worker_a.begin("k", 1.0, "body") == (True, None)
+    worker_a.complete("k", {"signature": "sig"})
+    assert worker_b.begin("k", 1.0, "body") == (False, {"signature": "sig"})
+    with pytest.raises(IdempotencyKeyReused):
+        worker_b.begin("k", 1.0, "other body")
+
+
+def test_events_reach_every_worker(coordinator):
+    buses = [ListBus(), ListBus()]
+    links = [RemoteDecisionBus(coordinator.address, AUTHKEY) for _ in buses]
+    for link, bus in zip(links, buses):
+        link.relay(bus)
+    for _ in range(100):
+        if len(coordinator._subscribers) == 2:
+            break
+        time.sleep(0.01)
+
+    assert links[0].publish({"type": "committed", "objective_id": "obj"}) == 2
+    for _ in range(100):
+        if all(bus.messages for bus in buses):
+            break
+        time.sleep(0.01)
+    assert [bus.messages for bus in buses] == [[{"type": "committed", "objective_id": "obj"}]] * 2
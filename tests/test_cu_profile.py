@@ -0,0 +1,33 @@
+import json
+
+from sdk.cu_profile import ComputeProfile, load_profile
+
+REPORT = {
+    "variant": "lean",
+    "instructions": {
+        "log_decision": {"1": 10000, "16": 10300, "42": 10820},
+        "init_decision_log": {"0": 9000},
+    },
+}
+
+
+def test_units_interpolate_and_extrapolate(tmp_path):
+    path = tmp_path / "cu.json"
+    path.write_text(json.dumps(REPORT))
+    profile = load_profile(str(path))
+    assert profile.variant == "lean"
+
+    assert profile.units("log_decision", 1) == 10000
+    assert profile.units("log_decision", 0) == 10000
+    assert profile.units("log_decision", 16) == 10300
+    assert profile.units("log_decision", 29) == 10560          # between 16 and 42
+    assert profile.units("log_decision", 50) == 10980          # last segment extended
+    assert profile.units("log_decision") == 10820
+    assert profile.units("init_decision_log", 7) == 9000
+    assert profile.as_units() == {"log_decision": 10820, "init_decision_log": 9000}
+
+
+def test_load_profile_without_path(monkeypatch):
+    monkeypatch.delenv("LOGOS_CU_PROFILE", raising=False)
+    assert load_profile() is None
+    assert not ComputeProfile("default", {}).covers("log_decision")
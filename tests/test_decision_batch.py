@@ -0,0 +1,109 @@
+import hashlib
+import struct
+import types
+
+import pytest
+
+pytest.importorskip("solana")
+pytest.importorskip("solders")
+
+from solders.hash import Hash
+from solders.keypair import Keypair
+from solders.message import Message
+from solders.pubkey import Pubkey
+from solders.transaction import Transaction
+
+from sdk.decoders import DECISION_BATCH_DISCRIMINATOR
+from sdk.onchain_utils import (MAX_TRANSACTION_BYTES, batch_proof, build_log_decisions_ix, decision_batch_root,
+                               decode_log_decisions_ix_data, find_agent_pda, find_decision_batch_pda,
+                               transaction_size, verify_batch_inclusion)
+from sdk.verify import DecisionVerifier
+
+PROGRAM_ID = Pubkey.from_string("Ldm2tof9CHcyaHWh3nBkwiWNGYN8rG5tex7NMbHQxG3")
+
+
+def _entries(n, prefix="obj"):
+    return [(f"{prefix}-{i % 3}", hashlib.sha256(bytes([i])).hexdigest()) for i in range(n)]
+
+
+def test_builder_root_and_decoder_round_trip():
+    authority = Keypair().pubkey()
+    entries = _entries(7)
+    ix = build_log_decisions_ix(PROGRAM_ID, authority, entries)
+    root, decoded = decode_log_decisions_ix_data(bytes(ix.data))
+    assert decoded == entries
+    assert root == decision_batch_root(entries).hex()
+    assert ix.accounts[0].pubkey == find_decision_batch_pda(
+        PROGRAM_ID, find_agent_pda(PROGRAM_ID, authority), bytes.fromhex(root))
+    with pytest.raises(ValueError):
+        decode_log_decisions_ix_data(bytes(ix.data)[:-1])
+
+
+def test_every_entry_has_a_valid_proof():
+    for n in range(1, 20):
+        entries = _entries(n)
+        root = decision_batch_root(entries)
+        for i, (objective_id, decision_hash) in enumerate(entries):
+            proof = batch_proof(entries, i)
+            assert verify_batch_inclusion(objective_id, decision_hash, proof, root)
+            assert not verify_batch_inclusion(objective_id + "x", decision_hash, proof, root)
+            other = entries[(i + 1) % n][1]
+            if other != decision_hash:
+                assert not verify_batch_inclusion(objective_id, other, proof, root)
+
+
+def test_batches_must_fit_one_transaction():
+    authority = Keypair().pubkey()
+    fits = 1
+    while True:
+        try:
+            ix = build_log_decisions_ix(PROGRAM_ID, authority, _entries(fits + 1))
+        except ValueError:
+            break
+        fits += 1
+        assert transaction_size([ix], authority) <= MAX_TRANSACTION_BYTES
+    assert 10 < fits < 64
+    with pytest.raises(ValueError):
+        build_log_decisions_ix(PROGRAM_ID, authority, _entries(fits), reserve_bytes=200)
+
+
+class FakeClient:
+    """One batch account, created by one transaction whose logs were truncated."""
+    def __init__(self, payer, entries):
+        self.agent = find_agent_pda(PROGRAM_ID, payer.pubkey())
+        ix = build_log_decisions_ix(PROGRAM_ID, payer.pubkey(), entries)
+        self.root = decision_batch_root(entries)
+        self.batch_pda = ix.accounts[0].pubkey
+        self.tx = Transaction([payer], Message([ix], payer.pubkey()), Hash.new_unique())
+        self.account = types.SimpleNamespace(
+            owner=PROGRAM_ID,
+            data=DECISION_BATCH_DISCRIMINATOR + bytes(self.agent) + self.root + struct.pack("<Iq", len(entries), 1700))
+
+    def get_program_accounts(self, program_id, encoding=None, filters=None):
+        return types.SimpleNamespace(value=[types.SimpleNamespace(pubkey=self.batch_pda, account=self.account)])
+
+    def get_signatures_for_address(self, address, limit=None):
+        assert address == self.batch_pda
+        return types.SimpleNamespace(value=[types.SimpleNamespace(signature=self.tx.signatures[0], err=None)])
+
+    def get_transaction(self, signature, encoding=None, max_supported_transaction_version=None):
+        meta = types.SimpleNamespace(log_messages=["Log truncated"])
+        return types.SimpleNamespace(value=types.SimpleNamespace(
+            transaction=types.SimpleNamespace(transaction=self.tx, meta=meta)))
+
+    def get_account_info(self, pubkey):
+        return types.SimpleNamespace(value=self.account if pubkey == self.batch_pda else None)
+
+
+def test_verifier_reads_batched_decisions():
+    entries = _entries(5)
+    client = FakeClient(Keypair(), entries)
+    verifier = DecisionVerifier(client, PROGRAM_ID)
+
+    decisions = verifier.list_agent_batch_decisions(client.agent)
+    assert [(d.objective_id, d.decision_hash) for d in decisions] == entries
+    assert {d.batch_root for d in decisions} == {client.root.hex()}
+
+    objective_id, decision_hash = entries[3]
+    assert verifier.verify_in_batch(client.agent, objective_id, decision_hash, batch_proof(entries, 3))
+    assert not verifier.verify_in_batch(client.agent, objective_id, entries[0][1], batch_proof(entries, 3))
@@ -0,0 +1,77 @@
+import hashlib
+import struct
+
+import pytest
+
+pytest.importorskip("solders")
+
+from solders.pubkey import Pubkey
+
+from sdk.decoders import (
+    COMPACT_DECISION_LOGGED_DISCRIMINATOR,
+    COMPACT_DECISION_RECORD_DISCRIMINATOR,
+    DECISION_APPENDED_DISCRIMINATOR,
+    DECISION_BATCH_DISCRIMINATOR,
+    DECISION_LOGGED_DISCRIMINATOR,
+    DECISION_RECORD_DISCRIMINATOR,
+    DECISIONS_LOGGED_DISCRIMINATOR,
+    decode_decision_batch,
+    decode_decision_record,
+    decode_decision_records,
+    decode_event,
+)
+
+AGENT = Pubkey.new_unique()
+HASH = hashlib.sha256(b"decision").digest()
+
+
+def _string(value: str) -> bytes:
+    data = value.encode("utf-8")
+    return struct.pack("<I", len(data)) + data
+
+
+RECORD = DECISION_RECORD_DISCRIMINATOR + bytes(AGENT) + _string(HASH.hex()) + _string("obj") + struct.pack("<q", 7)
+COMPACT_RECORD = COMPACT_DECISION_RECORD_DISCRIMINATOR + bytes(AGENT) + HASH + _string("obj") + struct.pack("<q", 7)
+EVENTS = [
+    DECISION_LOGGED_DISCRIMINATOR + bytes(AGENT) + _string("obj") + _string(HASH.hex()) + struct.pack("<q", 7),
+    COMPACT_DECISION_LOGGED_DISCRIMINATOR + bytes(AGENT) + _string("obj") + HASH + struct.pack("<q", 7),
+    DECISION_APPENDED_DISCRIMINATOR + bytes(AGENT) + struct.pack("<Q", 3) + _string("obj") + HASH + struct.pack("<q", 7),
+    DECISIONS_LOGGED_DISCRIMINATOR + bytes(AGENT) + HASH + struct.pack("<I", 2)
+    + _string("a") + HASH + _string("b") + HASH + struct.pack("<q", 7),
+]
+
+
+def test_records_decode_in_both_layouts():
+    for data, compact in ((RECORD, False), (COMPACT_RECORD, True)):
+        record = decode_decision_record(data)
+        assert (record.agent, record.decision_hash, record.objective_id, record.timestamp, record.compact) == \
+            (str(AGENT), HASH.hex(), "obj", 7, compact)
+    assert decode_decision_records([RECORD, COMPACT_RECORD]) == [decode_decision_record(RECORD),
+                                                                 decode_decision_record(COMPACT_RECORD)]
+
+
+def test_truncated_records_raise_value_error():
+    for data in (RECORD, COMPACT_RECORD):
+        for n in range(len(data)):
+            with pytest.raises(ValueError):
+                decode_decision_record(data[:n])
+        assert decode_decision_records([data[:n] for n in range(len(data))]) == []
+
+
+def test_events_decode_and_reject_truncation():
+    for data in EVENTS:
+        event = decode_event(data)
+        assert event.agent == str(AGENT) and event.timestamp == 7
+        for n in range(len(data)):
+            with pytest.raises(ValueError):
+                decode_event(data[:n])
+    assert decode_event(EVENTS[2]).sequence == 3
+    assert decode_event(EVENTS[3]).entries == [("a", HASH.hex()), ("b", HASH.hex())]
+
+
+def test_truncated_batch_account_raises_value_error():
+    data = DECISION_BATCH_DISCRIMINATOR + bytes(AGENT) + HASH + struct.pack("<Iq", 2, 7)
+    assert decode_decision_batch(data).count == 2
+    for n in range(len(data)):
+        with pytest.raises(ValueError):
+            decode_decision_batch(data[:n])
@@ -0,0 +1,126 @@
+import struct
+import subprocess
+import sys
+import threading
+import types
+
+import pytest
+
+# Only solders is needed: the client is mocked, so the pool logic runs without solana
+pytest.importorskip("solders")
+
+from solders.hash import Hash
+from solders.keypair import Keypair
+from solders.pubkey import Pubkey
+
+from sdk.durable_nonce import NoncePool, OfflineSigner
+
+
+class FakeClient:
+    """Nonce accounts whose values the test moves by hand, as landed transactions would."""
+    def __init__(self, authority, accounts):
+        self.authority = authority
+        self.values = {a: Hash.new_unique() for a in accounts}
+        self.sent = []
+
+    def get_multiple_accounts(self, keys):
+        return types.SimpleNamespace(value=[
+            types.SimpleNamespace(data=struct.pack("<II", 1, 1) + bytes(self.authority)
+                                  + bytes(self.values[k]) + struct.pack("<Q", 5000))
+            for k in keys
+        ])
+
+    def send_raw_transaction(self, raw, opts=None):
+        self.sent.append(raw)
+        return types.SimpleNamespace(value="sig")
+
+    def get_latest_blockhash(self):
+        return types.SimpleNamespace(value=types.SimpleNamespace(blockhash=Hash.new_unique()))
+
+    def send_transaction(self, tx, opts=None):
+        # An advance_nonce_account landing: the nonce account moves on
+        self.sent.append(tx)
+        nonce_account = tx.message.account_keys[tx.message.instructions[0].accounts[0]]
+        self.values[nonce_account] = Hash.new_unique()
+        return types.SimpleNamespace(value=tx.signatures[0])
+
+    def confirm_transaction(self, sig):
+        return None
+
+
+def test_presigned_transactions_never_share_a_nonce():
+    payer = Keypair()
+    accounts = [Pubkey.new_unique() for _ in range(3)]
+    client = FakeClient(payer.pubkey(), accounts)
+    pool = NoncePool(client, payer, accounts, poll_interval=0.01)
+    signer = OfflineSigner(client, Pubkey.new_unique(), payer, pool)
+
+    burst = [signer.sign_log_decision(f"Obj-{i}", "ab" * 32) for i in range(3)]
+    assert len({p.nonce for p in burst}) == 3
+    for presigned in burst:
+        presigned.tx.verify()
+        assert presigned.tx.uses_durable_nonce()
+        assert presigned.tx.message.recent_blockhash == presigned.nonce
+
+    # Every nonce signs a pending transaction until the chain shows it moved
+    with pytest.raises(TimeoutError):
+        signer.sign_log_decision("Obj-3", "ab" * 32, timeout=0.05)
+    assert pool.refresh() == 0
+
+    client.values[accounts[1]] = Hash.new_unique()   # burst[1] landed
+    reused = signer.sign_log_decision("Obj-3", "ab" * 32)
+    assert reused.slot.pubkey == accounts[1]
+    assert reused.nonce == client.values[accounts[1]]
+
+    signer.submit(reused)
+    assert client.sent == [reused.raw()]
+
+
+def test_concurrent_signers_spend_each_nonce_once():
+    payer = Keypair()
+    accounts = [Pubkey.new_unique() for _ in range(8)]
+    client = FakeClient(payer.pubkey(), accounts)
+    pool = NoncePool(client, payer, accounts, poll_interval=0.01)
+    signer = OfflineSigner(client, Pubkey.new_unique(), payer, pool)
+
+    signed = []
+    lock = threading.Lock()
+
+    def sign(i):
+        presigned = signer.sign_log_decision(f"Obj-{i}", "ab" * 32, timeout=5)
+        with lock:
+            signed.append(presigned)
+
+    threads = [threading.Thread(target=sign, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len({p.nonce for p in signed}) == 8
+    assert all(slot.spent and not slot.in_use for slot in pool.slots)
+    assert pool.available() == 0
+
+
+def test_invalidate_advances_only_a_live_nonce():
+    payer = Keypair()
+    accounts = [Pubkey.new_unique()]
+    client = FakeClient(payer.pubkey(), accounts)
+    pool = NoncePool(client, payer, accounts, poll_interval=0.01)
+    signer = OfflineSigner(client, Pubkey.new_unique(), payer, pool)
+
+    presigned = signer.sign_log_decision("Obj-0", "ab" * 32)
+    assert signer.invalidate(presigned)
+    assert pool.refresh() == 1 and pool.slots[0].nonce == client.values[accounts[0]]
+    assert signer.invalidate(presigned) == ""   # already moved on: nothing to do
+
+    slot = pool.acquire()
+    with pytest.raises(ValueError):
+        pool.advance(slot)
+    pool.release(slot)
+    assert pool.available() == 1
+
+
+def test_module_imports_without_solana():
+    code = "import sys; sys.modules['solana'] = None; import sdk.durable_nonce"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,53 @@
+import asyncio
+import threading
+
+import pytest
+
+from sdk.event_bus import COMMITTED, DecisionBus
+
+
+def test_concurrent_publishers_never_overfill_a_subscription():
+    async def main():
+        bus = DecisionBus(max_buffer=100)
+        sub = bus.subscribe()
+        barrier = threading.Barrier(8)
+
+        def publish(n):
+            barrier.wait()
+            for i in range(50):
+                bus.publish({"type": COMMITTED, "n": n, "i": i})
+
+        def run_publishers():
+            threads = [threading.Thread(target=publish, args=(n,)) for n in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        await asyncio.get_running_loop().run_in_executor(None, run_publishers)
+        assert sub.dropped and len(sub._queue) == 100
+        assert bus.dropped_consumers == 1 and len(bus) == 0
+        received = 0
+        with pytest.raises(ConnectionAbortedError):
+            while True:
+                await sub.get(timeout=1)
+                received += 1
+        assert received == 100
+
+    asyncio.run(main())
+
+
+def test_filters_route_messages():
+    async def main():
+        bus = DecisionBus()
+        mine = bus.subscribe(agent_id="a", objective_id="o")
+        everything = bus.subscribe()
+        assert bus.publish({"agent_id": "a", "objective_id": "o"}) == 2
+        assert bus.publish({"agent_id": "b", "objective_id": "o"}) == 1
+        assert (await mine.get(timeout=1))["agent_id"] == "a"
+        assert await mine.get(timeout=0.01) is None
+        bus.unsubscribe(mine)
+        assert len(bus) == 1
+
+    asyncio.run(main())
+
@@ -0,0 +1,90 @@
+import hashlib
+import json
+
+import pytest
+
+from sdk.core import DecisionRecord, DecisionSnapshot, LogosAgent
+from sdk.fast_json import RequestValidationError, parse_decision_request
+
+BODY = {
+    "objective_id": "Liquidation-Guard-v1",
+    "observations": [
+        {"source": "pyth", "content": {"price": 1e-05, "sym": "SOL/é", "depth": [1, 2.5]}, "timestamp": 1707000000},
+        {"source": "kamino", "content": {"health_factor": 1.05, "big": 2 ** 70}, "timestamp": "1707000001.5", "extra": 1},
+    ],
+    "action_plan": {"cmd": "repay", "amount": 10},
+    "dry_run": "true",
+}
+
+
+def test_parsed_request_matches_model_shape():
+    fields = parse_decision_request(json.dumps(BODY).encode())
+    objective_id, observations, action_plan, dry_run = (
+        fields["objective_id"], fields["obs_dicts"], fields["action_plan"], fields["dry_run"]
+    )
+    assert objective_id == "Liquidation-Guard-v1"
+    assert dry_run is True
+    assert action_plan == BODY["action_plan"]
+    # What ObservationData(...).model_dump() yields: declared fields only, timestamp coerced to float
+    assert observations == [
+        {"source": "pyth", "content": BODY["observations"][0]["content"], "timestamp": 1707000000.0},
+        {"source": "kamino", "content": BODY["observations"][1]["content"], "timestamp": 1707000001.5},
+    ]
+    agent = LogosAgent("a", objective_id)
+    expected = [dict(o) for o in observations]
+    assert agent.hash_observation(observations) == agent.hash_observation(expected)
+
+
+def test_stdlib_only_literals_fall_back():
+    observations = parse_decision_request(
+        b'{"objective_id":"o","observations":[{"source":"s","content":{"x":NaN},"timestamp":0}],"action_plan":{}}'
+    )["obs_dicts"]
+    assert observations[0]["content"]["x"] != observations[0]["content"]["x"]
+
+
+def test_validation_errors_are_collected():
+    with pytest.raises(RequestValidationError) as exc:
+        parse_decision_request(json.dumps({
+            "objective_id": 5,
+            "observations": [{"source": "s", "content": [], "timestamp": "soon"}],
+            "dry_run": "maybe",
+        }).encode())
+    locs = [tuple(e["loc"]) for e in exc.value.errors]
+    assert locs == [
+        ("body", "objective_id"),
+        ("body", "observations", 0, "content"),
+        ("body", "observations", 0, "timestamp"),
+        ("body", "action_plan"),
+        ("body", "dry_run"),
+    ]
+
+
+def test_compute_hash_matches_asdict_encoding():
+    record = DecisionRecord("a", 1707000000.25, "o", DecisionSnapshot("ab" * 32, {"n": [1, 2.0, {"k": None}]}), "cd" * 32)
+    assert record.compute_hash() == hashlib.sha256(record.to_json().encode('utf-8')).hexdigest()
+
+
+def test_matches_pydantic_models():
+    pydantic = pytest.importorskip("pydantic")
+    from typing import Any, Dict, List
+
+    class ObservationData(pydantic.BaseModel):
+        source: str
+        content: Dict[str, Any]
+        timestamp: float
+
+    class DecisionRequest(pydantic.BaseModel):
+        objective_id: str
+        observations: List[ObservationData]
+        action_plan: Dict[str, Any]
+        dry_run: bool = False
+
+    req = DecisionRequest(**BODY)
+    fields = parse_decision_request(json.dumps(BODY).encode())
+    objective_id, observations, action_plan, dry_run = (
+        fields["objective_id"], fields["obs_dicts"], fields["action_plan"], fields["dry_run"]
+    )
+    assert (objective_id, action_plan, dry_run) == (req.objective_id, req.action_plan, req.dry_run)
+    agent = LogosAgent("a", objective_id)
+    model_obs = [dict(source=o.source, content=o.content, timestamp=o.timestamp) for o in req.observations]
+    assert agent.hash_observation(observations) == agent.hash_observation(model_obs)
@@ -0,0 +1,42 @@
+import hashlib
+import json
+
+import pytest
+
+from sdk.audit_store import AuditStore
+from sdk.core import DecisionRecord, LogosAgent
+from sdk.hash_schemes import BLAKE2B_256, SHA256, available_schemes, get_scheme
+
+OBS = {"price": 101.5, "depth": list(range(20))}
+
+
+def test_default_records_are_unchanged():
+    agent = LogosAgent("a", "o", verbose=False)
+    decision_hash = agent.decide(OBS, {"cmd": "buy"})
+    record = agent.history[-1]
+    assert "hash_scheme" not in record.to_dict()
+    assert decision_hash == hashlib.sha256(record.to_json().encode('utf-8')).hexdigest()
+    assert record.snapshot.observation_hash == hashlib.sha256(json.dumps(OBS, sort_keys=True).encode()).hexdigest()
+
+
+def test_scheme_is_recorded_and_dispatched_on_verify():
+    agent = LogosAgent("a", "o", verbose=False, hash_scheme=BLAKE2B_256)
+    decision_hash = agent.decide(OBS, {"cmd": "buy"})
+    exported = json.loads(agent.export_logs())[0]
+    assert exported["hash_scheme"] == BLAKE2B_256
+    assert exported["snapshot"]["observation_hash"] == hashlib.blake2b(
+        json.dumps(OBS, sort_keys=True).encode(), digest_size=32).hexdigest()
+
+    # A verifier rebuilding the record from its export picks the algorithm from the data
+    store = AuditStore()
+    assert store.ingest(exported) == decision_hash
+    tampered = dict(exported, hash_scheme=SHA256)
+    assert store.ingest(tampered) != decision_hash
+
+
+def test_unknown_or_unavailable_schemes_fail_early():
+    with pytest.raises(ValueError):
+        get_scheme("md5")
+    if not available_schemes()["blake3"]:
+        with pytest.raises(ValueError):
+            LogosAgent("a", "o", hash_scheme="blake3")
@@ -0,0 +1,65 @@
+import threading
+
+import pytest
+
+from sdk.idempotency import IdempotencyKeyReused, IdempotencyStore, body_hash, content_key
+
+
+def test_duplicates_replay_and_failures_release():
+    store = IdempotencyStore()
+    assert store.begin("k") == (True, None)
+    store.fail("k")
+    assert store.begin("k") == (True, None)   # retry after a failure runs again
+    store.complete("k", {"signature": "sig"})
+    assert store.begin("k") == (False, {"signature": "sig"})
+
+
+def test_waiter_gets_the_owners_result():
+    store = IdempotencyStore()
+    store.begin("k")
+    results = []
+    waiter = threading.Thread(target=lambda: results.append(store.begin("k", wait=5)))
+    waiter.start()
+    store.complete("k", "done")
+    waiter.join()
+    assert results == [(False, "done")]
+
+
+def test_reused_key_with_a_different_body_is_rejected():
+    store = IdempotencyStore()
+    first, second = body_hash({"action": "buy"}), body_hash({"action": "sell"})
+    store.begin("k", fingerprint=first)
+    store.complete("k", "done")
+    assert store.begin("k", fingerprint=first) == (False, "done")
+    with pytest.raises(IdempotencyKeyReused):
+        store.begin("k", fingerprint=second)
+
+
+def test_capacity_holds_with_an_in_flight_head():
+    store = IdempotencyStore(max_entries=3)
+    store.begin("slow")                       # oldest entry stays in flight
+    for i in range(10):
+        store.begin(f"k{i}")
+        store.complete(f"k{i}", i)
+        assert len(store) <= 3
+    with pytest.raises(TimeoutError):
+        store.begin("slow", wait=0.01)        # never evicted: a duplicate still waits on it
+    store.complete("slow", "late")
+    assert store.begin("slow") == (False, "late")
+
+
+def test_full_of_in_flight_requests_waits_then_times_out():
+    store = IdempotencyStore(max_entries=2)
+    store.begin("a")
+    store.begin("b")
+    with pytest.raises(TimeoutError):
+        store.begin("c", wait=0.05)
+
+    threading.Timer(0.05, store.complete, args=("a", "done")).start()
+    assert store.begin("c", wait=5) == (True, None)
+    assert len(store) == 2
+
+
+def test_content_key_ignores_dict_order():
+    assert content_key("a", "o", [{"x": 1, "y": 2}], {"p": 1, "q": 2}) == \
+        content_key("a", "o", [{"y": 2, "x": 1}], {"q": 2, "p": 1})
@@ -0,0 +1,26 @@
+import subprocess
+import sys
+
+from benchmarks.bench_import import ROOT, import_seconds
+
+# Generous ceiling for a cold `import sdk` on a loaded CI box; locally it is ~20-40ms.
+IMPORT_BUDGET_SECONDS = 0.25
+
+HEAVY_MODULES = ("solana", "solders", "httpx", "fastapi", "uvicorn", "dotenv", "numpy")
+
+
+def test_hashing_core_does_not_import_solana_stack():
+    probe = (
+        "import sys, sdk\n"
+        "agent = sdk.LogosAgent('a', 'o')\n"
+        "agent.decide({'x': 1}, {'y': 2})\n"
+        f"print('heavy=' + ','.join(sorted({{m.split('.')[0] for m in sys.modules}} & set({HEAVY_MODULES!r}))))"
+    )
+    out = subprocess.run([sys.executable, "-c", probe], cwd=ROOT,
+                         capture_output=True, text=True, check=True)
+    assert out.stdout.strip().splitlines()[-1] == "heavy="
+
+
+def test_sdk_import_time_budget():
+    best = min(import_seconds("sdk") for _ in range(3))
+    assert best < IMPORT_BUDGET_SECONDS, f"import sdk took {best * 1000:.0f}ms"
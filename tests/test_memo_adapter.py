@@ -0,0 +1,149 @@
+import hashlib
+import json
+import types
+
+import pytest
+
+pytest.importorskip("solana")
+pytest.importorskip("solders")
+
+import httpx
+from solana.transaction import Transaction
+from solders.hash import Hash
+from solders.keypair import Keypair
+
+from sdk.hash_schemes import BLAKE2B_256, DEFAULT_SCHEME
+from sdk.memo_adapter import (BatchedMemoAdapter, MEMO_V2_PREFIX, MEMO_V3_PREFIX, decode_memo,
+                              decode_memo_with_scheme, encode_batch_memo, parse_memo_field)
+
+
+def _hash(i):
+    return hashlib.sha256(str(i).encode()).hexdigest()
+
+
+ENTRIES = [("obj-a", _hash(1)), ("obj-b", _hash(2)), ("obj-a", _hash(3)), ("ü-obj", _hash(4))]
+
+
+def test_batch_memo_round_trip():
+    memo = encode_batch_memo(ENTRIES)
+    assert memo.startswith(MEMO_V2_PREFIX)
+    assert decode_memo(memo) == ENTRIES
+
+    memo = encode_batch_memo(ENTRIES, BLAKE2B_256)
+    assert memo.startswith(MEMO_V3_PREFIX)
+    assert decode_memo_with_scheme(memo) == (BLAKE2B_256, ENTRIES)
+
+    assert decode_memo_with_scheme(f"LOGOS:v1:OBJ:with:colons:{_hash(5)}") == (
+        DEFAULT_SCHEME, [("OBJ:with:colons", _hash(5))])
+
+
+def test_malformed_memos_raise_value_error():
+    memo = encode_batch_memo(ENTRIES)
+    for bad in (memo[:-8], "LOGOS:v2:", "LOGOS:v3:", "hello", "LOGOS:v1:nohash"):
+        with pytest.raises(ValueError):
+            decode_memo(bad)
+    with pytest.raises(ValueError):
+        encode_batch_memo([])
+    with pytest.raises(ValueError):
+        encode_batch_memo([("obj", "abcd")])
+
+
+class FakeClient:
+    """Sends raise while `failures` is positive (after reaching the cluster if `lands`)."""
+    def __init__(self, failures=0, lands=False):
+        self.failures = failures
+        self.lands = lands
+        self.block_height = 100
+        self.sent = []        # raw transactions the send call was made with
+        self.landed = {}      # signature -> raw transaction
+
+    def get_latest_blockhash(self):
+        return types.SimpleNamespace(value=types.SimpleNamespace(
+            blockhash=Hash.new_unique(), last_valid_block_height=self.block_height + 150))
+
+    def get_block_height(self):
+        return types.SimpleNamespace(value=self.block_height)
+
+    def get_signature_statuses(self, signatures):
+        return types.SimpleNamespace(value=[
+            types.SimpleNamespace(err=None) if str(sig) in self.landed else None for sig in signatures])
+
+    def send_raw_transaction(self, raw):
+        self.sent.append(raw)
+        signature = str(Transaction.deserialize(raw).signature())
+        if self.failures:
+            self.failures -= 1
+            if self.lands:
+                self.landed[signature] = raw
+            raise httpx.ReadTimeout("timed out")
+        self.landed[signature] = raw
+        return types.SimpleNamespace(value=signature)
+
+
+def _adapter(tmp_path, client, **kwargs):
+    keypair_path = tmp_path / "id.json"
+    keypair_path.write_text(json.dumps(list(bytes(Keypair()))))
+    adapter = BatchedMemoAdapter("http://localhost:8899", str(keypair_path), max_delay=0, **kwargs)
+    adapter.client = client
+    return adapter
+
+
+def _memos(client):
+    return [decode_memo(bytes(Transaction.deserialize(raw).instructions[0].data).decode()) for raw in client.landed.values()]
+
+
+def test_failed_flush_resends_the_same_transaction(tmp_path):
+    client = FakeClient(failures=1)
+    adapter = _adapter(tmp_path, client)
+    for objective_id, decision_hash in ENTRIES:
+        adapter.log_decision(objective_id, decision_hash)
+
+    assert adapter.flush() is None
+    assert adapter.pending == [] and [b.entries for b in adapter.unsent] == [ENTRIES]
+
+    adapter.log_decision("obj-c", _hash(6))
+    signature = adapter.close()
+    assert adapter.unsent == [] and signature in client.landed
+    assert client.sent[0] == client.sent[1]   # the retry is byte-for-byte the first transaction
+    assert _memos(client) == [ENTRIES, [("obj-c", _hash(6))]]
+
+
+def test_retry_after_a_send_that_landed_sends_nothing(tmp_path):
+    client = FakeClient(failures=1, lands=True)
+    adapter = _adapter(tmp_path, client)
+    adapter.log_decision("obj", _hash(1))
+    assert adapter.flush() is None
+    adapter.flush()
+    assert len(client.sent) == 1 and adapter.unsent == [] and _memos(client) == [[("obj", _hash(1))]]
+
+
+def test_expired_batch_is_signed_again_and_retries_are_capped(tmp_path):
+    client = FakeClient(failures=10)
+    adapter = _adapter(tmp_path, client, max_retries=2)
+    adapter.log_decision("obj", _hash(1))
+    adapter.flush()
+    client.block_height += 1000   # the first transaction can no longer land
+    adapter.flush()
+    assert client.sent[1] != client.sent[0]
+
+    adapter.flush()
+    assert adapter.unsent == [] and len(adapter.failed) == 1 and len(client.sent) == 3
+    adapter.flush()
+    assert len(client.sent) == 3 and adapter.failed[0].entries == [("obj", _hash(1))]
+
+
+def test_size_triggered_flush(tmp_path):
+    client = FakeClient()
+    adapter = _adapter(tmp_path, client, max_memo_bytes=200)
+    signatures = [adapter.log_decision("obj", _hash(i)) for i in range(5)]
+    assert sum(sig is not None for sig in signatures) == 1
+    adapter.close()
+    assert [h for memo in _memos(client) for _, h in memo] == [_hash(i) for i in range(5)]
+
+
+def test_memo_field_splits_on_byte_lengths():
+    first = encode_batch_memo(ENTRIES)
+    second = "logos:ü; tricky [3] obj:" + _hash(9)
+    field = f"[{len(first)}] {first}; [{len(second.encode())}] {second}"
+    assert parse_memo_field(field) == [first, second]
+    assert parse_memo_field(None) == [] and parse_memo_field("") == []
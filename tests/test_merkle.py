@@ -0,0 +1,95 @@
+import copy
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from sdk.core import ConcurrentLogosAgent, LogosAgent
+from sdk.hash_schemes import BLAKE2B_256
+from sdk.merkle import MerkleHasher, merkle_root, prove, verify_proof
+
+SNAPSHOT = [
+    {"protocol": "Kamino", "health_factor": 1.05, "borrow_apy": 0.04, "depth": list(range(100))},
+    {"protocol": "MarginFi", "health_factor": 1.20, "supply_apy": 0.08},
+    {"protocol": "Solend", "health_factor": 1.10, "exposure": 5000},
+]
+
+
+def test_incremental_hash_matches_full_rebuild():
+    hasher = MerkleHasher()
+    first = hasher.hash(SNAPSHOT)
+    assert first == merkle_root(SNAPSHOT)
+
+    changed = copy.deepcopy(SNAPSHOT)
+    changed[1]["health_factor"] = 1.3
+    second = hasher.hash(changed)
+    assert second != first
+    assert second == merkle_root(changed)
+
+    # Same numeric value, different JSON encoding: must not reuse the cached leaf
+    retyped = copy.deepcopy(changed)
+    retyped[0]["depth"][3] = 3.0
+    assert hasher.hash(retyped) == merkle_root(retyped) != second
+
+
+def test_field_proof_round_trips_and_rejects_forgery():
+    hasher = MerkleHasher()
+    root = hasher.hash(SNAPSHOT)
+
+    for path in ([0, "health_factor"], [2, "exposure"], [0, "depth", 57]):
+        proof = json.loads(json.dumps(hasher.prove(path)))
+        assert verify_proof(root, path, proof)
+
+    forged = hasher.prove([0, "health_factor"])
+    forged["value"] = 2.0
+    assert not verify_proof(root, [0, "health_factor"], forged)
+    assert not verify_proof(root, [1, "health_factor"], hasher.prove([0, "health_factor"]))
+
+
+def test_agent_uses_structured_hasher():
+    agent = LogosAgent("Varuna-Risk-Bot", "Auto-Repay-Policy-v4", observation_hasher=MerkleHasher())
+    agent.decide(SNAPSHOT, {"type": "REPAY"})
+    assert agent.history[-1].snapshot.observation_hash == merkle_root(SNAPSHOT)
+
+
+def test_signed_zero_is_not_served_from_cache():
+    hasher = MerkleHasher()
+    hasher.hash({"x": 0.0, "v": [0.0, 1.5]})
+    assert hasher.hash({"x": -0.0, "v": [0.0, 1.5]}) == merkle_root({"x": -0.0, "v": [0.0, 1.5]})
+    assert hasher.hash({"x": -0.0, "v": [-0.0, 1.5]}) == merkle_root({"x": -0.0, "v": [-0.0, 1.5]})
+    assert hasher.hash({"x": -0.0, "v": [-0.0, "a"]}) == merkle_root({"x": -0.0, "v": [-0.0, "a"]})
+    assert hasher.hash({"x": -0.0, "v": [0.0, "a"]}) == merkle_root({"x": -0.0, "v": [0.0, "a"]})
+
+
+def test_proofs_for_any_observation():
+    hasher = MerkleHasher()
+    root = hasher.hash(SNAPSHOT)
+    hasher.hash([{"protocol": "Other"}])
+
+    proof = prove(SNAPSHOT, [1, "supply_apy"])
+    assert verify_proof(root, [1, "supply_apy"], proof)
+    assert proof == prove(SNAPSHOT, [1, "supply_apy"])
+
+
+def test_shared_hasher_returns_each_callers_hash():
+    hasher = MerkleHasher()
+    agent = ConcurrentLogosAgent("Agent-1", "Obj-A", observation_hasher=hasher, verbose=False)
+    observations = [{"i": i, "prices": [float(i)] * 50} for i in range(200)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda obs: agent.decide(obs, {"type": "HOLD"}), observations))
+    expected = {merkle_root(obs) for obs in observations}
+    assert {r.snapshot.observation_hash for r in agent.history} == expected
+
+
+def test_agent_rejects_a_hasher_on_another_scheme():
+    with pytest.raises(ValueError):
+        LogosAgent("a", "o", observation_hasher=MerkleHasher(), hash_scheme=BLAKE2B_256, verbose=False)
+    with pytest.raises(ValueError):
+        LogosAgent("a", "o", observation_hasher=lambda observation: "0" * 64, hash_scheme=BLAKE2B_256, verbose=False)
+
+    def blake2b_hasher(observation):
+        return "0" * 64
+    blake2b_hasher.hash_scheme = BLAKE2B_256
+    agent = LogosAgent("a", "o", observation_hasher=blake2b_hasher, hash_scheme=BLAKE2B_256, verbose=False)
+    agent.decide({"x": 1}, {"cmd": "hold"})
+    assert agent.history[-1].hash_scheme == BLAKE2B_256
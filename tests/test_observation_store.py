@@ -0,0 +1,77 @@
+import hashlib
+import json
+import os
+
+import pytest
+
+from sdk.core import LogosAgent
+from sdk.hash_schemes import BLAKE2B_256
+from sdk.merkle import MerkleHasher, merkle_root, prove, verify_proof
+from sdk.observation_store import ObservationStore
+
+OBS = {"price": 101.5, "depth": list(range(300)), "venue": "Orca"}
+
+
+def test_round_trip_and_tamper_detection(tmp_path):
+    store = ObservationStore(str(tmp_path))
+    agent = LogosAgent("a", "o", observation_store=store, verbose=False)
+    agent.decide(OBS, {"cmd": "buy"})
+    obs_hash = agent.history[-1].snapshot.observation_hash
+    assert obs_hash == hashlib.sha256(json.dumps(OBS, sort_keys=True).encode()).hexdigest()
+    assert store.get_observation(obs_hash) == OBS
+    assert store.get("0" * 64) is None
+
+    store.put(obs_hash[::-1], json.dumps({"x": 1}).encode())
+    with pytest.raises(ValueError):
+        store.get(obs_hash[::-1])
+
+
+def test_blobs_without_a_scheme_tag_read_as_sha256(tmp_path):
+    store = ObservationStore(str(tmp_path))
+    data = json.dumps({"x": 1}, sort_keys=True).encode()
+    obs_hash = hashlib.sha256(data).hexdigest()
+    os.makedirs(os.path.join(str(tmp_path), obs_hash[:2]))
+    with open(os.path.join(str(tmp_path), obs_hash[:2], obs_hash[2:]), "wb") as f:
+        f.write(bytes([0]) + data)   # written before the header carried a scheme
+    assert store.get_observation(obs_hash) == {"x": 1}
+
+
+def test_store_follows_the_agent_hash_scheme(tmp_path):
+    store = ObservationStore(str(tmp_path))
+    agent = LogosAgent("a", "o", observation_store=store, verbose=False, hash_scheme=BLAKE2B_256)
+    agent.decide(OBS, {"cmd": "buy"})
+    obs_hash = agent.history[-1].snapshot.observation_hash
+    assert obs_hash == hashlib.blake2b(json.dumps(OBS, sort_keys=True).encode(), digest_size=32).hexdigest()
+    assert store.get_observation(obs_hash) == OBS
+
+
+def test_structured_hashes_are_stored_and_provable(tmp_path):
+    store = ObservationStore(str(tmp_path))
+    agent = LogosAgent("a", "o", observation_store=store, observation_hasher=MerkleHasher(), verbose=False)
+    agent.decide(OBS, {"cmd": "buy"})
+    root = agent.history[-1].snapshot.observation_hash
+    assert root == merkle_root(OBS)
+
+    stored = store.get_observation(root)
+    assert stored == OBS
+    assert verify_proof(root, ["depth", 42], prove(stored, ["depth", 42]))
+    with pytest.raises(ValueError):
+        store.get(root, observation_hasher=lambda observation: "0" * 64)
+
+
+def test_array_data_is_stored(tmp_path):
+    np = pytest.importorskip("numpy")
+    store = ObservationStore(str(tmp_path))
+    book = np.arange(600, dtype=">f8").reshape(20, 30)[:, ::2]
+    observation = {"book": book, "venue": "Orca"}
+
+    for scheme, hasher in (("sha256", None), (BLAKE2B_256, None), ("sha256", MerkleHasher())):
+        agent = LogosAgent("a", "o", observation_store=store, observation_hasher=hasher,
+                           verbose=False, hash_scheme=scheme)
+        agent.decide(observation, {"cmd": "buy"})
+        obs_hash = agent.history[-1].snapshot.observation_hash
+
+        stored = store.get_observation(obs_hash)
+        restored = store.get_array(stored["book"])
+        assert np.array_equal(restored, book) and restored.shape == book.shape
+        assert agent.hash_observation(dict(observation, book=restored)) == obs_hash
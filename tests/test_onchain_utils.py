@@ -0,0 +1,117 @@
+import hashlib
+import struct
+
+import pytest
+
+pytest.importorskip("solders")
+
+from solders.pubkey import Pubkey
+
+from sdk.onchain_utils import (DECISION_LOG_CAPACITY, DECISION_LOG_HEADER_SIZE, LOG_ENTRY_SIZE,
+                               build_append_decision_ix, build_close_decision_log_ix, build_init_decision_log_ix,
+                               build_log_decision_compact_ix, build_log_decision_ix, build_log_decisions_ix,
+                               decode_decision_log, decode_log_decision_ix_data, decode_log_decisions_ix_data,
+                               find_agent_pda, find_decision_log_pda, get_discriminator, objective_tag)
+
+PROGRAM_ID = Pubkey.from_string("Ldm2tof9CHcyaHWh3nBkwiWNGYN8rG5tex7NMbHQxG3")
+AUTHORITY = Pubkey.new_unique()
+HASH = hashlib.sha256(b"decision").hexdigest()
+
+
+def test_log_decision_variants_round_trip():
+    for build in (build_log_decision_ix, build_log_decision_compact_ix):
+        ix = build(PROGRAM_ID, AUTHORITY, HASH, "Obj-ü")
+        assert decode_log_decision_ix_data(bytes(ix.data)) == (HASH, "Obj-ü")
+    with pytest.raises(ValueError):
+        decode_log_decision_ix_data(bytes(64))
+
+
+def test_truncated_instruction_data_raises_value_error():
+    ixs = [
+        (decode_log_decision_ix_data, build_log_decision_ix(PROGRAM_ID, AUTHORITY, HASH, "obj")),
+        (decode_log_decision_ix_data, build_log_decision_compact_ix(PROGRAM_ID, AUTHORITY, HASH, "obj")),
+        (decode_log_decisions_ix_data, build_log_decisions_ix(PROGRAM_ID, AUTHORITY, [("a", HASH), ("b", HASH)])),
+    ]
+    for decode, ix in ixs:
+        data = bytes(ix.data)
+        for n in range(len(data)):
+            with pytest.raises(ValueError):
+                decode(data[:n])
+
+
+def _anchor_discriminator(namespace, name):
+    return hashlib.sha256(f"{namespace}:{name}".encode()).digest()[:8]
+
+
+def _empty_decision_log(agent):
+    # 8-byte discriminator + DecisionLog { agent, total, entries: [LogEntry; 128] }, as lib.rs lays it out
+    data = bytearray(8 + 32 + 8 + DECISION_LOG_CAPACITY * (32 + 8 + 8))
+    data[:8] = _anchor_discriminator("account", "DecisionLog")
+    data[8:40] = bytes(agent)
+    return data
+
+
+def _append(data, ix_data, timestamp):
+    # What append_decision does with the instruction's arguments
+    assert ix_data[:8] == _anchor_discriminator("global", "append_decision")
+    decision_hash = ix_data[8:40]
+    (length,) = struct.unpack_from("<I", ix_data, 40)
+    objective_id = ix_data[44:44 + length].decode("utf-8")
+    assert len(ix_data) == 44 + length
+    (total,) = struct.unpack_from("<Q", data, 40)
+    offset = 48 + (total % DECISION_LOG_CAPACITY) * 48
+    data[offset:offset + 32] = decision_hash
+    data[offset + 32:offset + 40] = hashlib.sha256(objective_id.encode("utf-8")).digest()[:8]
+    struct.pack_into("<q", data, offset + 40, timestamp)
+    struct.pack_into("<Q", data, 40, total + 1)
+
+
+def test_decision_log_instructions_match_the_program():
+    agent_pda = find_agent_pda(PROGRAM_ID, AUTHORITY)
+    log_pda = find_decision_log_pda(PROGRAM_ID, agent_pda)
+    assert log_pda == Pubkey.find_program_address([b"decision_log", bytes(agent_pda)], PROGRAM_ID)[0]
+    assert (DECISION_LOG_HEADER_SIZE, LOG_ENTRY_SIZE) == (48, 48)
+
+    for build, name in ((build_init_decision_log_ix, "init_decision_log"),
+                        (build_close_decision_log_ix, "close_decision_log")):
+        ix = build(PROGRAM_ID, AUTHORITY)
+        assert bytes(ix.data) == _anchor_discriminator("global", name)
+        assert [(a.pubkey, a.is_signer, a.is_writable) for a in ix.accounts[:3]] == [
+            (log_pda, False, True), (agent_pda, False, False), (AUTHORITY, True, True)]
+
+    ix = build_append_decision_ix(PROGRAM_ID, AUTHORITY, HASH, "Obj-ü")
+    assert bytes(ix.data) == (_anchor_discriminator("global", "append_decision") + bytes.fromhex(HASH)
+                              + struct.pack("<I", len("Obj-ü".encode())) + "Obj-ü".encode())
+    assert [(a.pubkey, a.is_signer, a.is_writable) for a in ix.accounts] == [
+        (log_pda, False, True), (agent_pda, False, False), (AUTHORITY, True, False)]
+    assert objective_tag("Obj-ü") == hashlib.sha256("Obj-ü".encode()).digest()[:8]
+    assert get_discriminator("account", "DecisionLog") == _anchor_discriminator("account", "DecisionLog")
+
+
+def test_wrapped_decision_log_round_trips_oldest_first():
+    agent_pda = find_agent_pda(PROGRAM_ID, AUTHORITY)
+    data = _empty_decision_log(agent_pda)
+    assert decode_decision_log(bytes(data)) == (agent_pda, 0, [])
+
+    appended = 200
+    hashes = [hashlib.sha256(str(i).encode()).hexdigest() for i in range(appended)]
+    for i, decision_hash in enumerate(hashes):
+        _append(data, bytes(build_append_decision_ix(PROGRAM_ID, AUTHORITY, decision_hash, f"obj-{i % 7}").data),
+                1_700_000_000 + i)
+
+    agent, total, entries = decode_decision_log(bytes(data))
+    assert agent == agent_pda and total == appended
+    assert [e.sequence for e in entries] == list(range(appended - DECISION_LOG_CAPACITY, appended))
+    for entry in entries:
+        assert entry.decision_hash == hashes[entry.sequence]
+        assert entry.objective_tag == objective_tag(f"obj-{entry.sequence % 7}").hex()
+        assert entry.timestamp == 1_700_000_000 + entry.sequence
+
+
+def test_truncated_or_foreign_decision_log_is_rejected():
+    data = bytes(_empty_decision_log(find_agent_pda(PROGRAM_ID, AUTHORITY)))
+    for n in (0, 7, 8, 40, 47, 48, len(data) - 1):
+        with pytest.raises(ValueError):
+            decode_decision_log(data[:n])
+    with pytest.raises(ValueError):
+        decode_decision_log(_anchor_discriminator("account", "DecisionBatch") + data[8:])
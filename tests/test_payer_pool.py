@@ -0,0 +1,182 @@
+import hashlib
+import threading
+import types
+
+import pytest
+
+pytest.importorskip("solana")
+pytest.importorskip("solders")
+
+import httpx
+from solana.rpc.core import RPCException
+from solders.compute_budget import set_compute_unit_price
+from solders.hash import Hash
+from solders.keypair import Keypair
+from solders.pubkey import Pubkey
+from solders.transaction_status import TransactionConfirmationStatus
+
+from sdk.event_bus import COMMITTED, CONFIRMED, EXPIRED, FAILED
+from sdk.payer_pool import PayerPool, PooledSubmitter
+from sdk.prevalidate import LocalValidator, PrevalidationError
+from sdk.priority_fees import FeePlanner, FeePolicy, StaticFeeProvider
+
+PROGRAM_ID = Pubkey.from_string("Ldm2tof9CHcyaHWh3nBkwiWNGYN8rG5tex7NMbHQxG3")
+HASH = hashlib.sha256(b"decision").hexdigest()
+
+
+class FakeClient:
+    """Sends succeed; each signature's status is whatever the test sets in `statuses`."""
+    def __init__(self):
+        self.sent = []
+        self.statuses = {}
+        self.block_height = 100
+        self._lock = threading.Lock()
+
+    def get_latest_blockhash(self):
+        return types.SimpleNamespace(value=types.SimpleNamespace(
+            blockhash=Hash.new_unique(), last_valid_block_height=self.block_height + 150))
+
+    def get_account_info(self, pubkey):
+        return types.SimpleNamespace(value=object())   # agents are already registered
+
+    def send_transaction(self, tx, opts=None):
+        with self._lock:
+            self.sent.append(tx)
+        return types.SimpleNamespace(value=tx.signatures[0])
+
+    def get_block_height(self):
+        return types.SimpleNamespace(value=self.block_height)
+
+    def get_signature_statuses(self, signatures):
+        return types.SimpleNamespace(value=[self.statuses.get(str(sig)) for sig in signatures])
+
+
+def _status(confirmation_status, err=None):
+    return types.SimpleNamespace(confirmation_status=confirmation_status, err=err)
+
+
+def test_objectives_are_pinned_to_one_key():
+    pool = PayerPool([Keypair() for _ in range(4)])
+    owners = {f"obj-{i}": pool.member_for(f"obj-{i}") for i in range(200)}
+    assert all(pool.member_for(obj) is member for obj, member in owners.items())
+    assert len({id(m) for m in owners.values()}) == 4   # and spread over every key
+
+    # Adding a key only moves objectives to the new key
+    grown = PayerPool([m.keypair for m in pool.members] + [Keypair()])
+    for obj, member in owners.items():
+        moved = grown.member_for(obj)
+        assert moved.pubkey == member.pubkey or moved is grown.members[-1]
+
+
+def test_slots_are_held_until_confirmation():
+    client = FakeClient()
+    pool = PayerPool([Keypair()], max_in_flight=2)
+    submitter = PooledSubmitter(client, PROGRAM_ID, pool)
+    submitter.confirmations.interval = 3600   # poll by hand
+
+    first = submitter.log_decision("agent", "obj-1", HASH)
+    second = submitter.log_decision("agent", "obj-2", HASH)
+    member = pool.members[0]
+    assert member.in_flight == 2
+    with pytest.raises(TimeoutError):
+        submitter.log_decision("agent", "obj-3", HASH, timeout=0.05)
+
+    client.statuses[first] = _status(TransactionConfirmationStatus.Processed)
+    assert submitter.confirmations.poll() == 0   # processed can still be dropped
+    client.statuses[first] = _status(TransactionConfirmationStatus.Confirmed)
+    assert submitter.confirmations.poll() == 1
+    assert member.in_flight == 1
+
+    client.block_height += 1000                # second never seen and its blockhash expired
+    assert submitter.confirmations.poll() == 1
+    assert member.in_flight == 0 and len(submitter.confirmations) == 0
+    assert second != first
+
+
+def test_objective_is_reserved_until_its_transaction_settles():
+    client = FakeClient()
+    submitter = PooledSubmitter(client, PROGRAM_ID, PayerPool([Keypair()]), validator=LocalValidator(PROGRAM_ID))
+    submitter.confirmations.interval = 3600
+
+    dropped = submitter.log_decision("agent", "obj-1", HASH)
+    with pytest.raises(PrevalidationError):
+        submitter.log_decision("agent", "obj-1", HASH)   # still in flight
+    client.block_height += 1000                         # never landed; blockhash expired
+    assert submitter.confirmations.poll() == 1
+    landed = submitter.log_decision("agent", "obj-1", HASH)
+    assert landed != dropped
+
+    client.statuses[landed] = _status(TransactionConfirmationStatus.Confirmed)
+    assert submitter.confirmations.poll() == 1
+    with pytest.raises(PrevalidationError) as e:
+        submitter.log_decision("agent", "obj-1", HASH)
+    assert e.value.code == "DecisionAlreadyLogged"
+
+
+def test_lifecycle_events_follow_the_tracker():
+    class Recorder:
+        def __init__(self):
+            self.events = []
+
+        def publish(self, message):
+            self.events.append(message)
+
+    client = FakeClient()
+    sink = Recorder()
+    submitter = PooledSubmitter(client, PROGRAM_ID, PayerPool([Keypair()], max_in_flight=8), event_sink=sink)
+    submitter.confirmations.interval = 3600
+    sigs = [submitter.log_decision("agent", f"obj-{i}", HASH) for i in range(4)]
+    assert [e["type"] for e in sink.events] == [COMMITTED] * 4
+
+    client.statuses[sigs[0]] = _status(TransactionConfirmationStatus.Processed)
+    client.statuses[sigs[1]] = _status(TransactionConfirmationStatus.Finalized)
+    client.statuses[sigs[2]] = _status(TransactionConfirmationStatus.Processed, err="InstructionError")
+    assert submitter.confirmations.poll() == 2
+    client.block_height += 1000     # sigs[3] was never seen; sigs[0] is processed, so it stays pending
+    assert submitter.confirmations.poll() == 1
+
+    settled = {e["signature"]: e for e in sink.events[4:]}
+    assert {sig: e["type"] for sig, e in settled.items()} == {sigs[1]: CONFIRMED, sigs[2]: FAILED, sigs[3]: EXPIRED}
+    assert settled[sigs[1]]["objective_id"] == "obj-1" and settled[sigs[1]]["decision_hash"] == HASH
+    assert len(submitter.confirmations) == 1 and submitter.pool.members[0].in_flight == 1
+
+
+def test_failed_send_releases_the_slot():
+    def send_transaction(tx, opts=None):
+        raise RuntimeError("rpc down")
+
+    client = FakeClient()
+    client.send_transaction = send_transaction
+    pool = PayerPool([Keypair()], max_in_flight=1)
+    submitter = PooledSubmitter(client, PROGRAM_ID, pool)
+    with pytest.raises(RuntimeError):
+        submitter.log_decision("agent", "obj", HASH)
+    assert pool.members[0].in_flight == 0
+
+
+def test_only_expired_or_dropped_sends_are_retried():
+    errors = []
+
+    def send_transaction(tx, opts=None):
+        error = errors.pop(0) if errors else None
+        if error is not None:
+            raise error
+        client.sent.append(tx)
+        return types.SimpleNamespace(value=tx.signatures[0])
+
+    client = FakeClient()
+    client.send_transaction = send_transaction
+    planner = FeePlanner(StaticFeeProvider([100]), {"default": FeePolicy(max_retries=3)})
+    submitter = PooledSubmitter(client, PROGRAM_ID, PayerPool([Keypair()]), fee_planner=planner)
+
+    errors[:] = [RPCException("Transaction simulation failed: Blockhash not found"),
+                 httpx.ConnectError("connection reset")]
+    submitter.log_decision("agent", "obj-1", HASH)
+    assert len(client.sent) == 1
+    assert client.sent[0].message.instructions[1].data != set_compute_unit_price(100).data   # escalated
+
+    program_error = RPCException("Transaction simulation failed: Error processing Instruction 2: custom program error")
+    errors[:] = [program_error, None]
+    with pytest.raises(RPCException):
+        submitter.log_decision("agent", "obj-2", HASH)
+    assert errors == [None] and len(client.sent) == 1
@@ -0,0 +1,76 @@
+import hashlib
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("solana")
+pytest.importorskip("solders")
+
+from solders.keypair import Keypair
+from solders.pubkey import Pubkey
+
+from sdk.onchain_utils import find_agent_pda, find_decision_pda
+from sdk.prevalidate import LocalValidator, PrevalidationError, validate_log_decision
+
+PROGRAM_ID = Pubkey.from_string("Ldm2tof9CHcyaHWh3nBkwiWNGYN8rG5tex7NMbHQxG3")
+HASH = hashlib.sha256(b"decision").hexdigest()
+
+
+class FakeClient:
+    def __init__(self, existing=()):
+        self.existing = set(existing)
+        self.reads = 0
+
+    def get_account_info(self, pubkey):
+        self.reads += 1
+        return SimpleNamespace(value=object() if pubkey in self.existing else None)
+
+
+def test_stateless_checks():
+    validate_log_decision(HASH, "x" * 32)
+    with pytest.raises(PrevalidationError) as e:
+        validate_log_decision(HASH[:-1], "obj")
+    assert e.value.code == "InvalidHashLength"
+    with pytest.raises(PrevalidationError) as e:
+        validate_log_decision(HASH, "x" * 33)
+    assert e.value.code == "MaxSeedLengthExceeded"
+
+
+def test_reservation_blocks_concurrent_duplicates_until_released():
+    authority = Keypair().pubkey()
+    validator = LocalValidator(PROGRAM_ID)
+    validator.check_log_decision(authority, HASH, "obj")
+    with pytest.raises(PrevalidationError):
+        validator.check_log_decision(authority, HASH, "obj")   # still in flight
+    validator.release(authority, "obj")
+    validator.check_log_decision(authority, HASH, "obj")
+    validator.mark_logged(authority, "obj")
+    with pytest.raises(PrevalidationError) as e:
+        validator.check_log_decision(authority, HASH, "obj")
+    assert e.value.code == "DecisionAlreadyLogged"
+
+
+def test_chain_check_catches_records_from_other_processes():
+    authority = Keypair().pubkey()
+    decision_pda = find_decision_pda(PROGRAM_ID, find_agent_pda(PROGRAM_ID, authority), "old")
+    client = FakeClient(existing=[decision_pda])
+    validator = LocalValidator(PROGRAM_ID, client, check_chain=True)
+    with pytest.raises(PrevalidationError):
+        validator.check_log_decision(authority, HASH, "old")
+    validator.check_log_decision(authority, HASH, "new")
+    # A known duplicate is answered locally from then on
+    reads = client.reads
+    with pytest.raises(PrevalidationError):
+        validator.check_log_decision(authority, HASH, "old")
+    assert client.reads == reads
+
+
+def test_logged_set_is_bounded():
+    authority = Keypair().pubkey()
+    validator = LocalValidator(PROGRAM_ID, max_entries=10)
+    for i in range(50):
+        validator.check_log_decision(authority, HASH, f"obj-{i}")
+        validator.mark_logged(authority, f"obj-{i}")
+    assert len(validator._logged) == 10
+    with pytest.raises(PrevalidationError):
+        validator.check_log_decision(authority, HASH, "obj-49")
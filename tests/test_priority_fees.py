@@ -0,0 +1,68 @@
+import pytest
+
+pytest.importorskip("solana")
+pytest.importorskip("solders")
+
+from solders.compute_budget import set_compute_unit_limit, set_compute_unit_price
+from solders.keypair import Keypair
+from solders.pubkey import Pubkey
+
+from sdk.cu_profile import ComputeProfile
+from sdk.onchain_utils import build_log_decision_ix
+from sdk.priority_fees import (COMPUTE_BUDGET_OVERHEAD, DEFAULT_COMPUTE_UNITS, FeePlanner, FeePolicy, FeeProvider,
+                               StaticFeeProvider, compute_unit_limit, escalated_price)
+
+PROGRAM_ID = Pubkey.from_string("Ldm2tof9CHcyaHWh3nBkwiWNGYN8rG5tex7NMbHQxG3")
+
+
+def test_escalated_price_grows_and_is_capped():
+    policy = FeePolicy(min_price=100, max_price=1000, escalation=2.0)
+    assert [escalated_price(50, attempt, policy) for attempt in range(5)] == [100, 200, 400, 800, 1000]
+    assert escalated_price(300, 0, policy) == 300
+
+    free = FeePolicy(escalation=3.0)
+    assert [escalated_price(0, attempt, free) for attempt in range(3)] == [0, 3, 9]
+
+
+def test_compute_unit_limit_uses_units_then_profile():
+    kinds = ["log_decision", ("register_agent", 11)]
+    expected = int((DEFAULT_COMPUTE_UNITS["log_decision"] + DEFAULT_COMPUTE_UNITS["register_agent"]) * 1.1)
+    assert compute_unit_limit(kinds) == expected + COMPUTE_BUDGET_OVERHEAD
+    assert compute_unit_limit(["append_decision"], margin=1.0, units={"append_decision": 5000}) == \
+        5000 + COMPUTE_BUDGET_OVERHEAD
+
+    profile = ComputeProfile("lean", {"register_agent": {1: 1000, 21: 3000}})
+    assert compute_unit_limit(kinds, margin=1.0, profile=profile) == \
+        DEFAULT_COMPUTE_UNITS["log_decision"] + 2000 + COMPUTE_BUDGET_OVERHEAD
+    with pytest.raises(KeyError):
+        compute_unit_limit(["no_such_instruction"])
+
+
+def test_fee_provider_is_abstract():
+    with pytest.raises(TypeError):
+        FeeProvider()
+    provider = StaticFeeProvider([5, 1, 9, 3])
+    assert provider.estimate([], 50.0) == 5
+    assert provider.estimate([], 100.0) == 9
+    assert StaticFeeProvider([]).estimate([], 90.0) == 0
+
+
+def test_fee_planner_prepends_budget_per_policy():
+    urgent = FeePolicy(percentile=100.0, min_price=10, escalation=2.0, cu_margin=1.0)
+    planner = FeePlanner(StaticFeeProvider([20, 40]), {"urgent": urgent}, units={"log_decision": 10_000})
+    assert planner.policy_for("urgent") is urgent
+    assert planner.policy_for("anything-else") is planner.policies["default"]
+
+    ix = build_log_decision_ix(PROGRAM_ID, Keypair().pubkey(), "00" * 32, "urgent")
+    base = planner.base_price([ix], urgent)
+    assert base == 40
+    planned = planner.plan([ix], ["log_decision"], urgent, base, attempt=1)
+    assert planned[0] == set_compute_unit_limit(10_000 + COMPUTE_BUDGET_OVERHEAD)
+    assert planned[1] == set_compute_unit_price(80)
+    assert planned[2:] == [ix]
+
+    # No price instruction when there is nothing to pay
+    assert len(FeePlanner(StaticFeeProvider([0])).plan([ix], ["log_decision"], FeePolicy(), 0)) == 2
+
+    planner.calibrate("log_decision", 12_000)
+    assert planner.plan([ix], ["log_decision"], urgent, 0)[0] == set_compute_unit_limit(12_000 + COMPUTE_BUDGET_OVERHEAD)
@@ -0,0 +1,139 @@
+import hashlib
+import io
+import json
+import types
+
+import pytest
+
+from sdk.audit_store import AuditStore
+from sdk.core import LogosAgent
+from sdk.reconcile import (
+    RateLimiter,
+    _iter_json_array,
+    diff_sorted,
+    iter_audit_store_entries,
+    iter_local_entries,
+    reconcile,
+)
+
+
+def _h(i: int) -> str:
+    return hashlib.sha256(str(i).encode()).hexdigest()
+
+
+def test_external_sort_diff_finds_exactly_the_missing_hashes():
+    local = [(_h(i), f"Obj-{i}", "sha256") for i in range(2000)]
+    local += local[:50]                                    # duplicates in the local log
+    remote = [_h(i) for i in range(2000) if i % 7] + [_h(i) for i in range(5000, 5010)]
+    remote += remote[:30]
+
+    missing_out = io.StringIO()
+    submitted = []
+    report = reconcile(
+        reversed(local), iter(remote),
+        submit=lambda objective_id, decision_hash, scheme: submitted.append((objective_id, decision_hash)) or "sig",
+        run_size=128, rate=1e6, max_workers=2, missing_out=missing_out,
+    )
+
+    expected = {(f"Obj-{i}", _h(i)) for i in range(2000) if i % 7 == 0}
+    assert set(submitted) == expected
+    assert report.local == 2000 and report.remote == 2000 - len(expected) + 10
+    assert report.missing == report.submitted == len(expected)
+    assert report.matched == 2000 - len(expected) and report.unexpected == 10
+    lines = missing_out.getvalue().splitlines()
+    assert lines == sorted(lines) and len(lines) == len(expected)
+
+
+def test_local_sources_stream_exports_and_audit_store(tmp_path):
+    agent = LogosAgent("Agent-1", "Obj-A", verbose=False)
+    hashes = {agent.decide({"source": "feed", "value": i}, {"type": "HOLD", "i": i}) for i in range(25)}
+
+    export = tmp_path / "export.json"
+    export.write_text(agent.export_logs())
+    assert {e[0] for e in iter_local_entries(str(export))} == hashes
+    with open(export) as f:
+        assert len(list(_iter_json_array(f, chunk_size=64))) == 25  # items straddle chunk edges
+
+    store = AuditStore(str(tmp_path / "audit.db"))
+    store.load_export(agent.export_logs())
+    store.close()
+    entries = list(iter_audit_store_entries(str(tmp_path / "audit.db")))
+    assert [e[0] for e in entries] == sorted(hashes)
+    assert {(e[1], e[2]) for e in entries} == {("Obj-A", "sha256")}
+
+    jsonl = tmp_path / "log.jsonl"
+    jsonl.write_text("\n".join(json.dumps({"decision_hash": h, "objective_id": "Obj-A"}) for h in hashes))
+    report_missing = list(diff_sorted(sorted(iter_local_entries(str(jsonl))), sorted(hashes)))
+    assert report_missing == []
+
+
+def test_rate_limiter_spaces_calls():
+    import time
+    limiter = RateLimiter(rate=200, burst=1)
+    start = time.monotonic()
+    for _ in range(11):
+        limiter.acquire()
+    assert time.monotonic() - start >= 10 / 200 * 0.9
+
+
+def test_chain_hashes_cover_records_batches_ring_buffer_and_memos(monkeypatch):
+    pytest.importorskip("solana")
+
+    import sdk.verify
+    from sdk.reconcile import iter_chain_hashes
+
+    agent = "Ldm2tof9CHcyaHWh3nBkwiWNGYN8rG5tex7NMbHQxG3"
+    authority = "11111111111111111111111111111111"
+    row = lambda i: types.SimpleNamespace(decision_hash=_h(i))
+
+    class FakeVerifier:
+        def __init__(self, client, program_id):
+            pass
+
+        def list_agent_decisions(self, pda):
+            return [types.SimpleNamespace(decision_hash=_h(1).upper())]
+
+        def list_agent_batch_decisions(self, pda):
+            return [row(2), row(3)]
+
+        def fetch_decision_log(self, pda):
+            return [row(4)]
+
+        def list_agent_appended_decisions(self, pda):
+            return [row(4), row(5)]
+
+        def list_memo_decisions(self, signer):
+            assert str(signer) == authority
+            return [row(6)]
+
+    monkeypatch.setattr(sdk.verify, "DecisionVerifier", FakeVerifier)
+    hashes = list(iter_chain_hashes("http://localhost:8899", agent, [agent], [authority]))
+    assert set(hashes) == {_h(i) for i in range(1, 7)}
+
+
+def test_verifier_pages_memo_history():
+    pytest.importorskip("solana")
+
+    from solders.pubkey import Pubkey
+
+    from sdk.memo_adapter import encode_batch_memo
+    from sdk.verify import MAX_SIGNATURES_PER_CALL, DecisionVerifier
+
+    total = MAX_SIGNATURES_PER_CALL + 5
+    history = []   # newest first, as the RPC returns it
+    for i in reversed(range(total)):
+        memo = encode_batch_memo([(f"Obj-{i}", _h(i))]) if i % 2 else "some other memo"
+        field = f"[{len(memo.encode())}] {memo}"
+        history.append(types.SimpleNamespace(signature=i, err=None if i != 7 else "failed",
+                                             memo=field, block_time=1700 + i))
+
+    class FakeClient:
+        def get_signatures_for_address(self, address, before=None, limit=None):
+            start = 0 if before is None else next(n for n, s in enumerate(history) if s.signature == before) + 1
+            return types.SimpleNamespace(value=history[start:start + limit])
+
+    verifier = DecisionVerifier(FakeClient(), Pubkey.default())
+    decisions = verifier.list_memo_decisions(Pubkey.default())
+    expected = [i for i in range(total) if i % 2 and i != 7]
+    assert [d.objective_id for d in decisions] == [f"Obj-{i}" for i in expected]
+    assert [d.timestamp for d in decisions] == [1700 + i for i in expected]
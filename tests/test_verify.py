@@ -0,0 +1,70 @@
+import hashlib
+import struct
+import types
+
+import pytest
+
+pytest.importorskip("solana")
+pytest.importorskip("solders")
+
+from solders.pubkey import Pubkey
+
+from sdk.decoders import COMPACT_DECISION_RECORD_DISCRIMINATOR, DECISION_RECORD_DISCRIMINATOR
+from sdk.onchain_utils import find_decision_pda
+from sdk.verify import DecisionVerifier
+
+PROGRAM_ID = Pubkey.from_string("Ldm2tof9CHcyaHWh3nBkwiWNGYN8rG5tex7NMbHQxG3")
+AGENT = Pubkey.new_unique()
+HASH = hashlib.sha256(b"decision").hexdigest()
+
+
+def _string(value: str) -> bytes:
+    data = value.encode("utf-8")
+    return struct.pack("<I", len(data)) + data
+
+
+def _record(objective_id: str, compact: bool = False) -> bytes:
+    if compact:
+        body = COMPACT_DECISION_RECORD_DISCRIMINATOR + bytes(AGENT) + bytes.fromhex(HASH)
+    else:
+        body = DECISION_RECORD_DISCRIMINATOR + bytes(AGENT) + _string(HASH)
+    return body + _string(objective_id) + struct.pack("<q", 1700)
+
+
+class FakeClient:
+    def __init__(self, accounts):
+        self.accounts = {find_decision_pda(PROGRAM_ID, AGENT, objective_id): data
+                         for objective_id, data in accounts.items()}
+        self.calls = 0
+
+    def get_multiple_accounts(self, pubkeys):
+        self.calls += 1
+        return types.SimpleNamespace(value=[
+            types.SimpleNamespace(owner=PROGRAM_ID, data=self.accounts[k]) if k in self.accounts else None
+            for k in pubkeys
+        ])
+
+
+def test_truncated_accounts_do_not_abort_bulk_verification():
+    good, compact = _record("obj-good"), _record("obj-compact", compact=True)
+    client = FakeClient({
+        "obj-good": good,
+        "obj-compact": compact,
+        "obj-cut-timestamp": _record("obj-cut-timestamp")[:-3],
+        "obj-cut-hash": compact[:50],
+        "obj-cut-header": good[:42],
+    })
+    objectives = ["obj-good", "obj-compact", "obj-cut-timestamp", "obj-cut-hash", "obj-cut-header", "obj-missing"]
+    results = DecisionVerifier(client, PROGRAM_ID).verify([(AGENT, o, HASH) for o in objectives])
+
+    assert [r.verified for r in results] == [True, True, False, False, False, False]
+    assert results[1].record.compact and results[0].record.decision_hash == HASH
+    assert client.calls == 1
+
+
+def test_records_are_fetched_in_chunks():
+    objectives = [f"obj-{i}" for i in range(250)]
+    client = FakeClient({o: _record(o) for o in objectives[::2]})
+    records = DecisionVerifier(client, PROGRAM_ID).fetch_records((AGENT, o) for o in objectives)
+    assert client.calls == 3
+    assert [records[(str(AGENT), o)] is not None for o in objectives] == [i % 2 == 0 for i in range(250)]